@@ -0,0 +1,210 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: airspace.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: Airspace (add_mission, remove_mission, expire, get_mission, schedule_version, check, check_and_commit)
+ Global Variables: _VERSION_MODULUS
+
+ '''
+
+import hashlib
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils import Mission
+from deconfliction import DeconflictionSystem
+from spatial_index import SegmentGrid, suggest_cell_size, MAX_OVERSIZED_SHARE
+from result_cache import ResultCache, mission_fingerprint
+from conflict_records import ConflictRecords
+
+# Variable Name: _VERSION_MODULUS: Modulus of the order-independent schedule version sum.
+_VERSION_MODULUS = 1 << 256
+
+
+class Airspace:
+
+    '''
+    Variable Name: safety_buffer_distance: The minimum separation enforced between approved flights, expected range: 0.0 to infinity.
+    Variable Name: cell_size: Edge length of the segment hash grid, expected range: greater than 0.0. When omitted the grid is
+    sized from the first mission added, and re-sized from every indexed segment when more than MAX_OVERSIZED_SHARE of
+    them land in the overflow set (at most once per doubling of the indexed segment count).
+    Variable Name: result_cache: Optional ResultCache consulted by check(); entries are keyed by schedule_version, so adding
+    or removing a flight retires them.
+    '''
+
+    def __init__(self, safety_buffer_distance: float = 5.0, cell_size: Optional[float] = None, result_cache: Optional[ResultCache] = None):
+        self.deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+        self._auto_cell_size = cell_size is None
+        if cell_size is None:
+            cell_size = suggest_cell_size(np.empty((0, 2, 3)), safety_buffer_distance)
+        # Variable Name: _missions: Approved missions keyed by flight id.
+        # Variable Name: _grid: Segment index kept in step with _missions; it also stores each segment's time window.
+        # Variable Name: _expiry_heap: (t_end, flight_id) min-heap used by expire; entries for removed flights are skipped lazily.
+        # Variable Name: _sized_segment_count: Indexed segment count when an auto-sized grid's cell size was last chosen.
+        self._missions: Dict[int, Mission] = {}
+        self._grid = SegmentGrid(safety_buffer_distance, cell_size)
+        self._expiry_heap: List[Tuple[float, int]] = []
+        self._sized_segment_count = 0
+        self._next_flight_id = 0
+        self._lock = threading.RLock()
+        # Variable Name: _version_sum: Sum modulo 2**256 of one digest per (flight id, mission); adding and removing a
+        # flight update it in O(mission size), and equal sets of approved flights always give equal sums.
+        self._version_sum = 0
+        self.result_cache = result_cache
+
+    @property
+    def safety_buffer_distance(self) -> float:
+        return self.deconfliction_system.safety_buffer_distance
+
+    def __len__(self) -> int:
+        return len(self._missions)
+
+    def __contains__(self, flight_id: int) -> bool:
+        return flight_id in self._missions
+
+    def get_mission(self, flight_id: int) -> Mission:
+        """Return the approved mission registered under flight_id."""
+        return self._missions[flight_id]
+
+    @staticmethod
+    def _flight_digest(flight_id: int, mission: Mission) -> int:
+        return int.from_bytes(hashlib.sha256(str(flight_id).encode() + mission_fingerprint(mission)).digest(), "little")
+
+    @property
+    def schedule_version(self) -> str:
+        """Content version of the approved set: stable across restarts and independent of insertion order."""
+        return f"airspace:{self._version_sum:064x}"
+
+    '''
+    * Function Name: add_mission
+    * Input:
+    * mission: An approved Mission object (Mission object).
+    * flight_id: Optional identifier; the next free integer is used when omitted (int).
+    * Output:
+    * int: The flight id reported in conflict records that involve this mission.
+    * Logic: Precomputes the mission's segments and time windows and inserts them into the grid. Costs
+    * O(segments of this mission), apart from the occasional re-size of an auto-sized grid, which re-indexes every
+    * segment but only once the indexed segment count has doubled, so it stays amortised O(1) per segment.
+    * Example Call:
+    * flight_id = airspace.add_mission(approved_mission)
+    '''
+
+    def add_mission(self, mission: Mission, flight_id: Optional[int] = None) -> int:
+        """Register an approved mission."""
+        if not mission.validate():
+            raise ValueError("cannot register an invalid mission")
+        with self._lock:
+            if flight_id is None:
+                flight_id = self._next_flight_id
+            if flight_id in self._missions:
+                raise ValueError(f"flight {flight_id} is already registered")
+            self._next_flight_id = max(self._next_flight_id, flight_id + 1)
+            if self._auto_cell_size and self._grid.segment_count == 0:
+                first_segments = mission.segment_array()
+                self._grid = SegmentGrid(self.safety_buffer_distance, suggest_cell_size(first_segments, self.safety_buffer_distance))
+                self._sized_segment_count = len(first_segments)
+            self._grid.add_mission(flight_id, mission)
+            if (self._auto_cell_size and self._grid.oversized_share > MAX_OVERSIZED_SHARE
+                    and self._grid.segment_count >= 2 * self._sized_segment_count):
+                self._grid = self._grid.resized(suggest_cell_size(self._grid.all_segments(), self.safety_buffer_distance))
+                self._sized_segment_count = self._grid.segment_count
+            self._missions[flight_id] = mission
+            self._version_sum = (self._version_sum + self._flight_digest(flight_id, mission)) % _VERSION_MODULUS
+            heapq.heappush(self._expiry_heap, (mission.t_end, flight_id))
+        return flight_id
+
+    '''
+    * Function Name: remove_mission
+    * Input:
+    * flight_id: Identifier returned by add_mission (int).
+    * Output:
+    * Mission: The mission that was removed.
+    * Logic: Drops the mission's segments from the grid in amortised O(segments of this mission). Its expiry heap
+    * entry is left behind and ignored when it surfaces.
+    * Example Call:
+    * airspace.remove_mission(flight_id)
+    '''
+
+    def remove_mission(self, flight_id: int) -> Mission:
+        """Withdraw a mission from the airspace."""
+        with self._lock:
+            mission = self._missions.pop(flight_id)
+            self._grid.remove_segments(flight_id)
+            self._version_sum = (self._version_sum - self._flight_digest(flight_id, mission)) % _VERSION_MODULUS
+        return mission
+
+    '''
+    * Function Name: expire
+    * Input:
+    * current_time: Missions whose t_end is earlier than this are retired (float).
+    * Output:
+    * List[int]: Flight ids that were removed.
+    * Logic: Pops the expiry heap while its earliest t_end has passed, so only finished missions are touched.
+    * Example Call:
+    * finished = airspace.expire(now)
+    '''
+
+    def expire(self, current_time: float) -> List[int]:
+        """Retire every mission that finished before current_time."""
+        expired_flight_ids = []
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < current_time:
+                t_end, flight_id = heapq.heappop(self._expiry_heap)
+                mission = self._missions.get(flight_id)
+                # Skip heap entries left behind by remove_mission (or by a later re-use of the same id).
+                if mission is None or mission.t_end != t_end:
+                    continue
+                self.remove_mission(flight_id)
+                expired_flight_ids.append(flight_id)
+        return expired_flight_ids
+
+    '''
+    * Function Name: check
+    * Input:
+    * candidate_mission: The Mission object requesting approval (Mission object).
+    * Output:
+    * Tuple[str, ConflictRecords]: Same status and conflict records as DeconflictionSystem.check_mission, with flight_id
+    * set to the airspace flight ids.
+    * Logic: Takes a snapshot of the grid and the schedule version under the lock, then runs check_mission against
+    * the snapshot without it, so adds, removals and other checks are not held up by a long check. The result
+    * describes the approved set at the moment of the snapshot. With a result_cache, results are looked up under
+    * (candidate, schedule_version, safety buffer) first.
+    * Example Call:
+    * status, conflicts = airspace.check(candidate)
+    '''
+
+    def check(self, candidate_mission: Mission) -> Tuple[str, ConflictRecords]:
+        """Check a candidate mission against every approved mission."""
+        with self._lock:
+            grid = self._grid.snapshot()
+            schedule_version = self.schedule_version
+        if self.result_cache is None:
+            return self.deconfliction_system.check_mission(candidate_mission, [], grid)
+        cache_key = self.result_cache.key(candidate_mission, schedule_version, self.safety_buffer_distance)
+        result = self.result_cache.get(cache_key)
+        if result is None:
+            result = self.deconfliction_system.check_mission(candidate_mission, [], grid)
+            self.result_cache.put(cache_key, result)
+        return result
+
+    '''
+    * Function Name: check_and_commit
+    * Input:
+    * candidate_mission: The Mission object requesting approval (Mission object).
+    * flight_id: Optional identifier to register it under (int).
+    * Output:
+    * Tuple[str, ConflictRecords, Optional[int]]: Check status and conflicts, plus the new flight id when it was committed.
+    * Logic: Checks and, only when the result is "clear", registers the mission while still holding the lock, so no
+    * other add can slip in between the check and the commit.
+    * Example Call:
+    * status, conflicts, flight_id = airspace.check_and_commit(candidate)
+    '''
+
+    def check_and_commit(self, candidate_mission: Mission, flight_id: Optional[int] = None) -> Tuple[str, ConflictRecords, Optional[int]]:
+        """Check a candidate and approve it atomically if it is clear."""
+        with self._lock:
+            mission_status, conflicts = self.check(candidate_mission)
+            if mission_status != "clear":
+                return mission_status, conflicts, None
+            return mission_status, conflicts, self.add_mission(candidate_mission, flight_id)
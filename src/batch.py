@@ -0,0 +1,163 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: batch.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: publish_schedules, attach_schedules, check_missions_batch, measure_batch_throughput
+ Global Variables: _worker_state
+
+ '''
+
+import os
+import time
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from utils import Mission
+from deconfliction import DeconflictionSystem
+from conflict_records import ConflictRecords
+
+# Variable Name: _worker_state: Per-process checker, index and shared-memory handle set up once by the pool initializer.
+_worker_state = {}
+
+# Layout of the published block: one (n, 5) float64 mission table [offset, count, t_start, t_end, has_timestamps]
+# followed by the (W, 3) float64 waypoint block that every mission's coordinates are a view into, and the (W,) block
+# of per-waypoint timestamps (only meaningful for missions flagged in the table).
+_TABLE_COLUMNS = 5
+
+'''
+* Function Name: publish_schedules
+* Input:
+* schedule_list: List of Mission objects shared by every task (List[Mission]).
+* Output:
+* Tuple[SharedMemory, int, int]: The shared block plus its mission count and waypoint count, needed to attach.
+* Logic: Copies the schedule geometry once into a single shared-memory block so worker processes can map it
+* instead of receiving a pickled copy with every task. The caller owns the block and must close and unlink it.
+* Example Call:
+* block, mission_count, waypoint_count = publish_schedules(schedules)
+'''
+
+def publish_schedules(schedule_list: List[Mission]) -> Tuple[SharedMemory, int, int]:
+    """Write schedule geometry into one shared-memory block."""
+    counts = np.array([len(mission.coordinates) for mission in schedule_list], dtype=np.int64)
+    mission_count, waypoint_count = len(schedule_list), int(counts.sum())
+    block = SharedMemory(create=True, size=max(8 * (mission_count * _TABLE_COLUMNS + waypoint_count * 4), 1))
+    table, coordinates, timestamps = _block_views(block, mission_count, waypoint_count)
+    table[:, 0] = np.cumsum(counts) - counts
+    table[:, 1] = counts
+    table[:, 2] = [mission.t_start for mission in schedule_list]
+    table[:, 3] = [mission.t_end for mission in schedule_list]
+    table[:, 4] = [mission.timestamps is not None for mission in schedule_list]
+    for mission, offset, count in zip(schedule_list, table[:, 0].astype(np.int64), counts):
+        coordinates[offset:offset + count] = mission.coordinates
+        if mission.timestamps is not None:
+            timestamps[offset:offset + count] = mission.timestamps
+    return block, mission_count, waypoint_count
+
+def _block_views(block: SharedMemory, mission_count: int, waypoint_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    table = np.ndarray((mission_count, _TABLE_COLUMNS), dtype=np.float64, buffer=block.buf)
+    coordinates = np.ndarray((waypoint_count, 3), dtype=np.float64, buffer=block.buf, offset=table.nbytes)
+    timestamps = np.ndarray((waypoint_count,), dtype=np.float64, buffer=block.buf, offset=table.nbytes + coordinates.nbytes)
+    return table, coordinates, timestamps
+
+'''
+* Function Name: attach_schedules
+* Input:
+* block: A shared-memory block written by publish_schedules (SharedMemory).
+* mission_count, waypoint_count: The sizes returned by publish_schedules (int).
+* Output:
+* List[Mission]: Missions whose coordinates are views into the shared block (no copy).
+* Logic: Rebuilds Mission objects directly over the mapped waypoint block.
+* Example Call:
+* schedules = attach_schedules(block, mission_count, waypoint_count)
+'''
+
+def attach_schedules(block: SharedMemory, mission_count: int, waypoint_count: int) -> List[Mission]:
+    """Wrap a published block as Mission objects."""
+    table, coordinates, timestamps = _block_views(block, mission_count, waypoint_count)
+    return [Mission.wrap(coordinates[int(offset):int(offset) + int(count)], t_start, t_end,
+                         timestamps[int(offset):int(offset) + int(count)] if has_timestamps else None)
+            for offset, count, t_start, t_end, has_timestamps in table.tolist()]
+
+def _initialize_worker(block_name: str, mission_count: int, waypoint_count: int, safety_buffer_distance: float) -> None:
+    # Pool workers share the parent's resource tracker, so attaching here does not add a second owner of the block.
+    block = SharedMemory(name=block_name)
+    schedule_list = attach_schedules(block, mission_count, waypoint_count)
+    deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+    _worker_state.update(block=block, schedule_list=schedule_list, deconfliction_system=deconfliction_system,
+                         spatial_index=deconfliction_system.build_spatial_index(schedule_list))
+
+def _check_in_worker(primaries: List[Mission]) -> List[Tuple[str, ConflictRecords]]:
+    return _worker_state["deconfliction_system"].check_missions(primaries, _worker_state["schedule_list"], _worker_state["spatial_index"])
+
+'''
+* Function Name: check_missions_batch
+* Input:
+* primaries: Missions to check (Sequence[Mission]).
+* schedules: Approved missions every primary is checked against (List[Mission]).
+* workers: Number of worker processes; 0 or 1 runs in-process, None uses os.cpu_count() (int).
+* safety_buffer_distance: Separation threshold passed to DeconflictionSystem (float).
+* chunk_size: Primaries handed to a worker per task and checked as one check_missions batch; chosen from the batch
+* size when omitted (int).
+* Output:
+* List[Tuple[str, ConflictRecords]]: One check_mission result per primary, in input order.
+* Logic: Publishes the schedules once through shared memory, then spreads the primaries over a process pool whose
+* workers each build their own checker and spatial index over the shared geometry and check one chunk of primaries
+* per task with check_missions. The in-process path runs the same index-backed batch check, so both paths return
+* identical results.
+* Example Call:
+* results = check_missions_batch(submitted, approved, workers=4)
+'''
+
+def check_missions_batch(primaries: Sequence[Mission], schedules: List[Mission], workers: Optional[int] = None,
+                         safety_buffer_distance: float = 5.0, chunk_size: Optional[int] = None) -> List[Tuple[str, ConflictRecords]]:
+    """Check many primary missions against one schedule set, optionally in parallel."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(primaries) <= 1:
+        deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+        spatial_index = deconfliction_system.build_spatial_index(schedules)
+        return deconfliction_system.check_missions(primaries, schedules, spatial_index)
+
+    if chunk_size is None:
+        chunk_size = max(1, len(primaries) // (workers * 4))
+    block, mission_count, waypoint_count = publish_schedules(schedules)
+    try:
+        with get_context().Pool(workers, initializer=_initialize_worker,
+                                initargs=(block.name, mission_count, waypoint_count, safety_buffer_distance)) as pool:
+            chunks = [list(primaries[start:start + chunk_size]) for start in range(0, len(primaries), chunk_size)]
+            return [result for chunk_results in pool.map(_check_in_worker, chunks) for result in chunk_results]
+    finally:
+        block.close()
+        block.unlink()
+
+'''
+* Function Name: measure_batch_throughput
+* Input:
+* primaries: Missions to check (Sequence[Mission]).
+* schedules: Approved missions every primary is checked against (List[Mission]).
+* worker_counts: Pool sizes to time (Sequence[int]).
+* safety_buffer_distance: Separation threshold passed to DeconflictionSystem (float).
+* Output:
+* List[dict]: One entry per worker count with keys workers, seconds, missions_per_second and speedup (relative to
+* the first entry).
+* Logic: Times check_missions_batch end to end, including pool start-up and publishing, for each worker count.
+* Example Call:
+* report = measure_batch_throughput(submitted, approved, worker_counts=(1, 2, 4, 8))
+'''
+
+def measure_batch_throughput(primaries: Sequence[Mission], schedules: List[Mission], worker_counts: Sequence[int] = (1, 2, 4),
+                             safety_buffer_distance: float = 5.0) -> List[dict]:
+    """Report batch throughput as workers are added."""
+    report = []
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        check_missions_batch(primaries, schedules, workers=workers, safety_buffer_distance=safety_buffer_distance)
+        elapsed = time.perf_counter() - start_time
+        report.append({
+            "workers": workers,
+            "seconds": elapsed,
+            "missions_per_second": len(primaries) / elapsed if elapsed > 0 else float("inf"),
+            "speedup": report[0]["seconds"] / elapsed if report and elapsed > 0 else 1.0
+        })
+    return report
@@ -0,0 +1,369 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: benchmark.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: time_call, cross_check_engines, compare_index_paths, compare_runner_paths, run_benchmark, main
+ Global Variables: DEFAULT_FLEET_SIZES, DEFAULT_WAYPOINT_COUNTS, DEFAULT_MISSION_DURATIONS, DEFAULT_DENSITIES, INDEX_SLOWDOWN_TOLERANCE
+
+ '''
+
+import argparse
+import bisect
+import io
+import json
+import math
+import platform
+import statistics
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from utils import Mission, generate_fleet
+from deconfliction import DeconflictionSystem
+from cli import result_line, run_checks
+
+# Variable Name: DEFAULT_FLEET_SIZES / DEFAULT_WAYPOINT_COUNTS / DEFAULT_MISSION_DURATIONS: Axes of the default scaling sweep.
+DEFAULT_FLEET_SIZES = (10, 100, 1000)
+DEFAULT_WAYPOINT_COUNTS = (10, 50)
+DEFAULT_MISSION_DURATIONS = (120.0, 7200.0)
+# Variable Name: DEFAULT_DENSITIES: Fleet densities (missions per square kilometre) of the index-versus-dense comparison.
+DEFAULT_DENSITIES = (10.0, 60.0, 100.0, 2000.0)
+# Variable Name: INDEX_SLOWDOWN_TOLERANCE: Largest accepted ratio of indexed (build included) to dense check time, expected range: 1.0 to infinity.
+INDEX_SLOWDOWN_TOLERANCE = 1.5
+
+'''
+* Function Name: time_call
+* Input:
+* function: Zero-argument callable to time (Callable).
+* repeats: Number of timed runs (int).
+* Output:
+* dict: best, median and mean wall-clock seconds over the runs.
+* Example Call:
+* timing = time_call(lambda: system.check_mission(primary, schedules), repeats=5)
+'''
+
+def time_call(function: Callable[[], object], repeats: int = 3) -> dict:
+    """Time a callable over several runs."""
+    samples = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start_time)
+    return {"best": min(samples), "median": statistics.median(samples), "mean": statistics.fmean(samples)}
+
+def _conflict_key(conflicts: List[dict]) -> List[tuple]:
+    return sorted((conflict["type"], conflict["flight_id"], round(float(conflict["distance"]), 9)) for conflict in conflicts)
+
+def _scalar_point_segment_distance(point: List[float], start: List[float], end: List[float]) -> float:
+    direction = [b - a for a, b in zip(start, end)]
+    length_sq = sum(component * component for component in direction)
+    fraction = 0.0 if length_sq == 0.0 else min(max(sum((p - a) * d for p, a, d in zip(point, start, direction)) / length_sq, 0.0), 1.0)
+    return math.dist(point, [a + fraction * d for a, d in zip(start, direction)])
+
+def _scalar_segment_distance(start_one: List[float], end_one: List[float], start_two: List[float], end_two: List[float]) -> float:
+    # Independent of geometry.closest_segment_parameters: the minimum of the convex distance over the unit square lies
+    # either at the interior critical point or on an edge, and each edge minimum is a point-to-segment projection.
+    candidates = [_scalar_point_segment_distance(start_one, start_two, end_two), _scalar_point_segment_distance(end_one, start_two, end_two),
+                  _scalar_point_segment_distance(start_two, start_one, end_one), _scalar_point_segment_distance(end_two, start_one, end_one)]
+    direction_one = [b - a for a, b in zip(start_one, end_one)]
+    direction_two = [b - a for a, b in zip(start_two, end_two)]
+    offset = [a - b for a, b in zip(start_one, start_two)]
+    a11 = sum(u * u for u in direction_one)
+    a12 = sum(u * v for u, v in zip(direction_one, direction_two))
+    a22 = sum(v * v for v in direction_two)
+    b1 = sum(u * w for u, w in zip(direction_one, offset))
+    b2 = sum(v * w for v, w in zip(direction_two, offset))
+    determinant = a11 * a22 - a12 * a12
+    if determinant > 1e-12 * a11 * a22:
+        parameter_s = (a12 * b2 - a22 * b1) / determinant
+        parameter_t = (a11 * b2 - a12 * b1) / determinant
+        if 0.0 <= parameter_s <= 1.0 and 0.0 <= parameter_t <= 1.0:
+            candidates.append(math.dist([a + parameter_s * u for a, u in zip(start_one, direction_one)],
+                                        [b + parameter_t * v for b, v in zip(start_two, direction_two)]))
+    return min(candidates)
+
+def _scalar_segments(mission: Mission) -> List[Tuple[List[float], List[float]]]:
+    points = mission.coordinates.tolist()
+    return list(zip(points[:-1], points[1:])) or [(points[0], points[0])]
+
+def _reference_spatial(primary_mission: Mission, schedule_list: List[Mission], safety_buffer_distance: float) -> List[tuple]:
+    # Pair-by-pair scalar reference in pure Python, sharing no code with the vectorised kernels.
+    conflicts = []
+    primary_pairs = _scalar_segments(primary_mission)
+    for flight_index, current_schedule in enumerate(schedule_list):
+        for start_point_two, end_point_two in _scalar_segments(current_schedule):
+            for start_point_one, end_point_one in primary_pairs:
+                distance = _scalar_segment_distance(start_point_one, end_point_one, start_point_two, end_point_two)
+                if distance < safety_buffer_distance:
+                    conflicts.append({"type": "spatial", "flight_id": flight_index, "distance": distance})
+    return _conflict_key(conflicts)
+
+def _scalar_position(times: List[float], points: List[List[float]], current_time: float, probe_time: float) -> List[float]:
+    # Position at current_time on the leg that is flown at probe_time, so a leg boundary is evaluated on the right leg.
+    if len(points) == 1:
+        return points[0]
+    leg = min(max(bisect.bisect_right(times, probe_time) - 1, 0), len(points) - 2)
+    duration = times[leg + 1] - times[leg]
+    fraction = (current_time - times[leg]) / duration if duration > 0.0 else 0.0
+    return [a + fraction * (b - a) for a, b in zip(points[leg], points[leg + 1])]
+
+def _reference_temporal_minima(primary_mission: Mission, schedule_list: List[Mission]) -> dict:
+    # Scalar reference: between consecutive waypoint times of either mission both drones fly straight at constant
+    # velocity, so their offset moves along a line segment and the closest approach on that interval is the distance
+    # from the origin to it. Shares no code with geometry.closest_approach.
+    primary_path = (primary_mission.waypoint_times().tolist(), primary_mission.coordinates.tolist())
+    minima = {}
+    for flight_id, current_schedule in enumerate(schedule_list):
+        window_start, window_end = max(primary_mission.t_start, current_schedule.t_start), min(primary_mission.t_end, current_schedule.t_end)
+        if window_start > window_end:
+            continue
+        schedule_path = (current_schedule.waypoint_times().tolist(), current_schedule.coordinates.tolist())
+        breakpoints = sorted({window_start, window_end} | {time_value for time_value in primary_path[0] + schedule_path[0] if window_start < time_value < window_end})
+        intervals = list(zip(breakpoints[:-1], breakpoints[1:])) or [(window_start, window_end)]
+        minimum = np.inf
+        for interval_start, interval_end in intervals:
+            probe_time = 0.5 * (interval_start + interval_end)
+            offsets = [[a - b for a, b in zip(_scalar_position(*primary_path, time_value, probe_time), _scalar_position(*schedule_path, time_value, probe_time))]
+                       for time_value in (interval_start, interval_end)]
+            minimum = min(minimum, _scalar_point_segment_distance([0.0, 0.0, 0.0], *offsets))
+        minima[flight_id] = minimum
+    return minima
+
+def _keys_match(engine_key: List[tuple], reference_key: List[tuple], safety_buffer_distance: float) -> bool:
+    # Hits within rounding of the buffer may fall on either side in two independent implementations.
+    engine_key = [key for key in engine_key if abs(key[2] - safety_buffer_distance) > 1e-9]
+    reference_key = [key for key in reference_key if abs(key[2] - safety_buffer_distance) > 1e-9]
+    return (len(engine_key) == len(reference_key) and [key[:2] for key in engine_key] == [key[:2] for key in reference_key]
+            and bool(np.allclose([key[2] for key in engine_key], [key[2] for key in reference_key], rtol=1e-9, atol=1e-9)))
+
+'''
+* Function Name: cross_check_engines
+* Input:
+* primaries: Missions to check (List[Mission]).
+* schedule_list: Schedules to check against (List[Mission]).
+* safety_buffer_distance: Separation threshold (float).
+* sample_step: Optional time step for an additional interpolate_position sampling check; skipped when None (float).
+* Output:
+* List[str]: Human-readable mismatches; empty when every engine agrees.
+* Logic: Spatial: dense matrix, grid index and a pure-Python pair-by-pair reference must report the same conflicts.
+* Temporal: the sweep and grid paths must agree, exactly the flights whose minimum separation from a pure-Python
+* piecewise-linear reference is below the buffer must be reported, with that minimum, and sampled positions may
+* never come closer than the analytic minimum. The references share no code with the vectorised kernels.
+* Example Call:
+* problems = cross_check_engines(primaries, schedules, 5.0)
+'''
+
+def cross_check_engines(primaries: List[Mission], schedule_list: List[Mission], safety_buffer_distance: float, sample_step: Optional[float] = None) -> List[str]:
+    """Verify that the optimized engines agree with the references."""
+    deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+    spatial_index = deconfliction_system.build_spatial_index(schedule_list)
+    mismatches = []
+    for primary_index, primary_mission in enumerate(primaries):
+        dense_spatial = _conflict_key(deconfliction_system.check_spatial_conflict(primary_mission, schedule_list))
+        indexed_spatial = _conflict_key(deconfliction_system.check_spatial_conflict(primary_mission, schedule_list, spatial_index))
+        if dense_spatial != indexed_spatial:
+            mismatches.append(f"primary {primary_index}: spatial dense and indexed engines disagree")
+        if not _keys_match(dense_spatial, _reference_spatial(primary_mission, schedule_list, safety_buffer_distance), safety_buffer_distance):
+            mismatches.append(f"primary {primary_index}: spatial dense engine disagrees with the scalar pairwise reference")
+
+        swept_temporal = deconfliction_system.check_temporal_conflict(primary_mission, schedule_list)
+        indexed_temporal = deconfliction_system.check_temporal_conflict(primary_mission, schedule_list, spatial_index)
+        if _conflict_key(swept_temporal) != _conflict_key(indexed_temporal):
+            mismatches.append(f"primary {primary_index}: temporal sweep and indexed engines disagree")
+        reported_minima = {}
+        for conflict in swept_temporal:
+            reported_minima[conflict["flight_id"]] = min(float(conflict["distance"]), reported_minima.get(conflict["flight_id"], np.inf))
+        reference_minima = _reference_temporal_minima(primary_mission, schedule_list)
+        for flight_id in set(reference_minima) | set(reported_minima):
+            minimum = reference_minima.get(flight_id, np.inf)
+            if abs(minimum - safety_buffer_distance) <= 1e-9:
+                continue
+            expected = minimum if minimum < safety_buffer_distance else np.inf
+            reported = reported_minima.get(flight_id, np.inf)
+            if not (reported == expected or np.isclose(reported, expected, rtol=1e-9, atol=1e-9)):
+                mismatches.append(f"primary {primary_index}: temporal minimum for flight {flight_id} differs from the scalar reference")
+
+        if sample_step is not None:
+            for flight_id, current_schedule in enumerate(schedule_list):
+                window_start, window_end = max(primary_mission.t_start, current_schedule.t_start), min(primary_mission.t_end, current_schedule.t_end)
+                for current_time in np.arange(window_start, window_end, sample_step):
+                    position_one = deconfliction_system.interpolate_position(primary_mission, current_time)
+                    position_two = deconfliction_system.interpolate_position(current_schedule, current_time)
+                    if position_one is None or position_two is None:
+                        continue
+                    if np.linalg.norm(np.subtract(position_one, position_two)) < reported_minima.get(flight_id, safety_buffer_distance) - 1e-9:
+                        mismatches.append(f"primary {primary_index}: sampled separation to flight {flight_id} at t={current_time:.3f} beats the analytic minimum")
+                        break
+    return mismatches
+
+'''
+* Function Name: compare_index_paths
+* Input:
+* densities: Fleet densities to measure (Sequence[float]).
+* mission_count: Missions generated per density; the first primary_count are checked against the rest (int).
+* primary_count: Primary missions checked per density (int).
+* waypoint_count: Waypoints per mission (int).
+* safety_buffer_distance: Separation threshold (float).
+* repeats: Timed runs per measurement (int).
+* seed: Fleet generator seed (int).
+* Output:
+* List[dict]: One entry per density with the best dense and indexed times, the index build time, their ratio and
+* whether both paths returned the same results.
+* Logic: Checks every primary with check_mission, once without an index and once through a freshly built one, and
+* charges the build to the indexed path. A ratio above INDEX_SLOWDOWN_TOLERANCE means the index costs more than it
+* prunes for that kind of fleet.
+* Example Call:
+* entries = compare_index_paths((10.0, 100.0))
+'''
+
+def compare_index_paths(densities: Sequence[float] = DEFAULT_DENSITIES, mission_count: int = 400, primary_count: int = 150,
+                        waypoint_count: int = 10, safety_buffer_distance: float = 5.0, repeats: int = 3, seed: int = 0) -> List[dict]:
+    """Compare indexed and dense check_mission on the same fleets."""
+    deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+    entries = []
+    for density in densities:
+        fleet = generate_fleet(mission_count, waypoint_count, seed=seed, density=density)
+        primaries, schedule_list = fleet[:primary_count], fleet[primary_count:]
+        build_timing = time_call(lambda: deconfliction_system.build_spatial_index(schedule_list), repeats)
+        spatial_index = deconfliction_system.build_spatial_index(schedule_list)
+        dense_timing = time_call(lambda: [deconfliction_system.check_mission(primary_mission, schedule_list) for primary_mission in primaries], repeats)
+        indexed_timing = time_call(lambda: [deconfliction_system.check_mission(primary_mission, schedule_list, spatial_index) for primary_mission in primaries], repeats)
+        same_results = all(deconfliction_system.check_mission(primary_mission, schedule_list) == deconfliction_system.check_mission(primary_mission, schedule_list, spatial_index)
+                           for primary_mission in primaries)
+        indexed_seconds = build_timing["best"] + indexed_timing["best"]
+        entries.append({"density": density, "missions": mission_count, "primaries": primary_count, "waypoints": waypoint_count,
+                        "dense_seconds": dense_timing["best"], "indexed_seconds": indexed_seconds, "build_seconds": build_timing["best"],
+                        "slowdown": indexed_seconds / dense_timing["best"], "same_results": same_results})
+    return entries
+
+'''
+* Function Name: compare_runner_paths
+* Input:
+* density: Fleet density (float).
+* mission_count: Missions generated; the first primary_count are checked against the rest (int).
+* primary_count: Primary missions streamed through the runner (int).
+* waypoint_count: Waypoints per mission (int).
+* safety_buffer_distance: Separation threshold (float).
+* repeats: Timed runs per measurement (int).
+* seed: Fleet generator seed (int).
+* Output:
+* dict: Best seconds of the command-line runner (cli.run_checks, index build and JSON output included) and of a
+* plain loop calling check_mission once per mission, their speedup, and whether both produced the same lines.
+* Example Call:
+* entry = compare_runner_paths(density=60.0)
+'''
+
+def compare_runner_paths(density: float = 60.0, mission_count: int = 400, primary_count: int = 150, waypoint_count: int = 10,
+                         safety_buffer_distance: float = 5.0, repeats: int = 3, seed: int = 0) -> dict:
+    """Compare the chunked runner with calling check_mission one mission at a time."""
+    fleet = generate_fleet(mission_count, waypoint_count, seed=seed, density=density)
+    primaries, schedule_list = fleet[:primary_count], fleet[primary_count:]
+    schedule_ids = np.arange(len(schedule_list))
+    deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+    loop_timing = time_call(lambda: [deconfliction_system.check_mission(primary_mission, schedule_list) for primary_mission in primaries], repeats)
+    runner_timing = time_call(lambda: run_checks(((None, primary_mission) for primary_mission in primaries), schedule_list, schedule_ids,
+                                                 io.StringIO(), safety_buffer_distance), repeats)
+    runner_output = io.StringIO()
+    run_checks(((None, primary_mission) for primary_mission in primaries), schedule_list, schedule_ids, runner_output, safety_buffer_distance)
+    loop_lines = [result_line(flight_id, *deconfliction_system.check_mission(primary_mission, schedule_list), schedule_ids)
+                  for flight_id, primary_mission in enumerate(primaries)]
+    return {"density": density, "missions": mission_count, "primaries": primary_count, "waypoints": waypoint_count,
+            "loop_seconds": loop_timing["best"], "runner_seconds": runner_timing["best"],
+            "speedup": loop_timing["best"] / runner_timing["best"], "same_results": runner_output.getvalue() == "".join(loop_lines)}
+
+'''
+* Function Name: run_benchmark
+* Input:
+* fleet_sizes / waypoint_counts / mission_durations: Scaling axes; every combination is measured (Sequence).
+* primary_count: Primary missions checked per configuration (int).
+* safety_buffer_distance: Separation threshold (float).
+* repeats: Timed runs per measurement (int).
+* seed: Fleet generator seed (int).
+* cross_check_limit: Configurations with at most this many schedules are also cross-checked (int).
+* label: Free-form version label stored in the output, used to compare runs between versions (str).
+* densities: Fleet densities of the index-versus-dense comparison; empty to skip it (Sequence[float]).
+* Output:
+* dict: JSON-serialisable results: environment, one entry per configuration and operation, cross-check findings,
+* the compare_index_paths entries and the compare_runner_paths entry.
+* Logic: Generates a fleet per configuration and times check_spatial_conflict, check_temporal_conflict and
+* check_mission, each with and without a prebuilt spatial index, plus the index build itself.
+* Example Call:
+* results = run_benchmark(fleet_sizes=(100, 1000), waypoint_counts=(20,), mission_durations=(600.0,))
+'''
+
+def run_benchmark(fleet_sizes: Sequence[int] = DEFAULT_FLEET_SIZES, waypoint_counts: Sequence[int] = DEFAULT_WAYPOINT_COUNTS,
+                  mission_durations: Sequence[float] = DEFAULT_MISSION_DURATIONS, primary_count: int = 5,
+                  safety_buffer_distance: float = 5.0, repeats: int = 3, seed: int = 0, cross_check_limit: int = 100,
+                  label: str = "local", densities: Sequence[float] = DEFAULT_DENSITIES) -> dict:
+    """Measure the checks across fleet size, path length and mission duration."""
+    results = {
+        "label": label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine()},
+        "safety_buffer_distance": safety_buffer_distance,
+        "measurements": [],
+        "cross_check": [],
+        "index_comparison": [],
+        "runner_comparison": None,
+    }
+    deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+    for fleet_size in fleet_sizes:
+        for waypoint_count in waypoint_counts:
+            for mission_duration in mission_durations:
+                config = {"fleet_size": fleet_size, "waypoints": waypoint_count, "mission_duration": mission_duration}
+                fleet = generate_fleet(fleet_size + primary_count, waypoint_count, seed=seed, mission_duration=mission_duration)
+                primaries, schedule_list = fleet[:primary_count], fleet[primary_count:]
+
+                index_timing = time_call(lambda: deconfliction_system.build_spatial_index(schedule_list), repeats)
+                results["measurements"].append(dict(config, operation="build_spatial_index", **index_timing))
+                spatial_index = deconfliction_system.build_spatial_index(schedule_list)
+                operations = {
+                    "check_spatial_conflict": deconfliction_system.check_spatial_conflict,
+                    "check_temporal_conflict": deconfliction_system.check_temporal_conflict,
+                    "check_mission": deconfliction_system.check_mission,
+                }
+                for operation_name, operation in operations.items():
+                    for indexed in (False, True):
+                        timing = time_call(lambda: [operation(primary_mission, schedule_list, spatial_index if indexed else None)
+                                                    for primary_mission in primaries], repeats)
+                        per_primary = {key: value / primary_count for key, value in timing.items()}
+                        results["measurements"].append(dict(config, operation=operation_name, indexed=indexed, **per_primary))
+
+                if fleet_size <= cross_check_limit:
+                    mismatches = cross_check_engines(primaries, schedule_list, safety_buffer_distance)
+                    results["cross_check"].append(dict(config, mismatches=mismatches))
+    results["index_comparison"] = compare_index_paths(densities, safety_buffer_distance=safety_buffer_distance, repeats=repeats, seed=seed)
+    results["runner_comparison"] = compare_runner_paths(safety_buffer_distance=safety_buffer_distance, repeats=repeats, seed=seed)
+    return results
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark and cross-check the deconfliction engines.")
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=list(DEFAULT_FLEET_SIZES))
+    parser.add_argument("--waypoints", type=int, nargs="+", default=list(DEFAULT_WAYPOINT_COUNTS))
+    parser.add_argument("--durations", type=float, nargs="+", default=list(DEFAULT_MISSION_DURATIONS))
+    parser.add_argument("--primaries", type=int, default=5)
+    parser.add_argument("--buffer", type=float, default=5.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cross-check-limit", type=int, default=100)
+    parser.add_argument("--label", default="local")
+    parser.add_argument("--densities", type=float, nargs="*", default=list(DEFAULT_DENSITIES))
+    parser.add_argument("--output", default="-", help="JSON output path, or - for stdout")
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmark(arguments.fleet_sizes, arguments.waypoints, arguments.durations, arguments.primaries,
+                            arguments.buffer, arguments.repeats, arguments.seed, arguments.cross_check_limit, arguments.label,
+                            arguments.densities)
+    serialized = json.dumps(results, indent=2)
+    if arguments.output == "-":
+        print(serialized)
+    else:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(serialized + "\n")
+    # A non-zero exit status flags engines that disagree, an index slower than the dense path or a runner slower than
+    # the per-call loop, so the suite can gate a CI job.
+    index_regressed = any(entry["slowdown"] > INDEX_SLOWDOWN_TOLERANCE or not entry["same_results"] for entry in results["index_comparison"])
+    runner_regressed = results["runner_comparison"]["speedup"] < 1.0 or not results["runner_comparison"]["same_results"]
+    return 1 if index_regressed or runner_regressed or any(entry["mismatches"] for entry in results["cross_check"]) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: broad_phase.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: space_time_boxes, sweep_and_prune, self_sweep_and_prune
+ Global Variables: TIME_AXIS, SELF_SWEEP_PAIRS_PER_CHUNK
+
+ '''
+
+from typing import Iterator, Optional, Tuple
+import numpy as np
+
+# Variable Name: TIME_AXIS: Column of the (x, y, z, t) box arrays holding time; the sweep runs along it.
+TIME_AXIS = 3
+# Variable Name: SELF_SWEEP_PAIRS_PER_CHUNK: Sweep candidates expanded per batch in sweep_and_prune and self_sweep_and_prune.
+SELF_SWEEP_PAIRS_PER_CHUNK = 1 << 20
+
+'''
+* Function Name: space_time_boxes
+* Input:
+* segments: Array of shape (N, 2, 3) with segment endpoints.
+* segment_times: Array of shape (N, 2) with each segment's [begin, end] time window.
+* spatial_padding: Distance added on every side of the spatial extent (float).
+* Output:
+* Tuple[np.ndarray, np.ndarray]: (N, 4) lower and upper corners of the (x, y, z, t) box swept by each segment.
+* Logic: The spatial part is the segment's bounding box grown by spatial_padding; the time part is its window.
+* Example Call:
+* low, high = space_time_boxes(segments, times, 5.0)
+'''
+
+def space_time_boxes(segments: np.ndarray, segment_times: np.ndarray, spatial_padding: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Axis-aligned (x, y, z, t) boxes swept by moving segments."""
+    low = np.concatenate([segments.min(axis=1) - spatial_padding, segment_times[:, :1]], axis=1)
+    high = np.concatenate([segments.max(axis=1) + spatial_padding, segment_times[:, 1:]], axis=1)
+    return low, high
+
+def _iter_run_chunks(run_starts: np.ndarray, run_lengths: np.ndarray, max_pairs_per_chunk: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Expand owner i's partner run [run_starts[i], run_starts[i] + run_lengths[i]) into (owners, partners), in bounded chunks."""
+    run_ends = np.cumsum(run_lengths)
+    owner_start = 0
+    while owner_start < len(run_lengths):
+        # Take whole runs until the chunk holds about max_pairs_per_chunk candidates.
+        chunk_base = run_ends[owner_start - 1] if owner_start else 0
+        owner_stop = max(int(np.searchsorted(run_ends, chunk_base + max_pairs_per_chunk, side='right')), owner_start + 1)
+        lengths = run_lengths[owner_start:owner_stop]
+        owners = np.repeat(np.arange(owner_start, owner_stop, dtype=np.int64), lengths)
+        partners = np.repeat(run_starts[owner_start:owner_stop], lengths) + np.arange(len(owners), dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        owner_start = owner_stop
+        yield owners, partners
+
+'''
+* Function Name: sweep_and_prune
+* Input:
+* low_one, high_one: (M, 4) box corners of the first set (e.g. the primary mission's segments).
+* low_two, high_two: (N, 4) box corners of the second set (e.g. every schedule segment).
+* max_pairs_per_chunk: Upper bound on sweep candidates expanded at once (int).
+* Output:
+* Tuple[np.ndarray, np.ndarray]: Row indices into the first set and column indices into the second set of every
+* pair whose boxes overlap on all four axes, ordered by row then column.
+* Logic: Two time windows overlap exactly when one of them starts inside the other, and the two cases (the second
+* set's box starts first or not) are disjoint. With both sets sorted by start time, each box's partners for the
+* case where it starts first form one contiguous run of the other set, found with two searchsorted calls, so the
+* sweep needs no Python loop. Runs are expanded in bounded chunks and tested on the spatial axes at once. Second-set
+* boxes outside the first set's overall extent are dropped up front. Work scales with the pairs that are airborne
+* together rather than with the product of the set sizes.
+* Example Call:
+* rows, columns = sweep_and_prune(primary_low, primary_high, schedule_low, schedule_high)
+'''
+
+def sweep_and_prune(low_one: np.ndarray, high_one: np.ndarray, low_two: np.ndarray, high_two: np.ndarray,
+                    max_pairs_per_chunk: int = SELF_SWEEP_PAIRS_PER_CHUNK) -> Tuple[np.ndarray, np.ndarray]:
+    """Cross-set box pairs that overlap in space and time."""
+    if len(low_one) == 0 or len(low_two) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Drop boxes of the second set that miss the first set's overall extent before expanding any runs.
+    kept_two = np.nonzero(np.all((low_two <= high_one.max(axis=0)) & (high_two >= low_one.min(axis=0)), axis=1))[0]
+    if len(kept_two) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order_one = np.argsort(low_one[:, TIME_AXIS], kind='stable')
+    order_two = kept_two[np.argsort(low_two[kept_two, TIME_AXIS], kind='stable')]
+    starts_one, starts_two = low_one[order_one, TIME_AXIS], low_two[order_two, TIME_AXIS]
+
+    rows, columns = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    # First pass: first-set boxes starting first (ties included) own the second-set boxes that start within their
+    # window. Second pass: second-set boxes starting strictly first own the first-set boxes starting within theirs.
+    for owner_order, owner_high, partner_order, partner_starts, starts, first_side, owner_is_row in (
+            (order_one, high_one, order_two, starts_two, starts_one, 'left', True),
+            (order_two, high_two, order_one, starts_one, starts_two, 'right', False)):
+        run_starts = np.searchsorted(partner_starts, starts, side=first_side)
+        run_lengths = np.maximum(np.searchsorted(partner_starts, owner_high[owner_order, TIME_AXIS], side='right') - run_starts, 0)
+        for owners, partners in _iter_run_chunks(run_starts, run_lengths, max_pairs_per_chunk):
+            box_rows, box_columns = (owner_order[owners], partner_order[partners]) if owner_is_row else (partner_order[partners], owner_order[owners])
+            overlapping = np.all((low_one[box_rows, :TIME_AXIS] <= high_two[box_columns, :TIME_AXIS]) &
+                                 (low_two[box_columns, :TIME_AXIS] <= high_one[box_rows, :TIME_AXIS]), axis=1)
+            rows.append(box_rows[overlapping])
+            columns.append(box_columns[overlapping])
+
+    rows, columns = np.concatenate(rows), np.concatenate(columns)
+    pair_order = np.lexsort((columns, rows))
+    return rows[pair_order], columns[pair_order]
+
+'''
+* Function Name: self_sweep_and_prune
+* Input:
+* low, high: (N, D) box corners of one set, e.g. the (x, y, z, t) boxes of every segment of a fleet.
+* groups: Optional (N,) group of each box; pairs within the same group are skipped (np.ndarray).
+* max_pairs_per_chunk: Upper bound on sweep candidates expanded at once (int).
+* Output:
+* Tuple[np.ndarray, np.ndarray]: Indices (first < second) of every pair of boxes that overlap on all D axes,
+* ordered by first then second.
+* Logic: Picks the two axes on which boxes are smallest relative to the spread of the set. Boxes are cut into strips
+* along the first of them (a box spanning several strips is copied into each) and sorted by their start on the
+* second within each strip, so every box's sweep partners form one contiguous run found with a single searchsorted.
+* Runs are expanded in bounded chunks and tested on every axis at once. A pair sharing several strips is kept only
+* in the strip holding the larger of the two strip-axis starts, so each pair is reported once. Everything is
+* vectorised; work scales with the boxes that share a strip and overlap on the sweep axis.
+* Example Call:
+* first, second = self_sweep_and_prune(low, high, segment_flight_ids)
+'''
+
+def self_sweep_and_prune(low: np.ndarray, high: np.ndarray, groups: Optional[np.ndarray] = None,
+                         max_pairs_per_chunk: int = SELF_SWEEP_PAIRS_PER_CHUNK) -> Tuple[np.ndarray, np.ndarray]:
+    """All overlapping box pairs within one set."""
+    box_count, axis_count = low.shape
+    if box_count < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    spread = np.maximum(high.max(axis=0) - low.min(axis=0), np.finfo(np.float64).tiny)
+    extent = high - low
+    strip_axis, sweep_axis = np.argsort(np.median(extent, axis=0) / spread, kind='stable')[:2] if axis_count > 1 else (0, 0)
+    strip_width = max(float(np.median(extent[:, strip_axis])), spread[strip_axis] / np.sqrt(box_count))
+    strip_low = np.floor((low[:, strip_axis] - low[:, strip_axis].min()) / strip_width).astype(np.int64)
+    strip_high = np.floor((high[:, strip_axis] - low[:, strip_axis].min()) / strip_width).astype(np.int64)
+
+    # Variable Name: entry_boxes / entry_strips: One entry per (box, strip it touches), sorted by strip then sweep-axis start.
+    strip_counts = strip_high - strip_low + 1
+    entry_boxes = np.repeat(np.arange(box_count, dtype=np.int64), strip_counts)
+    entry_strips = np.repeat(strip_low, strip_counts) + np.arange(len(entry_boxes), dtype=np.int64) - np.repeat(np.cumsum(strip_counts) - strip_counts, strip_counts)
+    sweep_origin = low[:, sweep_axis].min()
+    strip_span = 2.0 * spread[sweep_axis] + 1.0
+    entry_starts = entry_strips * strip_span + (low[entry_boxes, sweep_axis] - sweep_origin)
+    entry_order = np.argsort(entry_starts, kind='stable')
+    entry_boxes, entry_strips, entry_starts = entry_boxes[entry_order], entry_strips[entry_order], entry_starts[entry_order]
+    run_stops = np.searchsorted(entry_starts, entry_strips * strip_span + (high[entry_boxes, sweep_axis] - sweep_origin), side='right')
+    run_lengths = np.maximum(run_stops - np.arange(len(entry_boxes)) - 1, 0)
+
+    firsts, seconds = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    for owners, partners in _iter_run_chunks(np.arange(1, len(entry_boxes) + 1, dtype=np.int64), run_lengths, max_pairs_per_chunk):
+        box_one, box_two = entry_boxes[owners], entry_boxes[partners]
+        keep = np.all((low[box_one] <= high[box_two]) & (low[box_two] <= high[box_one]), axis=1)
+        keep &= entry_strips[owners] == np.maximum(strip_low[box_one], strip_low[box_two])
+        if groups is not None:
+            keep &= groups[box_one] != groups[box_two]
+        box_one, box_two = box_one[keep], box_two[keep]
+        firsts.append(np.minimum(box_one, box_two))
+        seconds.append(np.maximum(box_one, box_two))
+
+    firsts, seconds = np.concatenate(firsts), np.concatenate(seconds)
+    pair_order = np.lexsort((seconds, firsts))
+    return firsts[pair_order], seconds[pair_order]
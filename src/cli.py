@@ -0,0 +1,202 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: cli.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: load_schedules, iter_chunks, result_line, run_checks, measure_import_time, main
+ Global Variables: DEFAULT_CHUNK_SIZE, INDEX_MIN_SCHEDULE_SEGMENTS
+
+ '''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+import numpy as np
+from utils import Mission
+from deconfliction import DeconflictionSystem
+from conflict_records import ConflictRecords
+from mission_db import MissionDatabase, iter_missions_file, mission_file_format
+
+# Variable Name: DEFAULT_CHUNK_SIZE: Missions read, checked and written per batch; one write and flush per chunk.
+DEFAULT_CHUNK_SIZE = 256
+# Variable Name: INDEX_MIN_SCHEDULE_SEGMENTS: Schedule segment count from which run_checks builds a spatial index; below it a
+# chunk's dense all-pairs pass is cheaper than building and querying the grid.
+INDEX_MIN_SCHEDULE_SEGMENTS = 256
+
+'''
+* Function Name: load_schedules
+* Input:
+* path: Approved schedules as JSONL, CSV or a mission database written by mission_db (str).
+* file_format: "jsonl", "csv" or "uavdb"; inferred from the extension when omitted (str).
+* Output:
+* Tuple[List[Mission], np.ndarray]: The schedules and the flight id of each, used to label conflicts. Missions
+* without a flight_id in the file get their position.
+* Example Call:
+* schedule_list, schedule_ids = load_schedules("approved.jsonl")
+'''
+
+def load_schedules(path: str, file_format: Optional[str] = None) -> Tuple[List[Mission], np.ndarray]:
+    """Read every approved schedule into memory."""
+    if (file_format or os.path.splitext(path)[1].lstrip(".").lower()) == "uavdb":
+        database = MissionDatabase.open(path)
+        return database.schedule_list(), np.asarray(database.flight_ids, dtype=np.int64)
+    schedule_list, schedule_ids = [], []
+    with open(path, newline="") as source:
+        for position, (flight_id, mission) in enumerate(iter_missions_file(source, mission_file_format(path, file_format))):
+            schedule_list.append(mission)
+            schedule_ids.append(position if flight_id is None else flight_id)
+    return schedule_list, np.array(schedule_ids, dtype=np.int64)
+
+def iter_chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    """Group an iterator into lists of at most chunk_size items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+'''
+* Function Name: result_line
+* Input:
+* flight_id: Identifier of the checked mission (int).
+* mission_status: check_mission status (str).
+* conflicts: check_mission conflicts, flight_id holding schedule positions (ConflictRecords).
+* schedule_ids: Flight id of every schedule position (np.ndarray).
+* Output:
+* str: One JSON line {"flight_id", "status", "conflicts"} with conflict flight ids mapped to the schedule file's ids.
+* Example Call:
+* output.write(result_line(7, status, conflicts, schedule_ids))
+'''
+
+def result_line(flight_id: int, mission_status: str, conflicts: ConflictRecords, schedule_ids: np.ndarray) -> str:
+    """Serialise one check result as a JSON line."""
+    relabelled = conflicts.table.copy()
+    relabelled["flight_id"] = schedule_ids[relabelled["flight_id"]]
+    return json.dumps({"flight_id": flight_id, "status": mission_status,
+                       "conflicts": list(ConflictRecords(relabelled).iter_json())}) + "\n"
+
+'''
+* Function Name: run_checks
+* Input:
+* missions: (flight_id or None, Mission) pairs, e.g. from mission_db.iter_missions_file (Iterable[Tuple]).
+* schedule_list / schedule_ids: Approved schedules and their flight ids (List[Mission], np.ndarray).
+* output: Text stream receiving one JSON line per mission (TextIO).
+* safety_buffer_distance: Separation threshold (float).
+* chunk_size: Missions per read / write batch (int).
+* plot_directory: When set, 2D and 3D plots are written there for the selected missions (str).
+* plot_all: Plot every mission instead of only those with conflicts (bool).
+* use_index: Build a spatial index over the schedules; by default only when they hold at least
+* INDEX_MIN_SCHEDULE_SEGMENTS segments (bool).
+* Output:
+* dict: missions, conflicted (missions not clear), conflicts, plots, indexed, seconds and missions_per_second.
+* Logic: The schedules are indexed once when that pays off. Missions are pulled a chunk at a time and each chunk is
+* checked as one batch with DeconflictionSystem.check_missions, so the broad and narrow phases run once per chunk
+* rather than once per mission. The chunk's lines are written and flushed together, so results appear while the
+* input is still being read and memory stays bounded by one chunk. visualization (and with it matplotlib) is only
+* imported when a plot is due.
+* Example Call:
+* summary = run_checks(iter_missions_file(source, "jsonl"), schedules, schedule_ids, sys.stdout)
+'''
+
+def run_checks(missions: Iterable[Tuple[Optional[int], Mission]], schedule_list: List[Mission], schedule_ids: np.ndarray,
+               output: TextIO, safety_buffer_distance: float = 5.0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               plot_directory: Optional[str] = None, plot_all: bool = False, use_index: Optional[bool] = None) -> dict:
+    """Check a stream of missions and write JSON-lines results as they are produced."""
+    start_time = time.perf_counter()
+    deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+    if use_index is None:
+        use_index = sum(max(len(mission.coordinates) - 1, 1) for mission in schedule_list) >= INDEX_MIN_SCHEDULE_SEGMENTS
+    spatial_index = deconfliction_system.build_spatial_index(schedule_list) if use_index else None
+    summary = {"missions": 0, "conflicted": 0, "conflicts": 0, "plots": 0, "indexed": use_index}
+    for chunk in iter_chunks(missions, chunk_size):
+        lines, render_jobs = [], []
+        chunk_results = deconfliction_system.check_missions([mission for _, mission in chunk], schedule_list, spatial_index)
+        for (flight_id, mission), (mission_status, conflicts) in zip(chunk, chunk_results):
+            flight_id = summary["missions"] if flight_id is None else flight_id
+            lines.append(result_line(flight_id, mission_status, conflicts, schedule_ids))
+            summary["missions"] += 1
+            summary["conflicted"] += mission_status != "clear"
+            summary["conflicts"] += len(conflicts)
+            if plot_directory is not None and (plot_all or mission_status != "clear"):
+                for plot_kind in ("2d", "3d"):
+                    render_jobs.append((plot_kind, mission, schedule_list, conflicts, os.path.join(plot_directory, f"mission_{flight_id}_{plot_kind}.png")))
+        output.writelines(lines)
+        output.flush()
+        if render_jobs:
+            from visualization import render_plots
+            os.makedirs(plot_directory, exist_ok=True)
+            summary["plots"] += len(render_plots(render_jobs))
+    summary["seconds"] = time.perf_counter() - start_time
+    summary["missions_per_second"] = summary["missions"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+    return summary
+
+'''
+* Function Name: measure_import_time
+* Input:
+* module_name: Module to import in a fresh interpreter (str).
+* Output:
+* dict: module, seconds (cumulative import time reported by python -X importtime) and matplotlib_loaded.
+* Example Call:
+* print(measure_import_time("cli"))
+'''
+
+def measure_import_time(module_name: str = "cli") -> dict:
+    """Time importing a module in a fresh interpreter."""
+    probe = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import sys, {module_name}; print('matplotlib' in sys.modules)"],
+                           capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    cumulative_microseconds = 0
+    for line in probe.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; the module's own line carries its total.
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module_name:
+            cumulative_microseconds = int(fields[1])
+    return {"module": module_name, "seconds": cumulative_microseconds / 1e6, "matplotlib_loaded": probe.stdout.strip() == "True"}
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check UAV missions against approved schedules.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check_parser = commands.add_parser("check", help="stream missions and write one JSON result line per mission")
+    check_parser.add_argument("missions", help="missions to check (JSONL or CSV), or - for JSONL on stdin")
+    check_parser.add_argument("--schedules", required=True, help="approved schedules (JSONL, CSV or .uavdb)")
+    check_parser.add_argument("--format", choices=("jsonl", "csv"), help="missions file format; inferred from the extension by default")
+    check_parser.add_argument("--output", default="-", help="JSONL results path, or - for stdout")
+    check_parser.add_argument("--buffer", type=float, default=5.0)
+    check_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    check_parser.add_argument("--index", choices=("auto", "always", "never"), default="auto",
+                              help="spatial index over the schedules; auto builds one for large schedule sets")
+    check_parser.add_argument("--plot-dir", help="write 2D / 3D plots of conflicting missions to this directory")
+    check_parser.add_argument("--plot-all", action="store_true", help="with --plot-dir, plot every mission")
+    check_parser.add_argument("--stats", action="store_true", help="print a throughput summary to stderr")
+    import_parser = commands.add_parser("import-time", help="report how long importing a module takes")
+    import_parser.add_argument("module", nargs="?", default="cli")
+    arguments = parser.parse_args(argv)
+
+    if arguments.command == "import-time":
+        print(json.dumps(measure_import_time(arguments.module)))
+        return 0
+
+    schedule_list, schedule_ids = load_schedules(arguments.schedules)
+    mission_format = "jsonl" if arguments.missions == "-" and arguments.format is None else mission_file_format(arguments.missions, arguments.format)
+    mission_source = sys.stdin if arguments.missions == "-" else open(arguments.missions, newline="")
+    output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+    try:
+        summary = run_checks(iter_missions_file(mission_source, mission_format), schedule_list, schedule_ids, output,
+                             arguments.buffer, arguments.chunk_size, arguments.plot_dir, arguments.plot_all,
+                             {"auto": None, "always": True, "never": False}[arguments.index])
+    finally:
+        if mission_source is not sys.stdin:
+            mission_source.close()
+        if output is not sys.stdout:
+            output.close()
+    if arguments.stats:
+        print(json.dumps(summary), file=sys.stderr)
+    # Exit status 1 when any mission is not clear, so the runner can gate a pipeline.
+    return 1 if summary["conflicted"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: conflict_records.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: ConflictRecord, ConflictRecords (from_columns, from_dicts, concatenate, spatial, temporal, for_flights,
+            sorted, flight_ids, to_dicts, iter_json, save, load), as_conflict_records
+ Global Variables: CONFLICT_TYPES, CONFLICT_DTYPE
+
+ '''
+
+from collections.abc import Mapping
+from typing import Iterable, Iterator, List, Optional, Union
+import numpy as np
+
+# Variable Name: CONFLICT_TYPES: Names of the codes stored in the "type" column.
+# Variable Name: CONFLICT_DTYPE: One conflict per row. Spatial rows hold the primary segment in begin_point / end_point and
+# NaN times; temporal rows hold the coalesced interval, the instant of minimum separation and the primary position at
+# that instant in begin_point, with end_point NaN.
+CONFLICT_TYPES = ("spatial", "temporal")
+CONFLICT_DTYPE = np.dtype([("type", np.uint8), ("flight_id", np.int64), ("time", np.float64), ("t_begin", np.float64),
+                           ("t_end", np.float64), ("begin_point", np.float64, (3,)), ("end_point", np.float64, (3,)),
+                           ("distance", np.float64)])
+
+
+def _nan_table(row_count: int) -> np.ndarray:
+    table = np.zeros(row_count, dtype=CONFLICT_DTYPE)
+    for name in ("time", "t_begin", "t_end", "begin_point", "end_point", "distance"):
+        table[name] = np.nan
+    return table
+
+
+class ConflictRecord(Mapping):
+
+    '''
+    Variable Name: _table / _index: The structured array the record lives in and its row; nothing is copied.
+    Read-only dict-like view of one row with the keys of the original per-conflict dicts: type, location, distance and
+    flight_id for spatial conflicts, plus time, t_begin and t_end for temporal ones. location is a pair of points for a
+    spatial conflict and a single point for a temporal one. It compares equal to a dict with the same items.
+    '''
+
+    __slots__ = ("_table", "_index")
+
+    _SPATIAL_KEYS = ("type", "location", "distance", "flight_id")
+    _TEMPORAL_KEYS = ("type", "time", "t_begin", "t_end", "location", "distance", "flight_id")
+
+    def __init__(self, table: np.ndarray, index: int):
+        self._table = table
+        self._index = index
+
+    def _keys(self) -> tuple:
+        return self._SPATIAL_KEYS if self._table["type"][self._index] == 0 else self._TEMPORAL_KEYS
+
+    def __getitem__(self, key: str):
+        if key not in self._keys():
+            raise KeyError(key)
+        if key == "type":
+            return CONFLICT_TYPES[self._table["type"][self._index]]
+        if key == "flight_id":
+            return int(self._table["flight_id"][self._index])
+        if key == "location":
+            begin_point = tuple(self._table["begin_point"][self._index].tolist())
+            if self._table["type"][self._index] == 0:
+                return begin_point, tuple(self._table["end_point"][self._index].tolist())
+            return begin_point
+        return float(self._table[key][self._index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ConflictRecords:
+
+    '''
+    Variable Name: table: (N,) structured array with CONFLICT_DTYPE.
+    Result of a conflict check. Indexing with an int gives a ConflictRecord view, with a slice, mask or index array a
+    new ConflictRecords, and with a column name that column. Iterating yields views, so code written for lists of
+    dicts keeps working, while filtering, sorting, pickling and saving operate on the array directly.
+    '''
+
+    __slots__ = ("table",)
+
+    def __init__(self, table: Optional[np.ndarray] = None):
+        self.table = np.zeros(0, dtype=CONFLICT_DTYPE) if table is None else table
+
+    '''
+    * Function Name: from_columns
+    * Input:
+    * conflict_type: "spatial" or "temporal", shared by every row (str).
+    * flight_id, distance: (N,) columns (np.ndarray).
+    * time, t_begin, t_end, begin_point, end_point: Optional (N,) / (N, 3) columns; NaN when omitted (np.ndarray).
+    * Output:
+    * ConflictRecords: N records of one type.
+    * Example Call:
+    * records = ConflictRecords.from_columns("spatial", flight_ids, distances, begin_point=starts, end_point=ends)
+    '''
+
+    @classmethod
+    def from_columns(cls, conflict_type: str, flight_id: np.ndarray, distance: np.ndarray, **columns: np.ndarray) -> "ConflictRecords":
+        """Build records of one type from column arrays."""
+        table = _nan_table(len(flight_id))
+        table["type"] = CONFLICT_TYPES.index(conflict_type)
+        table["flight_id"] = flight_id
+        table["distance"] = distance
+        for name, values in columns.items():
+            table[name] = values
+        return cls(table)
+
+    @classmethod
+    def from_dicts(cls, conflicts: Iterable[Mapping]) -> "ConflictRecords":
+        """Build records from per-conflict dicts in the check_mission format."""
+        conflicts = list(conflicts)
+        table = _nan_table(len(conflicts))
+        for row, conflict in enumerate(conflicts):
+            spatial = conflict["type"] == "spatial"
+            table["type"][row] = CONFLICT_TYPES.index(conflict["type"])
+            table["flight_id"][row] = conflict["flight_id"]
+            table["distance"][row] = conflict["distance"]
+            if spatial:
+                table["begin_point"][row], table["end_point"][row] = conflict["location"]
+            else:
+                table["begin_point"][row] = conflict["location"]
+                for name in ("time", "t_begin", "t_end"):
+                    table[name][row] = conflict[name]
+        return cls(table)
+
+    @staticmethod
+    def concatenate(parts: Iterable["ConflictRecords"]) -> "ConflictRecords":
+        """Join several results, in order."""
+        tables = [part.table for part in parts]
+        return ConflictRecords(np.concatenate(tables) if tables else None)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __iter__(self) -> Iterator[ConflictRecord]:
+        return (ConflictRecord(self.table, index) for index in range(len(self.table)))
+
+    def __getitem__(self, selection: Union[int, str, slice, np.ndarray]) -> Union[ConflictRecord, np.ndarray, "ConflictRecords"]:
+        if isinstance(selection, str):
+            return self.table[selection]
+        if isinstance(selection, (int, np.integer)):
+            return ConflictRecord(self.table, range(len(self.table))[selection])
+        return ConflictRecords(self.table[selection])
+
+    def __add__(self, other: "ConflictRecords") -> "ConflictRecords":
+        return ConflictRecords.concatenate([self, as_conflict_records(other)])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ConflictRecords):
+            return self.table.tobytes() == other.table.tobytes()
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ConflictRecords({len(self)} conflicts: {int((self.table['type'] == 0).sum())} spatial, {int((self.table['type'] == 1).sum())} temporal)"
+
+    def spatial(self) -> "ConflictRecords":
+        """Only the spatial conflicts."""
+        return self[self.table["type"] == 0]
+
+    def temporal(self) -> "ConflictRecords":
+        """Only the temporal conflict intervals."""
+        return self[self.table["type"] == 1]
+
+    def for_flights(self, flight_ids: Iterable[int]) -> "ConflictRecords":
+        """Only the conflicts with the given flights."""
+        return self[np.isin(self.table["flight_id"], np.fromiter(flight_ids, dtype=np.int64))]
+
+    def sorted(self, *columns: str) -> "ConflictRecords":
+        """Stable sort by one or more columns, the first being the primary key (default: distance)."""
+        columns = columns or ("distance",)
+        return self[np.lexsort([self.table[name] for name in reversed(columns)])]
+
+    def flight_ids(self) -> np.ndarray:
+        """Sorted unique flight ids that appear in the result."""
+        return np.unique(self.table["flight_id"])
+
+    def to_dicts(self) -> List[dict]:
+        """Materialise plain per-conflict dicts."""
+        return [dict(record) for record in self]
+
+    '''
+    * Function Name: iter_json
+    * Input:
+    * None: Serialises the records in order.
+    * Output:
+    * Iterator[dict]: JSON-ready dicts with the view's keys; coordinates become lists.
+    * Logic: Columns are converted to Python values once per call with tolist, not per field access.
+    * Example Call:
+    * output_file.writelines(json.dumps(row) + "\n" for row in conflicts.iter_json())
+    '''
+
+    def iter_json(self) -> Iterator[dict]:
+        """JSON-ready dicts, one per conflict."""
+        columns = {name: self.table[name].tolist() for name in CONFLICT_DTYPE.names}
+        for row, type_code in enumerate(columns["type"]):
+            begin_point = columns["begin_point"][row]
+            if type_code == 0:
+                yield {"type": "spatial", "location": [begin_point, columns["end_point"][row]],
+                       "distance": columns["distance"][row], "flight_id": columns["flight_id"][row]}
+            else:
+                yield {"type": "temporal", "time": columns["time"][row], "t_begin": columns["t_begin"][row],
+                       "t_end": columns["t_end"][row], "location": begin_point, "distance": columns["distance"][row],
+                       "flight_id": columns["flight_id"][row]}
+
+    def save(self, path: str) -> None:
+        """Write the table as a .npy file."""
+        np.save(path, self.table)
+
+    @classmethod
+    def load(cls, path: str) -> "ConflictRecords":
+        """Read a table written by save."""
+        return cls(np.load(path).astype(CONFLICT_DTYPE, copy=False))
+
+'''
+* Function Name: as_conflict_records
+* Input:
+* conflicts: A ConflictRecords result or a list of per-conflict dicts (ConflictRecords or List[dict]).
+* Output:
+* ConflictRecords: The same conflicts; a ConflictRecords argument is returned unchanged.
+* Example Call:
+* conflicts = as_conflict_records(conflict_data)
+'''
+
+def as_conflict_records(conflicts: Union[ConflictRecords, Iterable[Mapping]]) -> ConflictRecords:
+    """Accept either result representation."""
+    return conflicts if isinstance(conflicts, ConflictRecords) else ConflictRecords.from_dicts(conflicts)
@@ -0,0 +1,246 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: conflict_resolver.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: ConflictResolver (check, propose_edits, resolve), apply_altitude_offset, insert_detour_waypoint, apply_time_shift
+ Global Variables: DEFAULT_STRATEGIES, DEFAULT_MAX_ITERATIONS
+
+ '''
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from utils import Mission
+from deconfliction import DeconflictionSystem
+from spatial_index import SegmentGrid
+from conflict_records import ConflictRecords, as_conflict_records
+
+# Variable Name: DEFAULT_STRATEGIES: Edit types tried for each conflict, in order of preference.
+# Variable Name: DEFAULT_MAX_ITERATIONS: Upper bound on accepted or escalated edits per resolve() call.
+DEFAULT_STRATEGIES = ("altitude_offset", "detour", "time_shift")
+DEFAULT_MAX_ITERATIONS = 50
+
+'''
+* Function Name: apply_altitude_offset
+* Input:
+* mission: Mission to edit (Mission object).
+* segment_row: Index of the segment whose two waypoints are moved (int).
+* offset: Altitude change in units; negative values descend (float).
+* Output:
+* Optional[Mission]: A new mission, or None if the edit would take a waypoint below altitude 0.
+* Example Call:
+* raised = apply_altitude_offset(my_mission, 2, 10.0)
+'''
+
+def apply_altitude_offset(mission: Mission, segment_row: int, offset: float) -> Optional[Mission]:
+    """Raise or lower both waypoints of one segment."""
+    coordinates = mission.coordinates.copy()
+    coordinates[segment_row:segment_row + 2, 2] += offset
+    if np.any(coordinates[segment_row:segment_row + 2, 2] < 0.0):
+        return None
+    return Mission(coordinates, mission.t_start, mission.t_end, mission.timestamps)
+
+'''
+* Function Name: insert_detour_waypoint
+* Input:
+* mission: Mission to edit (Mission object).
+* segment_row: Index of the segment to split (int).
+* lateral_offset: Horizontal distance of the new waypoint from the segment midpoint; the sign picks the side (float).
+* Output:
+* Mission: A new mission with one extra waypoint beside the middle of the segment.
+* Logic: The detour point is offset perpendicular to the segment in the x-y plane (along x for vertical segments).
+* It is reached halfway through the segment's own time interval and the edited mission carries explicit timestamps,
+* so every other segment keeps its timing (and its cached temporal hits) even when the original mission had none.
+* Example Call:
+* detoured = insert_detour_waypoint(my_mission, 2, -10.0)
+'''
+
+def insert_detour_waypoint(mission: Mission, segment_row: int, lateral_offset: float) -> Mission:
+    """Split one segment around a sideways detour point."""
+    coordinates = mission.coordinates
+    start_point, end_point = coordinates[segment_row], coordinates[min(segment_row + 1, len(coordinates) - 1)]
+    direction = end_point[:2] - start_point[:2]
+    length = np.hypot(direction[0], direction[1])
+    sideways = np.array([-direction[1], direction[0]]) / length if length > 0 else np.array([1.0, 0.0])
+    detour_point = (start_point + end_point) / 2.0
+    detour_point[:2] += lateral_offset * sideways
+    timestamps = None
+    if len(coordinates) > 1:
+        waypoint_times = mission.waypoint_times()
+        timestamps = np.insert(waypoint_times, segment_row + 1, (waypoint_times[segment_row] + waypoint_times[segment_row + 1]) / 2.0)
+    return Mission(np.insert(coordinates, segment_row + 1, detour_point, axis=0), mission.t_start, mission.t_end, timestamps)
+
+def apply_time_shift(mission: Mission, shift: float) -> Mission:
+    """Move the whole mission window by shift time units."""
+    # Explicit timestamps keep each segment's duration exactly, instead of re-splitting the shifted window.
+    timestamps = mission.waypoint_times() + shift if len(mission.coordinates) > 1 else None
+    return Mission(mission.coordinates, mission.t_start + shift, mission.t_end + shift, timestamps)
+
+def _penetration(conflicts: ConflictRecords, safety_buffer_distance: float) -> float:
+    # How far, summed over every conflict, the mission intrudes into the buffer; 0 exactly when it is clear.
+    return float(np.sum(safety_buffer_distance - conflicts["distance"]))
+
+def _split_by_row(hits: dict, row_count: int) -> List[dict]:
+    # One dict of hits per primary row, with the rows column dropped since the cache is keyed per segment.
+    order = np.argsort(hits["rows"], kind='stable')
+    boundaries = np.searchsorted(hits["rows"][order], np.arange(row_count + 1))
+    columns = {name: values[order] for name, values in hits.items() if name != "rows"}
+    return [{name: values[boundaries[row]:boundaries[row + 1]] for name, values in columns.items()} for row in range(row_count)]
+
+def _join_rows(per_row: List[dict]) -> dict:
+    counts = [len(row_hits["flight_ids"]) for row_hits in per_row]
+    joined = {name: np.concatenate([row_hits[name] for row_hits in per_row]) for name in per_row[0]}
+    joined["rows"] = np.repeat(np.arange(len(per_row)), counts)
+    return joined
+
+
+class ConflictResolver:
+
+    '''
+    Variable Name: deconfliction_system: Checker whose safety_buffer_distance the resolver clears the mission to.
+    Variable Name: spatial_index: Grid over schedule_list, built once and queried with changed segments only.
+    Variable Name: segments_checked / segments_reused: Per-segment cache misses and hits, summed over spatial and temporal.
+    Per-segment hits are cached by geometry (spatial) and by geometry plus time window (temporal), so after an edit
+    only the segments it changed are re-checked. The cache stays valid for as long as the schedules do not change.
+    '''
+
+    def __init__(self, schedule_list: List[Mission], safety_buffer_distance: float = 5.0, spatial_index: Optional[SegmentGrid] = None,
+                 strategies: Sequence[str] = DEFAULT_STRATEGIES, altitude_step: Optional[float] = None,
+                 detour_offset: Optional[float] = None, time_step: Optional[float] = None,
+                 max_iterations: int = DEFAULT_MAX_ITERATIONS):
+        self.schedule_list = schedule_list
+        self.deconfliction_system = DeconflictionSystem(safety_buffer_distance)
+        self.spatial_index = spatial_index if spatial_index is not None else self.deconfliction_system.build_spatial_index(schedule_list)
+        self.strategies = tuple(strategies)
+        self.altitude_step = altitude_step if altitude_step is not None else 2.0 * safety_buffer_distance
+        self.detour_offset = detour_offset if detour_offset is not None else 2.0 * safety_buffer_distance
+        self.time_step = time_step
+        self.max_iterations = max_iterations
+        self._spatial_cache: Dict[bytes, dict] = {}
+        self._temporal_cache: Dict[bytes, dict] = {}
+        self.segments_checked = 0
+        self.segments_reused = 0
+
+    '''
+    * Function Name: check
+    * Input:
+    * mission: Mission to check (Mission object).
+    * Output:
+    * ConflictRecords: The conflicts check_mission would report against the resolver's schedules.
+    * Logic: Looks every segment up in the two caches, runs DeconflictionSystem.segment_hits on the misses only, and
+    * rebuilds the records from the cached per-segment hits with DeconflictionSystem.conflict_records.
+    * Example Call:
+    * conflicts = resolver.check(candidate_mission)
+    '''
+
+    def check(self, mission: Mission) -> ConflictRecords:
+        """Incrementally check a mission against the schedules."""
+        segments, times = mission.segment_array(), mission.segment_times()
+        spatial_keys = [segment.tobytes() for segment in segments]
+        temporal_keys = [spatial_key + window.tobytes() for spatial_key, window in zip(spatial_keys, times)]
+        spatial_missing = sorted({row for row, key in enumerate(spatial_keys) if key not in self._spatial_cache})
+        temporal_missing = sorted({row for row, key in enumerate(temporal_keys) if key not in self._temporal_cache})
+        self.segments_checked += len(spatial_missing) + len(temporal_missing)
+        self.segments_reused += 2 * len(segments) - len(spatial_missing) - len(temporal_missing)
+
+        for missing_rows, keys, cache, include_spatial in ((spatial_missing, spatial_keys, self._spatial_cache, True),
+                                                           (temporal_missing, temporal_keys, self._temporal_cache, False)):
+            if not missing_rows:
+                continue
+            spatial_hits, temporal_hits = self.deconfliction_system.segment_hits(segments[missing_rows], times[missing_rows], self.schedule_list,
+                                                                                 self.spatial_index, include_spatial, not include_spatial)
+            for row, row_hits in zip(missing_rows, _split_by_row(spatial_hits if include_spatial else temporal_hits, len(missing_rows))):
+                cache[keys[row]] = row_hits
+
+        if not len(segments):
+            return ConflictRecords()
+        return self.deconfliction_system.conflict_records(segments, _join_rows([self._spatial_cache[key] for key in spatial_keys]),
+                                                          _join_rows([self._temporal_cache[key] for key in temporal_keys]))
+
+    def _conflict_rows(self, mission: Mission, conflicts: ConflictRecords) -> Iterator[int]:
+        # Map check_mission records back to primary segment rows, worst conflict first.
+        segments, times = mission.segment_array(), mission.segment_times()
+        row_by_segment = {segment.tobytes(): row for row, segment in reversed(list(enumerate(segments)))}
+        worst_first = conflicts.sorted("distance").table
+        for type_code, begin_point, end_point, conflict_time in zip(worst_first["type"].tolist(), worst_first["begin_point"],
+                                                                     worst_first["end_point"], worst_first["time"].tolist()):
+            if type_code == 0:
+                row = row_by_segment.get(np.stack([begin_point, end_point]).tobytes())
+            else:
+                row = min(int(np.searchsorted(times[:, 1], conflict_time)), len(segments) - 1)
+            if row is not None:
+                yield row
+
+    '''
+    * Function Name: propose_edits
+    * Input:
+    * mission: Mission to edit (Mission object).
+    * conflicts: Its current conflicts (ConflictRecords).
+    * scale: Multiplier applied to every step size, raised when no edit makes progress (float).
+    * Output:
+    * Iterator[Tuple[dict, Mission]]: (edit description, edited mission) candidates for the worst conflict.
+    * Logic: Altitude offsets move the conflicting segment up or down, detours split it around a sideways waypoint,
+    * and time shifts move the whole window earlier or later (by one segment duration unless time_step is set).
+    * Example Call:
+    * for edit, candidate in resolver.propose_edits(my_mission, conflicts): ...
+    '''
+
+    def propose_edits(self, mission: Mission, conflicts: ConflictRecords, scale: float = 1.0) -> Iterator[Tuple[dict, Mission]]:
+        """Generate candidate edits for the worst conflict."""
+        segment_row = next(self._conflict_rows(mission, as_conflict_records(conflicts)), None)
+        if segment_row is None:
+            return
+        time_step = self.time_step if self.time_step is not None else (mission.t_end - mission.t_start) / max(len(mission) - 1, 1)
+        for strategy in self.strategies:
+            for direction in (1.0, -1.0):
+                if strategy == "altitude_offset":
+                    offset = direction * scale * self.altitude_step
+                    edit, candidate = {"type": strategy, "segment": segment_row, "offset": offset}, apply_altitude_offset(mission, segment_row, offset)
+                elif strategy == "detour":
+                    offset = direction * scale * self.detour_offset
+                    edit, candidate = {"type": strategy, "segment": segment_row, "offset": offset}, insert_detour_waypoint(mission, segment_row, offset)
+                elif strategy == "time_shift":
+                    shift = direction * scale * time_step
+                    edit, candidate = {"type": strategy, "shift": shift}, apply_time_shift(mission, shift)
+                else:
+                    raise ValueError(f"unknown resolution strategy: {strategy!r}")
+                if candidate is not None:
+                    yield edit, candidate
+
+    '''
+    * Function Name: resolve
+    * Input:
+    * mission: Mission to clear (Mission object).
+    * conflicts: Its conflicts as returned by check_mission; computed when omitted (ConflictRecords or List[dict]).
+    * Output:
+    * Tuple[str, Mission, List[dict]]: Status ("clear", "unresolved" or "invalid mission"), the final mission and the
+    * accepted edits in order.
+    * Logic: Greedy refinement: every candidate edit for the worst conflict is re-checked incrementally and the one
+    * that most reduces the total buffer penetration is kept. When no candidate helps, the step sizes are doubled.
+    * Stops when the mission is clear or after max_iterations.
+    * Example Call:
+    * status, resolved_mission, edits = resolver.resolve(my_mission, conflicts)
+    '''
+
+    def resolve(self, mission: Mission, conflicts: Optional[ConflictRecords] = None) -> Tuple[str, Mission, List[dict]]:
+        """Edit the mission until it is clear of the schedules."""
+        if not mission.validate():
+            return "invalid mission", mission, []
+        safety_buffer_distance = self.deconfliction_system.safety_buffer_distance
+        conflicts = self.check(mission) if conflicts is None else as_conflict_records(conflicts)
+        edits, scale = [], 1.0
+        for _ in range(self.max_iterations):
+            if not conflicts:
+                return "clear", mission, edits
+            best_edit, best_mission, best_conflicts = None, None, None
+            best_penetration = _penetration(conflicts, safety_buffer_distance)
+            for edit, candidate in self.propose_edits(mission, conflicts, scale):
+                candidate_conflicts = self.check(candidate)
+                candidate_penetration = _penetration(candidate_conflicts, safety_buffer_distance)
+                if candidate_penetration < best_penetration:
+                    best_edit, best_mission, best_conflicts, best_penetration = edit, candidate, candidate_conflicts, candidate_penetration
+            if best_edit is None:
+                scale *= 2.0
+                continue
+            edits.append(best_edit)
+            mission, conflicts, scale = best_mission, best_conflicts, 1.0
+        return ("clear" if not conflicts else "unresolved"), mission, edits
@@ -2,21 +2,50 @@
 Author List: Subhrajit Mahana
  Filename: deconfliction.py
  Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
- Functions: __init__, segment_distance, interpolate_position, check_spatial_conflict, check_temporal_conflict, check_mission
- Global Variables: None
+ Functions: __init__, segment_distance, interpolate_position, build_spatial_index, iter_spatial_conflicts, check_spatial_conflict,
+            iter_temporal_conflicts, check_temporal_conflict, segment_hits, conflict_records, iter_conflicts, any_conflict, check_mission,
+            check_missions, check_fleet, clearance, save_conflict_graph, load_conflict_graph
+ Global Variables: TEMPORAL_PAIRS_PER_CHUNK, INTERVAL_MERGE_TOLERANCE, FLEET_CONFLICT_DTYPE, CLEARANCE_DTYPE
  
  '''
 
-from typing import List, Tuple, Optional
-from utils import Waypoint, Mission
+import json
+from itertools import chain, islice
+from typing import Iterator, List, Sequence, Tuple, Optional
+from utils import Waypoint, Mission, pack_mission_segments
+from geometry import (iter_segment_distance_blocks, paired_segment_distances, closest_approach, box_distances,
+                      DEFAULT_MAX_PAIRS_PER_CHUNK)
+from broad_phase import space_time_boxes, sweep_and_prune, self_sweep_and_prune
+from spatial_index import SegmentGrid
+from instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from conflict_records import ConflictRecord, ConflictRecords
 import numpy as np
 
+# Variable Name: TEMPORAL_PAIRS_PER_CHUNK: Candidate segment pairs solved per closest-approach batch (rounded up to a flight boundary).
+# Variable Name: INTERVAL_MERGE_TOLERANCE: Gap (in time units) below which consecutive conflict intervals of one flight are merged.
+TEMPORAL_PAIRS_PER_CHUNK = 4096
+INTERVAL_MERGE_TOLERANCE = 1e-9
+# Variable Name: FLEET_CONFLICT_DTYPE: One edge of the check_fleet conflict graph. first_time and min_distance describe the
+# earliest spatiotemporal conflict interval and the closest approach while airborne together (NaN when the paths only
+# come close at different times); path_distance is the minimum distance between the two paths (NaN when not checked).
+FLEET_CONFLICT_DTYPE = np.dtype([("mission_one", np.int64), ("mission_two", np.int64), ("first_time", np.float64),
+                                 ("min_distance", np.float64), ("path_distance", np.float64)])
+# Variable Name: CLEARANCE_DTYPE: Per-schedule clearance of a mission. path_distance is the minimum distance between the two
+# paths regardless of time; separation is the minimum distance while both are airborne, reached at time with the primary
+# at location (inf / NaN when they never fly together, or when beyond the query's max_distance).
+CLEARANCE_DTYPE = np.dtype([("flight_id", np.int64), ("path_distance", np.float64), ("separation", np.float64),
+                            ("time", np.float64), ("location", np.float64, (3,))])
+
+# Variable Name: _PAIR_COUNTER_NAMES: Counter names per check, built once so disabled instrumentation formats no strings.
+_PAIR_COUNTER_NAMES = {check_name: (f"{check_name}_pairs_considered", f"{check_name}_pairs_pruned", f"{check_name}_pairs_tested")
+                       for check_name in ("spatial", "temporal", "fleet", "clearance")}
+
 class DeconflictionSystem:
-    def __init__(self, safety_buffer_distance: float = 5.0):
+    def __init__(self, safety_buffer_distance: float = 5.0, instrumentation: Optional[Instrumentation] = None):
         # Variable Name: safety_buffer_distance: The minimum distance threshold (in units) for detecting conflicts, expected range: 0.0 to infinity.
-        # Variable Name: detected_conflicts_list: A list to store detected conflict details, initialized empty.
+        # Variable Name: instrumentation: Counters, phase timers and profile sink; the shared no-op instance when not given.
         self.safety_buffer_distance = safety_buffer_distance
-        self.detected_conflicts_list = []
+        self.instrumentation = instrumentation if instrumentation is not None else NULL_INSTRUMENTATION
 
     """
     * Function Name: segment_distance
@@ -27,8 +56,8 @@ class DeconflictionSystem:
     * end_waypoint_segment_two: Second waypoint of the second line segment (Waypoint object).
     * Output:
     * float: The shortest distance between the two line segments in 3D space.
-    * Logic: Uses vector mathematics to compute the closest distance between two 3D line segments.
-    * Employs dot product and normalization to find the closest points, with a fallback for point cases.
+    * Logic: Delegates to the batched closest-point kernel in geometry.py with a single pair, so the scalar and
+    * batched paths share one implementation (including the point-segment fallbacks).
     * Example Call:
     * distance = deconfliction.segment_distance(wp1, wp2, wp3, wp4)
 
@@ -36,37 +65,10 @@ class DeconflictionSystem:
 
     def segment_distance(self, start_waypoint_segment_one: Waypoint, end_waypoint_segment_one: Waypoint, start_waypoint_segment_two: Waypoint, end_waypoint_segment_two: Waypoint) -> float:
         """Calculate the closest distance between two line segments in 3D."""
-        def dot_product(u, v): return u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
-        def vector_norm(v): return np.sqrt(dot_product(v, v))
-
-        # Variable Name: point_a_coords: NumPy array of start_waypoint_segment_one coordinates, expected range: any 3D coordinates.
-        # Variable Name: point_b_coords: NumPy array of end_waypoint_segment_one coordinates, expected range: any 3D coordinates.
-        # Variable Name: point_c_coords: NumPy array of start_waypoint_segment_two coordinates, expected range: any 3D coordinates.
-        # Variable Name: point_d_coords: NumPy array of end_waypoint_segment_two coordinates, expected range: any 3D coordinates.
-
-        point_a_coords = np.array(start_waypoint_segment_one.to_tuple())
-        point_b_coords = np.array(end_waypoint_segment_one.to_tuple())
-        point_c_coords = np.array(start_waypoint_segment_two.to_tuple())
-        point_d_coords = np.array(end_waypoint_segment_two.to_tuple())
-
-        vector_ab = point_b_coords - point_a_coords
-        vector_cd = point_d_coords - point_c_coords
-        vector_ac = point_c_coords - point_a_coords
-
-        denominator = vector_norm(vector_ab) * vector_norm(vector_cd)
-        if denominator == 0:  # One or both segments are points
-            # Describe what the code below is doing
-            # Handles the case where one or both segments degenerate into points by computing minimum distances between endpoints.
-            return np.min([np.linalg.norm(point_a_coords - point_c_coords), np.linalg.norm(point_a_coords - point_d_coords),
-                           np.linalg.norm(point_b_coords - point_c_coords), np.linalg.norm(point_b_coords - point_d_coords)])
-
-        parameter_s = np.clip(dot_product(vector_ac, vector_ab) / (vector_norm(vector_ab) ** 2), 0, 1)
-        parameter_t = np.clip(-dot_product(vector_ac, vector_cd) / (vector_norm(vector_cd) ** 2), 0, 1)
-
-        closest_point_segment_one = point_a_coords + parameter_s * vector_ab
-        closest_point_segment_two = point_c_coords + parameter_t * vector_cd
-
-        return np.linalg.norm(closest_point_segment_one - closest_point_segment_two)
+        # Variable Name: endpoint_coords: (4, 3) array holding both segments' endpoints, expected range: any 3D coordinates.
+        endpoint_coords = np.array([start_waypoint_segment_one.to_tuple(), end_waypoint_segment_one.to_tuple(),
+                                    start_waypoint_segment_two.to_tuple(), end_waypoint_segment_two.to_tuple()], dtype=np.float64)
+        return paired_segment_distances(endpoint_coords[None, 0:2], endpoint_coords[None, 2:4])[0]
 
     '''
     * Function Name: interpolate_position
@@ -76,7 +78,9 @@ class DeconflictionSystem:
     * Output:
     * Optional[Tuple[float, float, float]]: The interpolated 3D position as a tuple (x, y, z), or None if out of range.
     * Logic: Calculates the position at current_time by determining the segment index and interpolating between waypoints linearly.
-    * Prints debug information for validation.
+    * Segments take equal time unless the mission carries per-waypoint timestamps. For many missions or many times at
+    * once, use trajectory.TrajectorySampler instead.
+    * Each call is counted under "interpolations" by the configured instrumentation.
     * Example Call:
     * position = deconfliction.interpolate_position(my_mission, 45.1)
 
@@ -84,129 +88,651 @@ class DeconflictionSystem:
 
     def interpolate_position(self, drone_mission: Mission, current_time: float) -> Optional[Tuple[float, float, float]]:
         """Interpolate the drone's position at current_time in 3D."""
+        self.instrumentation.count("interpolations")
         if current_time < drone_mission.t_start or current_time > drone_mission.t_end or not drone_mission.validate():
             return None
 
+        # Variable Name: path_coordinates: The mission's (K, 3) waypoint array, read in place.
+        path_coordinates = drone_mission.coordinates
+        if len(path_coordinates) == 1:
+            return tuple(path_coordinates[0].tolist())
+
+        if drone_mission.timestamps is not None:
+            # Explicit per-waypoint times: find the segment by binary search and interpolate within its own duration.
+            arrival_times = drone_mission.timestamps
+            segment_index = min(int(np.searchsorted(arrival_times, current_time, side='right')) - 1, len(path_coordinates) - 2)
+            segment_duration = arrival_times[segment_index + 1] - arrival_times[segment_index]
+            interpolation_factor = (current_time - arrival_times[segment_index]) / segment_duration if segment_duration > 0 else 1.0
+            start_waypoint, end_waypoint = path_coordinates[segment_index], path_coordinates[segment_index + 1]
+            return tuple((start_waypoint + interpolation_factor * (end_waypoint - start_waypoint)).tolist())
+
         total_mission_time = drone_mission.t_end - drone_mission.t_start
         # Variable Name: segment_time_duration: The time duration for each waypoint segment, expected range: 0.0 to total_mission_time.
-        segment_time_duration = total_mission_time / (len(drone_mission.waypoints) - 1)
+        segment_time_duration = total_mission_time / (len(path_coordinates) - 1)
 
         segment_index = int((current_time - drone_mission.t_start) / segment_time_duration)
-        if segment_index >= len(drone_mission.waypoints) - 1:
-            return drone_mission.waypoints[-1].to_tuple()
-
-        time_within_segment = (current_time - drone_mission.t_start) % segment_time_duration
-        interpolation_factor = time_within_segment / segment_time_duration
-
-        start_waypoint = drone_mission.waypoints[segment_index]
-        end_waypoint = drone_mission.waypoints[segment_index + 1]
-
-        x_coord = start_waypoint.x + interpolation_factor * (end_waypoint.x - start_waypoint.x)
-        y_coord = start_waypoint.y + interpolation_factor * (end_waypoint.y - start_waypoint.y)
-        z_coord = start_waypoint.z_altitude + interpolation_factor * (end_waypoint.z_altitude - start_waypoint.z_altitude)  # Changed from z to z_altitude
-        
-        position = (x_coord, y_coord, z_coord)
-        print(f"Debug: t={current_time}, Interpolated position: {position}")
-        return position
+        if segment_index >= len(path_coordinates) - 1:
+            return tuple(path_coordinates[-1].tolist())
+
+        # Measured from the chosen segment's start rather than with %, which can wrap to a full segment at a boundary.
+        interpolation_factor = min(max((current_time - drone_mission.t_start) / segment_time_duration - segment_index, 0.0), 1.0)
+
+        start_waypoint = path_coordinates[segment_index]
+        end_waypoint = path_coordinates[segment_index + 1]
+
+        x_coord, y_coord, z_coord = (start_waypoint + interpolation_factor * (end_waypoint - start_waypoint)).tolist()
+        return (x_coord, y_coord, z_coord)
     
+    '''
+    * Function Name: build_spatial_index
+    * Input:
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * cell_size: Optional grid cell size, chosen from the data when omitted (float).
+    * Output:
+    * SegmentGrid: A hash-grid index over every schedule segment, padded by safety_buffer_distance.
+    * Logic: Built once and passed to check_spatial_conflict / check_mission so many primary missions can be
+    * checked against the same schedules without re-indexing.
+    * Example Call:
+    * index = deconfliction.build_spatial_index([sched1, sched2])
+    '''
+
+    def build_spatial_index(self, schedule_list: List[Mission], cell_size: Optional[float] = None) -> SegmentGrid:
+        """Index the schedule segments for repeated spatial checks."""
+        return SegmentGrid.from_schedules(schedule_list, self.safety_buffer_distance, cell_size)
+
+    def _count_pairs(self, check_name: str, considered: int, tested: int) -> None:
+        if not self.instrumentation.enabled:
+            return
+        considered_name, pruned_name, tested_name = _PAIR_COUNTER_NAMES[check_name]
+        self.instrumentation.count(considered_name, considered)
+        self.instrumentation.count(pruned_name, considered - tested)
+        self.instrumentation.count(tested_name, tested)
+
+    def _spatial_records(self, primary_segments: np.ndarray, conflict_rows: np.ndarray, conflict_flight_ids: np.ndarray,
+                         conflict_segment_ids: np.ndarray, conflict_distances: np.ndarray) -> ConflictRecords:
+        # Report hits flight by flight, then by primary segment, then by schedule segment.
+        report_order = np.lexsort((conflict_segment_ids, conflict_rows, conflict_flight_ids))
+        report_rows = conflict_rows[report_order]
+        self.instrumentation.count("conflicts_emitted", len(report_order))
+        return ConflictRecords.from_columns("spatial", conflict_flight_ids[report_order], conflict_distances[report_order],
+                                            begin_point=primary_segments[report_rows, 0], end_point=primary_segments[report_rows, 1])
+
+    '''
+    * Function Name: iter_spatial_conflicts
+    * Input:
+    * primary_mission: The primary Mission object to check (Mission object).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid built from schedule_list with build_spatial_index (SegmentGrid).
+    * Output:
+    * Iterator[ConflictRecord]: Spatial conflict records (type, location, distance, flight_id), flight by flight.
+    * Logic: With a spatial_index, only the candidate pairs returned by the grid reach the exact distance kernel.
+    * Without one, every schedule segment is packed into one (N, 2, 3) array and the primary x schedule distance
+    * matrix is evaluated in bounded column chunks. Records for flights finished within a chunk are yielded before the
+    * next chunk is computed, so a consumer that stops early never pays for the remaining chunks.
+    * Example Call:
+    * first_hit = next(deconfliction.iter_spatial_conflicts(my_mission, [sched1, sched2]), None)
+    '''
+
+    def iter_spatial_conflicts(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> Iterator[ConflictRecord]:
+        """Yield spatial conflicts in 3D as they are found."""
+        for records in self._iter_spatial_tables(primary_mission, schedule_list, spatial_index):
+            yield from records
+
+    def _iter_spatial_tables(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid]) -> Iterator[ConflictRecords]:
+        primary_segments = primary_mission.segment_array()
+        if spatial_index is not None:
+            candidate_rows, candidate_flight_ids, candidate_segment_ids, candidate_segments = spatial_index.query(primary_segments, self.safety_buffer_distance)
+            candidate_distances = paired_segment_distances(primary_segments[candidate_rows], candidate_segments)
+            self._count_pairs("spatial", len(primary_segments) * spatial_index.segment_count, len(candidate_rows))
+            hits = candidate_distances < self.safety_buffer_distance
+            yield self._spatial_records(primary_segments, candidate_rows[hits], candidate_flight_ids[hits],
+                                        candidate_segment_ids[hits], candidate_distances[hits])
+            return
+
+        schedule_segments, _, segment_flight_ids, segment_ids = pack_mission_segments(schedule_list)
+        self._count_pairs("spatial", len(primary_segments) * len(schedule_segments), len(primary_segments) * len(schedule_segments))
+        # Variable Name: pending_rows / pending_columns / pending_distances: Hits of the flight cut by the previous chunk boundary.
+        pending_rows, pending_columns, pending_distances = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+        for column_start, column_stop, distance_block in iter_segment_distance_blocks(primary_segments, schedule_segments):
+            block_rows, block_columns = np.nonzero(distance_block < self.safety_buffer_distance)
+            conflict_rows = np.concatenate([pending_rows, block_rows])
+            conflict_columns = np.concatenate([pending_columns, block_columns + column_start])
+            conflict_distances = np.concatenate([pending_distances, distance_block[block_rows, block_columns]])
+            if column_stop < len(schedule_segments):
+                complete = segment_flight_ids[conflict_columns] < segment_flight_ids[column_stop]
+            else:
+                complete = np.ones(len(conflict_rows), dtype=bool)
+            yield self._spatial_records(primary_segments, conflict_rows[complete], segment_flight_ids[conflict_columns[complete]],
+                                        segment_ids[conflict_columns[complete]], conflict_distances[complete])
+            pending_rows, pending_columns, pending_distances = conflict_rows[~complete], conflict_columns[~complete], conflict_distances[~complete]
+
     '''
     * Function Name: check_spatial_conflict
     * Input:
     * primary_mission: The primary Mission object to check (Mission object).
     * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid built from schedule_list with build_spatial_index (SegmentGrid).
     * Output:
-    * List[dict]: List of dictionaries containing conflict details (type, location, distance, flight_id).
-    * Logic: Iterates over all segment pairs between the primary_mission and schedule_list, computing distances using segment_distance.
-    * Records conflicts if distance < safety_buffer_distance.
+    * ConflictRecords: Spatial conflicts (type, location, distance, flight_id), returned rather than stored on the
+    * instance so one system can serve several threads.
+    * Logic: Concatenates the per-chunk tables behind iter_spatial_conflicts. Records conflicts where distance < safety_buffer_distance.
     * Example Call:
     * conflicts = deconfliction.check_spatial_conflict(my_mission, [sched1, sched2])
 
     '''
-    def check_spatial_conflict(self, primary_mission: Mission, schedule_list: List[Mission]) -> List[dict]:
+    def check_spatial_conflict(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> ConflictRecords:
         """Check for spatial conflicts in 3D."""
-        self.detected_conflicts_list = []
-        for flight_index, current_schedule in enumerate(schedule_list):
-            for segment_index in range(len(primary_mission.waypoints) - 1):
-                start_point_one, end_point_one = primary_mission.waypoints[segment_index], primary_mission.waypoints[segment_index + 1]
-                for segment_index_two in range(len(current_schedule.waypoints) - 1):
-                    start_point_two, end_point_two = current_schedule.waypoints[segment_index_two], current_schedule.waypoints[segment_index_two + 1]
-                    distance = self.segment_distance(start_point_one, end_point_one, start_point_two, end_point_two)
-                    if distance < self.safety_buffer_distance:
-                        self.detected_conflicts_list.append({
-                            "type": "spatial",
-                            "location": (start_point_one.to_tuple(), end_point_one.to_tuple()),
-                            "distance": distance,
-                            "flight_id": flight_index
-                        })
-        return self.detected_conflicts_list
+        with self.instrumentation.phase("spatial"):
+            return ConflictRecords.concatenate(self._iter_spatial_tables(primary_mission, schedule_list, spatial_index))
+
+    def _temporal_candidates(self, primary_segments: np.ndarray, primary_times: np.ndarray, schedule_list: List[Mission],
+                             spatial_index: Optional[SegmentGrid]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if spatial_index is not None:
+            pair_rows, pair_flight_ids, pair_segment_ids, pair_segments = spatial_index.query(primary_segments, self.safety_buffer_distance)
+            pair_times = spatial_index.candidate_times(pair_flight_ids, pair_segment_ids)
+            airborne_together = (primary_times[pair_rows, 0] <= pair_times[:, 1]) & (pair_times[:, 0] <= primary_times[pair_rows, 1])
+            self._count_pairs("temporal", len(primary_segments) * spatial_index.segment_count, int(airborne_together.sum()))
+            return pair_rows[airborne_together], pair_flight_ids[airborne_together], pair_segments[airborne_together], pair_times[airborne_together]
+        schedule_segments, schedule_times, segment_flight_ids, _ = pack_mission_segments(schedule_list)
+        primary_low, primary_high = space_time_boxes(primary_segments, primary_times)
+        schedule_low, schedule_high = space_time_boxes(schedule_segments, schedule_times, self.safety_buffer_distance)
+        pair_rows, pair_columns = sweep_and_prune(primary_low, primary_high, schedule_low, schedule_high)
+        self._count_pairs("temporal", len(primary_segments) * len(schedule_segments), len(pair_rows))
+        return pair_rows, segment_flight_ids[pair_columns], schedule_segments[pair_columns], schedule_times[pair_columns]
+
+    def _temporal_records(self, pair_flight_ids: np.ndarray, approach: dict) -> ConflictRecords:
+        # Merge the conflicting segment-pair intervals of each flight that touch or overlap, flight by flight.
+        conflicting = np.nonzero(approach["distance"] < self.safety_buffer_distance)[0]
+        hits = conflicting[np.lexsort((approach["t_begin"][conflicting], pair_flight_ids[conflicting]))]
+        if not len(hits):
+            return ConflictRecords()
+        flight_ids, t_begin, t_end = pair_flight_ids[hits], approach["t_begin"][hits], approach["t_end"][hits]
+
+        # Latest t_end so far within the same flight. Ranking t_end and prefixing the flight's rank gives integer keys
+        # whose running maximum never crosses a flight boundary, so this is exact.
+        end_order = np.argsort(t_end, kind='stable')
+        end_ranks = np.empty(len(hits), dtype=np.int64)
+        end_ranks[end_order] = np.arange(len(hits))
+        new_flight = np.concatenate([[True], flight_ids[1:] != flight_ids[:-1]])
+        running_keys = np.maximum.accumulate((np.cumsum(new_flight) - 1) * len(hits) + end_ranks)
+        running_end = t_end[end_order[running_keys % len(hits)]]
+
+        new_interval = new_flight.copy()
+        new_interval[1:] |= t_begin[1:] > running_end[:-1] + INTERVAL_MERGE_TOLERANCE
+        interval_starts = np.nonzero(new_interval)[0]
+        interval_ids = np.cumsum(new_interval) - 1
+        # The closest hit of each interval, the earliest one on ties.
+        by_distance = np.lexsort((np.arange(len(hits)), approach["distance"][hits], interval_ids))
+        closest = hits[by_distance[np.concatenate([[True], np.diff(interval_ids[by_distance]) != 0])]]
+
+        self.instrumentation.count("conflicts_emitted", len(interval_starts))
+        return ConflictRecords.from_columns("temporal", flight_ids[interval_starts], approach["distance"][closest],
+                                            time=approach["time"][closest], t_begin=t_begin[interval_starts],
+                                            t_end=np.maximum.reduceat(t_end, interval_starts), begin_point=approach["location"][closest])
+
+    '''
+    * Function Name: iter_temporal_conflicts
+    * Input:
+    * primary_mission: The primary Mission object to check (Mission object).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over the schedules, built with segment times (SegmentGrid).
+    * Output:
+    * Iterator[ConflictRecord]: One record per conflict interval (type, flight_id, t_begin, t_end, time, location, distance), where
+    * distance is the minimum separation over the interval and time / location give the instant and primary position
+    * at which it occurs.
+    * Logic: A sort-and-sweep over (x, y, z, t) boxes (see broad_phase.sweep_and_prune) pairs each primary segment
+    * with the schedule segments that are airborne at the same time and within safety_buffer_distance of its bounding
+    * box; with a spatial_index, the grid's candidates are filtered by time window instead. Candidate pairs are grouped
+    * by flight and solved analytically (see geometry.closest_approach) a chunk of flights at a time. Segment-pair
+    * intervals of the same flight that touch or overlap are merged, so one continuous encounter is one record no
+    * matter how long it lasts or how many segments it spans.
+    * Example Call:
+    * for conflict in deconfliction.iter_temporal_conflicts(my_mission, [sched1, sched2]): ...
+    '''
+
+    def iter_temporal_conflicts(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> Iterator[ConflictRecord]:
+        """Yield coalesced spatiotemporal conflict intervals in 3D."""
+        for records in self._iter_temporal_tables(primary_mission, schedule_list, spatial_index):
+            yield from records
+
+    def _iter_temporal_tables(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid]) -> Iterator[ConflictRecords]:
+        primary_segments = primary_mission.segment_array()
+        primary_times = primary_mission.segment_times()
+        pair_rows, pair_flight_ids, pair_segments, pair_times = self._temporal_candidates(primary_segments, primary_times, schedule_list, spatial_index)
+
+        flight_order = np.argsort(pair_flight_ids, kind='stable')
+        pair_rows, pair_flight_ids = pair_rows[flight_order], pair_flight_ids[flight_order]
+        pair_segments, pair_times = pair_segments[flight_order], pair_times[flight_order]
+        chunk_start = 0
+        while chunk_start < len(pair_rows):
+            # Extend the chunk to the next flight boundary so every flight's intervals are merged within one chunk.
+            chunk_stop = min(chunk_start + TEMPORAL_PAIRS_PER_CHUNK, len(pair_rows))
+            if chunk_stop < len(pair_rows):
+                chunk_stop = int(np.searchsorted(pair_flight_ids, pair_flight_ids[chunk_stop - 1], side='right'))
+            chunk = slice(chunk_start, chunk_stop)
+            chunk_start = chunk_stop
+
+            approach = closest_approach(primary_segments[pair_rows[chunk]], primary_times[pair_rows[chunk]],
+                                        pair_segments[chunk], pair_times[chunk], self.safety_buffer_distance)
+            yield self._temporal_records(pair_flight_ids[chunk], approach)
 
     '''
     * Function Name: check_temporal_conflict
     * Input:
     * primary_mission: The primary Mission object to check (Mission object).
     * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over the schedules, built with segment times (SegmentGrid).
     * Output:
-    * List[dict]: List of dictionaries containing conflict details (type, time, location, distance, flight_id).
-    * Logic: Interpolates positions at discrete time steps within overlapping windows, checking distances.
-    * Records temporal conflicts if distance < safety_buffer_distance.
+    * ConflictRecords: Temporal conflicts (type, time, t_begin, t_end, location, distance, flight_id).
+    * Logic: Concatenates the per-chunk tables behind iter_temporal_conflicts: one record per continuous interval spent closer than
+    * safety_buffer_distance, with the time and primary position of minimum separation and that minimum distance.
+    * Cost depends on segment counts, not on mission duration.
     * Example Call:
     * conflicts = deconfliction.check_temporal_conflict(my_mission, [sched1, sched2])
 
     '''
-    def check_temporal_conflict(self, primary_mission: Mission, schedule_list: List[Mission]) -> List[dict]:
+    def check_temporal_conflict(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> ConflictRecords:
         """Check for spatiotemporal conflicts in 3D."""
-        self.detected_conflicts_list = []
-        # Variable Name: start_time_overlap: The earliest start time among overlapping missions, expected range: 0.0 to infinity.
-        # Variable Name: end_time_overlap: The latest end time among overlapping missions, expected range: 0.0 to infinity.
-        start_time_overlap = max(primary_mission.t_start, min(s.t_start for s in schedule_list))
-        end_time_overlap = min(primary_mission.t_end, max(s.t_end for s in schedule_list))
-
-        if start_time_overlap >= end_time_overlap:
-            return self.detected_conflicts_list
-
-        # Variable Name: time_step_increment: Time step increment for interpolation, expected range: 0.0 to 1.0.
-        time_step_increment = 0.1
-        for current_time in np.arange(start_time_overlap, end_time_overlap, time_step_increment):
-            position_one = self.interpolate_position(primary_mission, current_time)
-            if position_one is None:
-                continue
-            for flight_index, current_schedule in enumerate(schedule_list):
-                position_two = self.interpolate_position(current_schedule, current_time)
-                if position_two is None:
-                    continue
-                distance = np.linalg.norm(np.array(position_one) - np.array(position_two))
-                if distance < self.safety_buffer_distance:
-                    self.detected_conflicts_list.append({
-                        "type": "temporal",
-                        "time": current_time,
-                        "location": position_one,
-                        "distance": distance,
-                        "flight_id": flight_index
-                    })
-        return self.detected_conflicts_list
+        with self.instrumentation.phase("temporal"):
+            return ConflictRecords.concatenate(self._iter_temporal_tables(primary_mission, schedule_list, spatial_index))
+
+    '''
+    * Function Name: segment_hits
+    * Input:
+    * primary_segments: (S, 2, 3) primary segments to check, any subset of a mission (np.ndarray).
+    * primary_times: (S, 2) time window of each primary segment (np.ndarray).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over schedule_list, reused across calls (SegmentGrid).
+    * include_spatial / include_temporal: Skip one of the checks; its result is then None (bool).
+    * Output:
+    * Tuple[Optional[dict], Optional[dict]]: Unmerged segment-pair hits under safety_buffer_distance. Spatial: rows,
+    * flight_ids, segment_ids, distance. Temporal: rows, flight_ids, time, t_begin, t_end, location, distance.
+    * Logic: Runs the same broad and narrow phases as the spatial and temporal checks but stops before records are
+    * built, so callers that re-check only some segments of a mission can keep per-segment results and combine them
+    * later with conflict_records.
+    * Example Call:
+    * spatial_hits, temporal_hits = deconfliction.segment_hits(segments[3:5], times[3:5], schedules, index)
+    '''
+
+    def segment_hits(self, primary_segments: np.ndarray, primary_times: np.ndarray, schedule_list: List[Mission],
+                     spatial_index: Optional[SegmentGrid] = None, include_spatial: bool = True,
+                     include_temporal: bool = True) -> Tuple[Optional[dict], Optional[dict]]:
+        """Find every segment pair closer than the buffer, without building records."""
+        spatial_hits = self._spatial_hits(primary_segments, schedule_list, spatial_index) if include_spatial else None
+        temporal_hits = None
+        if include_temporal:
+            pair_rows, pair_flight_ids, pair_segments, pair_times = self._temporal_candidates(primary_segments, primary_times, schedule_list, spatial_index)
+            approach = closest_approach(primary_segments[pair_rows], primary_times[pair_rows], pair_segments, pair_times, self.safety_buffer_distance)
+            hits = approach["distance"] < self.safety_buffer_distance
+            temporal_hits = {name: values[hits] for name, values in approach.items()}
+            temporal_hits.update(rows=pair_rows[hits], flight_ids=pair_flight_ids[hits])
+        return spatial_hits, temporal_hits
+
+    def _spatial_hits(self, primary_segments: np.ndarray, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid]) -> dict:
+        if spatial_index is not None:
+            candidate_rows, candidate_flight_ids, candidate_segment_ids, candidate_segments = spatial_index.query(primary_segments, self.safety_buffer_distance)
+            candidate_distances = paired_segment_distances(primary_segments[candidate_rows], candidate_segments)
+            self._count_pairs("spatial", len(primary_segments) * spatial_index.segment_count, len(candidate_rows))
+            hits = candidate_distances < self.safety_buffer_distance
+            return {"rows": candidate_rows[hits], "flight_ids": candidate_flight_ids[hits],
+                    "segment_ids": candidate_segment_ids[hits], "distance": candidate_distances[hits]}
+        schedule_segments, _, segment_flight_ids, segment_ids = pack_mission_segments(schedule_list)
+        self._count_pairs("spatial", len(primary_segments) * len(schedule_segments), len(primary_segments) * len(schedule_segments))
+        row_blocks, column_blocks, distance_blocks = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0)]
+        for column_start, _, distance_block in iter_segment_distance_blocks(primary_segments, schedule_segments):
+            block_rows, block_columns = np.nonzero(distance_block < self.safety_buffer_distance)
+            row_blocks.append(block_rows)
+            column_blocks.append(block_columns + column_start)
+            distance_blocks.append(distance_block[block_rows, block_columns])
+        hit_columns = np.concatenate(column_blocks)
+        return {"rows": np.concatenate(row_blocks), "flight_ids": segment_flight_ids[hit_columns],
+                "segment_ids": segment_ids[hit_columns], "distance": np.concatenate(distance_blocks)}
+
+    '''
+    * Function Name: conflict_records
+    * Input:
+    * primary_segments: (S, 2, 3) segments of the whole primary mission (np.ndarray).
+    * spatial_hits / temporal_hits: segment_hits output for those segments, with rows indexing primary_segments (dict).
+    * Output:
+    * ConflictRecords: Spatial records followed by coalesced temporal intervals, exactly as check_mission reports them.
+    * Example Call:
+    * conflicts = deconfliction.conflict_records(segments, spatial_hits, temporal_hits)
+    '''
+
+    def conflict_records(self, primary_segments: np.ndarray, spatial_hits: dict, temporal_hits: dict) -> ConflictRecords:
+        """Turn segment-pair hits into conflict records."""
+        return (self._spatial_records(primary_segments, spatial_hits["rows"], spatial_hits["flight_ids"],
+                                      spatial_hits["segment_ids"], spatial_hits["distance"])
+                + self._temporal_records(temporal_hits["flight_ids"], temporal_hits))
+
+    '''
+    * Function Name: iter_conflicts
+    * Input:
+    * primary_mission: The primary Mission object to check (Mission object).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over schedule_list, reused across calls (SegmentGrid).
+    * first_only: Stop after the first conflict (bool).
+    * Output:
+    * Iterator[ConflictRecord]: Spatial conflicts followed by temporal conflict intervals, yielded as they are found.
+    * Logic: Chains iter_spatial_conflicts and iter_temporal_conflicts. Spatial hits come first because any temporal
+    * conflict implies a spatial one, so first_only returns as soon as the cheaper check finds anything.
+    * Example Call:
+    * for conflict in deconfliction.iter_conflicts(my_mission, [sched1, sched2]): ...
+    '''
+
+    def iter_conflicts(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None,
+                       first_only: bool = False) -> Iterator[ConflictRecord]:
+        """Stream every conflict of the mission."""
+        conflicts = chain(self.iter_spatial_conflicts(primary_mission, schedule_list, spatial_index),
+                          self.iter_temporal_conflicts(primary_mission, schedule_list, spatial_index))
+        yield from islice(conflicts, 1) if first_only else conflicts
+
+    '''
+    * Function Name: any_conflict
+    * Input:
+    * primary_mission: The primary Mission object to check (Mission object).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over schedule_list, reused across calls (SegmentGrid).
+    * Output:
+    * bool: True as soon as any conflict is found, and for invalid missions, so it always equals
+    * check_mission(...)[0] != "clear".
+    * Logic: Approve/reject gate built on iter_conflicts(first_only=True).
+    * Example Call:
+    * rejected = deconfliction.any_conflict(my_mission, [sched1, sched2])
+    '''
+
+    def any_conflict(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> bool:
+        """Return whether the mission conflicts with any schedule."""
+        if not primary_mission.validate():
+            return True
+        return next(self.iter_conflicts(primary_mission, schedule_list, spatial_index, first_only=True), None) is not None
 
     '''
     * Function Name: check_mission
     * Input:
     * primary_mission: The primary Mission object to check (Mission object).
     * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over schedule_list, reused across calls (SegmentGrid).
     * Output:
-    * Tuple[str, List[dict]]: A tuple containing the status ("clear" or "conflict detected") and list of conflicts.
-    * Logic: Validates the mission, then checks for both spatial and temporal conflicts, combining results.
-    * Returns status based on presence of conflicts.
+    * Tuple[str, ConflictRecords]: A tuple containing the status ("clear" or "conflict detected") and the conflicts.
+    * Logic: Validates the mission, then checks for both spatial conflicts and temporal intervals, combining results.
+    * Returns status based on presence of conflicts. The call is profiled (validation / spatial / temporal phases
+    * plus counters) when the system has instrumentation.
     * Example Call:
     * status, conflicts = deconfliction.check_mission(my_mission, [sched1, sched2])
 
     '''
 
-    def check_mission(self, primary_mission: Mission, schedule_list: List[Mission]) -> Tuple[str, List[dict]]:
+    def check_mission(self, primary_mission: Mission, schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> Tuple[str, ConflictRecords]:
         """Check the mission for conflicts."""
-        if not primary_mission.validate():
-            return "invalid mission", []
+        with self.instrumentation.profile_call("check_mission"):
+            with self.instrumentation.phase("validation"):
+                is_valid = primary_mission.validate()
+            if not is_valid:
+                return "invalid mission", ConflictRecords()
 
-        spatial_conflicts = self.check_spatial_conflict(primary_mission, schedule_list)
-        temporal_conflicts = self.check_temporal_conflict(primary_mission, schedule_list)
+            spatial_conflicts = self.check_spatial_conflict(primary_mission, schedule_list, spatial_index)
+            temporal_conflicts = self.check_temporal_conflict(primary_mission, schedule_list, spatial_index)
 
         all_conflicts = spatial_conflicts + temporal_conflicts
         mission_status = "clear" if not all_conflicts else "conflict detected"
-        return mission_status, all_conflicts
\ No newline at end of file
+        return mission_status, all_conflicts
+
+    '''
+    * Function Name: check_missions
+    * Input:
+    * primaries: Missions to check against the same schedules (Sequence[Mission]).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * spatial_index: Optional SegmentGrid over schedule_list, reused across calls (SegmentGrid).
+    * Output:
+    * List[Tuple[str, ConflictRecords]]: check_mission's result for every primary, in input order.
+    * Logic: Packs the segments of every valid primary into one array and runs the broad and narrow phases for all of
+    * them at once through segment_hits, so the schedule packing, the sweep or grid query and the kernel launches are
+    * paid once per batch instead of once per mission. The hits are then split by owning mission and turned into
+    * records with conflict_records, which reports them exactly as check_mission does.
+    * Example Call:
+    * results = deconfliction.check_missions(submitted, [sched1, sched2], index)
+    '''
+
+    def check_missions(self, primaries: Sequence[Mission], schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None) -> List[Tuple[str, ConflictRecords]]:
+        """Check several missions against the same schedules in one pass."""
+        with self.instrumentation.profile_call("check_missions"):
+            with self.instrumentation.phase("validation"):
+                valid = [index for index, primary_mission in enumerate(primaries) if primary_mission.validate()]
+            results = [("invalid mission", ConflictRecords()) for _ in primaries]
+            if not valid:
+                return results
+            per_mission_segments = [primaries[index].segment_array() for index in valid]
+            segment_counts = np.array([len(segments) for segments in per_mission_segments], dtype=np.int64)
+            segment_offsets = np.cumsum(segment_counts) - segment_counts
+            segment_owners = np.repeat(np.arange(len(valid), dtype=np.int64), segment_counts)
+            with self.instrumentation.phase("batch"):
+                spatial_hits, temporal_hits = self.segment_hits(np.concatenate(per_mission_segments),
+                                                                np.concatenate([primaries[index].segment_times() for index in valid]),
+                                                                schedule_list, spatial_index)
+
+            # Group each kind of hit by owning mission, keeping the original order within a mission.
+            split_hits = []
+            for hits in (spatial_hits, temporal_hits):
+                hit_owners = segment_owners[hits["rows"]]
+                order = np.argsort(hit_owners, kind='stable')
+                bounds = np.searchsorted(hit_owners[order], np.arange(len(valid) + 1))
+                split_hits.append((hits, order, bounds))
+            for position, index in enumerate(valid):
+                mission_hits = []
+                for hits, order, bounds in split_hits:
+                    selected = order[bounds[position]:bounds[position + 1]]
+                    mission_hits.append({name: values[selected] for name, values in hits.items()})
+                    mission_hits[-1]["rows"] = mission_hits[-1]["rows"] - segment_offsets[position]
+                conflicts = self.conflict_records(per_mission_segments[position], *mission_hits)
+                results[index] = ("clear" if not conflicts else "conflict detected", conflicts)
+        return results
+
+    '''
+    * Function Name: check_fleet
+    * Input:
+    * missions: Every Mission object of the fleet; list positions are the mission ids in the result (List[Mission]).
+    * include_spatial: Also report pairs whose paths come within the buffer at different times (bool).
+    * Output:
+    * np.ndarray: Sparse conflict graph with FLEET_CONFLICT_DTYPE, one row per conflicting pair (mission_one <
+    * mission_two), ordered by mission_one then mission_two.
+    * Logic: Packs the segments of the whole fleet once and finds every pair of segments from different missions whose
+    * boxes, grown by half the buffer, overlap with one self_sweep_and_prune. The time axis joins the sweep only when
+    * include_spatial is off. Both narrow phases share those candidates: the spatial check measures
+    * paired_segment_distances, and the time-overlapping subset goes through closest_approach, a bounded chunk at a
+    * time. Hits are reduced per mission pair to the earliest conflict start and the smallest separations.
+    * Example Call:
+    * graph = deconfliction.check_fleet(fleet)
+    '''
+
+    def check_fleet(self, missions: List[Mission], include_spatial: bool = True) -> np.ndarray:
+        """Find every conflicting pair of missions in a fleet."""
+        with self.instrumentation.profile_call("check_fleet"):
+            with self.instrumentation.phase("validation"):
+                invalid = [index for index, mission in enumerate(missions) if not mission.validate()]
+            if invalid:
+                raise ValueError(f"invalid missions in fleet: {invalid[:10]}")
+
+            with self.instrumentation.phase("broad_phase"):
+                segments, segment_times, segment_flight_ids, _ = pack_mission_segments(missions)
+                low, high = space_time_boxes(segments, segment_times, self.safety_buffer_distance / 2.0)
+                axes = slice(0, 3) if include_spatial else slice(0, 4)
+                first, second = self_sweep_and_prune(low[:, axes], high[:, axes], segment_flight_ids)
+                segment_count = len(segments)
+                self._count_pairs("fleet", segment_count * (segment_count - 1) // 2, len(first))
+
+            # Variable Name: hit_pairs / hit_times / hit_distances / hit_path_distances: Per segment-pair hit, the
+            # mission-pair key and its values; NaN marks a value the hit does not contribute.
+            hit_pairs, hit_times, hit_distances, hit_path_distances = [], [], [], []
+            with self.instrumentation.phase("narrow_phase"):
+                for chunk_start in range(0, len(first), DEFAULT_MAX_PAIRS_PER_CHUNK):
+                    rows = first[chunk_start:chunk_start + DEFAULT_MAX_PAIRS_PER_CHUNK]
+                    columns = second[chunk_start:chunk_start + DEFAULT_MAX_PAIRS_PER_CHUNK]
+                    pair_keys = segment_flight_ids[rows] * len(missions) + segment_flight_ids[columns]
+                    if include_spatial:
+                        path_distances = paired_segment_distances(segments[rows], segments[columns])
+                        spatial = path_distances < self.safety_buffer_distance
+                        hit_pairs.append(pair_keys[spatial])
+                        hit_times.append(np.full(int(spatial.sum()), np.nan))
+                        hit_distances.append(np.full(int(spatial.sum()), np.nan))
+                        hit_path_distances.append(path_distances[spatial])
+                        # Airborne-together pairs can only conflict where their paths do.
+                        together = spatial & (segment_times[rows, 0] <= segment_times[columns, 1]) & (segment_times[columns, 0] <= segment_times[rows, 1])
+                        rows, columns, pair_keys = rows[together], columns[together], pair_keys[together]
+                    approach = closest_approach(segments[rows], segment_times[rows], segments[columns], segment_times[columns], self.safety_buffer_distance)
+                    temporal = approach["distance"] < self.safety_buffer_distance
+                    hit_pairs.append(pair_keys[temporal])
+                    hit_times.append(approach["t_begin"][temporal])
+                    hit_distances.append(approach["distance"][temporal])
+                    hit_path_distances.append(np.full(int(temporal.sum()), np.nan))
+
+            graph = np.zeros(0, dtype=FLEET_CONFLICT_DTYPE)
+            if hit_pairs and sum(len(keys) for keys in hit_pairs):
+                hit_pairs = np.concatenate(hit_pairs)
+                hit_order = np.argsort(hit_pairs, kind='stable')
+                hit_pairs = hit_pairs[hit_order]
+                group_starts = np.concatenate([[0], np.nonzero(np.diff(hit_pairs))[0] + 1])
+                graph = np.zeros(len(group_starts), dtype=FLEET_CONFLICT_DTYPE)
+                graph["mission_one"], graph["mission_two"] = np.divmod(hit_pairs[group_starts], len(missions))
+                # fmin ignores the NaN placeholders, so a group only turns NaN when no hit contributed to that field.
+                for field, values in (("first_time", hit_times), ("min_distance", hit_distances), ("path_distance", hit_path_distances)):
+                    graph[field] = np.fmin.reduceat(np.concatenate(values)[hit_order], group_starts)
+            self.instrumentation.count("fleet_conflicting_pairs", len(graph))
+        return graph
+
+    '''
+    * Function Name: clearance
+    * Input:
+    * primary_mission: The Mission object to score (Mission object).
+    * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+    * max_distance: Optional cut-off; pairs provably farther apart than this are never refined and such schedules
+    * report inf (float).
+    * Output:
+    * np.ndarray: One CLEARANCE_DTYPE row per schedule, in schedule order. The mission conflicts with flight f at any
+    * buffer b exactly when path_distance < b (spatial) or separation < b (temporal), so one call answers every buffer.
+    * Logic: Schedule segments are visited in blocks of whole flights. Coarse pass: the gap between segment bounding
+    * boxes bounds every primary x schedule pair from below, for the path distance and, since drones only fly along
+    * their paths, for the separation too. Each flight's best-bounded pair (best time-overlapping pair for the
+    * separation) is solved exactly, which caps that flight's minimum from above. Refinement: only pairs whose lower
+    * bound does not exceed their flight's cap (and max_distance) go through paired_segment_distances and
+    * closest_approach, and each flight keeps its minimum.
+    * Example Call:
+    * clearances = deconfliction.clearance(my_mission, [sched1, sched2])
+    '''
+
+    def clearance(self, primary_mission: Mission, schedule_list: List[Mission], max_distance: Optional[float] = None) -> np.ndarray:
+        """Minimum spatial and spatiotemporal separation from every schedule."""
+        result = np.zeros(len(schedule_list), dtype=CLEARANCE_DTYPE)
+        result["flight_id"] = np.arange(len(schedule_list))
+        result["path_distance"] = result["separation"] = np.inf
+        result["time"] = result["location"] = np.nan
+        max_distance = np.inf if max_distance is None else max_distance
+        primary_segments, primary_times = primary_mission.segment_array(), primary_mission.segment_times()
+        schedule_segments, schedule_times, segment_flight_ids, _ = pack_mission_segments(schedule_list)
+        if not len(primary_segments) or not len(schedule_segments):
+            return result
+
+        with self.instrumentation.phase("clearance"):
+            primary_low, primary_high = primary_segments.min(axis=1), primary_segments.max(axis=1)
+            flight_starts = np.searchsorted(segment_flight_ids, np.arange(len(schedule_list) + 1))
+            columns_per_block = max(1, DEFAULT_MAX_PAIRS_PER_CHUNK // len(primary_segments))
+            refined_pairs = 0
+            first_flight = 0
+            while first_flight < len(schedule_list):
+                # Whole flights per block, so each flight's cap is final before its pairs are pruned.
+                stop_flight = int(np.searchsorted(flight_starts, flight_starts[first_flight] + columns_per_block, side='right')) - 1
+                stop_flight = min(max(stop_flight, first_flight + 1), len(schedule_list))
+                block = slice(flight_starts[first_flight], flight_starts[stop_flight])
+                block_segments, block_times = schedule_segments[block], schedule_times[block]
+                block_flights = segment_flight_ids[block] - first_flight
+                block_result = result[first_flight:stop_flight]
+                first_flight = stop_flight
+
+                lower = box_distances(primary_low[:, None], primary_high[:, None], block_segments.min(axis=1)[None], block_segments.max(axis=1)[None])
+                airborne_together = (primary_times[:, None, 0] <= block_times[None, :, 1]) & (block_times[None, :, 0] <= primary_times[:, None, 1])
+                for pair_lower, temporal in ((lower, False), (np.where(airborne_together, lower, np.inf), True)):
+                    # The best-bounded pair of each flight: per column the best row, then per flight the best column.
+                    best_rows = pair_lower.argmin(axis=0)
+                    column_lower = pair_lower[best_rows, np.arange(len(best_rows))]
+                    by_bound = np.lexsort((column_lower, block_flights))
+                    probe_columns = by_bound[np.diff(block_flights[by_bound], prepend=-1) != 0]
+                    probe_columns = probe_columns[np.isfinite(column_lower[probe_columns])]
+                    if temporal:
+                        caps = closest_approach(primary_segments[best_rows[probe_columns]], primary_times[best_rows[probe_columns]],
+                                                block_segments[probe_columns], block_times[probe_columns], 0.0)["distance"]
+                    else:
+                        caps = paired_segment_distances(primary_segments[best_rows[probe_columns]], block_segments[probe_columns])
+                    # The slack keeps pairs whose bound rounds a few ulps above their own exact distance.
+                    caps = np.minimum(caps, max_distance)
+                    flight_cap = np.full(len(block_result), -np.inf)
+                    flight_cap[block_flights[probe_columns]] = caps + 1e-9 * (1.0 + caps)
+
+                    rows, columns = np.nonzero(pair_lower <= flight_cap[block_flights][None])
+                    refined_pairs += len(rows)
+                    pair_flights = block_flights[columns]
+                    if not temporal:
+                        distances = paired_segment_distances(primary_segments[rows], block_segments[columns])
+                        np.minimum.at(block_result["path_distance"], pair_flights, np.where(distances <= max_distance, distances, np.inf))
+                        continue
+                    approach = closest_approach(primary_segments[rows], primary_times[rows], block_segments[columns], block_times[columns], 0.0)
+                    # The closest refined pair of each flight, the earliest on ties.
+                    by_distance = np.lexsort((approach["time"], approach["distance"], pair_flights))
+                    closest = by_distance[np.diff(pair_flights[by_distance], prepend=-1) != 0]
+                    closest = closest[approach["distance"][closest] <= max_distance]
+                    block_result["separation"][pair_flights[closest]] = approach["distance"][closest]
+                    block_result["time"][pair_flights[closest]] = approach["time"][closest]
+                    block_result["location"][pair_flights[closest]] = approach["location"][closest]
+            self._count_pairs("clearance", 2 * len(primary_segments) * len(schedule_segments), refined_pairs)
+        return result
+
+'''
+* Function Name: save_conflict_graph
+* Input:
+* graph: check_fleet result (np.ndarray with FLEET_CONFLICT_DTYPE).
+* path: Output file; ".npy" stores the structured array, ".jsonl" one JSON object per edge, anything else CSV (str).
+* Output:
+* None: Writes the file. NaN fields are written as empty CSV cells and JSON nulls.
+* Example Call:
+* save_conflict_graph(deconfliction.check_fleet(fleet), "fleet_conflicts.csv")
+'''
+
+def save_conflict_graph(graph: np.ndarray, path: str) -> None:
+    """Write a fleet conflict graph to disk."""
+    if path.endswith(".npy"):
+        np.save(path, graph)
+        return
+    names = graph.dtype.names
+    with open(path, "w") as output_file:
+        if path.endswith(".jsonl"):
+            for edge in graph.tolist():
+                output_file.write(json.dumps({name: (None if value != value else value) for name, value in zip(names, edge)}) + "\n")
+            return
+        output_file.write(",".join(names) + "\n")
+        for edge in graph.tolist():
+            output_file.write(",".join("" if value != value else repr(value) for value in edge) + "\n")
+
+'''
+* Function Name: load_conflict_graph
+* Input:
+* path: File written by save_conflict_graph; the format follows the extension the same way (str).
+* Output:
+* np.ndarray: The conflict graph with FLEET_CONFLICT_DTYPE; empty CSV cells and JSON nulls come back as NaN.
+* Example Call:
+* graph = load_conflict_graph("fleet_conflicts.csv")
+'''
+
+def load_conflict_graph(path: str) -> np.ndarray:
+    """Read a fleet conflict graph written by save_conflict_graph."""
+    if path.endswith(".npy"):
+        return np.load(path).astype(FLEET_CONFLICT_DTYPE, copy=False)
+    names = FLEET_CONFLICT_DTYPE.names
+    with open(path) as input_file:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in input_file if line.strip()]
+            edges = [tuple(np.nan if row[name] is None else row[name] for name in names) for row in rows]
+        else:
+            header = input_file.readline().strip().split(",")
+            if tuple(header) != names:
+                raise ValueError(f"unexpected conflict graph columns: {header}")
+            edges = [tuple(np.nan if value == "" else float(value) for value in line.rstrip("\n").split(",")) for line in input_file if line.strip()]
+    return np.array(edges, dtype=FLEET_CONFLICT_DTYPE)
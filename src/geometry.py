@@ -0,0 +1,216 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: geometry.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: closest_segment_parameters, paired_segment_distances, iter_segment_distance_blocks, segment_distance_matrix,
+            closest_approach, box_distances
+ Global Variables: DEFAULT_MAX_PAIRS_PER_CHUNK, PARALLEL_TOLERANCE, POINT_TOLERANCE
+
+ '''
+
+from typing import Iterator, Tuple
+import numpy as np
+
+# Variable Name: DEFAULT_MAX_PAIRS_PER_CHUNK: Upper bound on segment pairs evaluated per broadcast block, expected range: 1 to infinity.
+# Variable Name: PARALLEL_TOLERANCE: Relative threshold on sin^2 of the angle between segments below which they are treated as parallel.
+# Variable Name: POINT_TOLERANCE: Squared length below which a segment is treated as a single point.
+DEFAULT_MAX_PAIRS_PER_CHUNK = 1 << 18
+PARALLEL_TOLERANCE = 1e-12
+POINT_TOLERANCE = 1e-12
+
+
+def _dot(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return np.einsum('...i,...i->...', u, v)
+
+
+'''
+* Function Name: closest_segment_parameters
+* Input:
+* start_one, end_one: Endpoints of the first segment(s), arrays broadcastable to (..., 3).
+* start_two, end_two: Endpoints of the second segment(s), arrays broadcastable to (..., 3).
+* Output:
+* Tuple[np.ndarray, np.ndarray, np.ndarray]: The clamped parameters s and t of the closest points and the distance between them.
+* Logic: Solves the 2x2 closest-point system for every broadcast pair at once. When the unconstrained t leaves [0, 1]
+* it is clamped and s is recomputed against the clamped point, so the pair of parameters is the true minimiser on the
+* unit square rather than two independently clamped values. Degenerate (point) segments are handled in the same pass.
+* Example Call:
+* s, t, distance = closest_segment_parameters(a[:, None], b[:, None], c[None, :], d[None, :])
+'''
+
+def closest_segment_parameters(start_one: np.ndarray, end_one: np.ndarray, start_two: np.ndarray, end_two: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Closest-point parameters and distance for broadcast pairs of 3D segments."""
+    direction_one = end_one - start_one
+    direction_two = end_two - start_two
+    offset = start_one - start_two
+
+    length_sq_one = _dot(direction_one, direction_one)
+    length_sq_two = _dot(direction_two, direction_two)
+    cross_term = _dot(direction_one, direction_two)
+    offset_one = _dot(direction_one, offset)
+    offset_two = _dot(direction_two, offset)
+
+    one_is_point = length_sq_one <= POINT_TOLERANCE
+    two_is_point = length_sq_two <= POINT_TOLERANCE
+    safe_length_one = np.where(one_is_point, 1.0, length_sq_one)
+    safe_length_two = np.where(two_is_point, 1.0, length_sq_two)
+    denominator = length_sq_one * length_sq_two - cross_term * cross_term
+    not_parallel = denominator > PARALLEL_TOLERANCE * length_sq_one * length_sq_two
+    safe_denominator = np.where(not_parallel, denominator, 1.0)
+
+    # General case: closest points of the infinite lines, then clamp t and recompute s against the clamped point.
+    parameter_s = np.where(not_parallel, np.clip((cross_term * offset_two - offset_one * length_sq_two) / safe_denominator, 0.0, 1.0), 0.0)
+    parameter_t = (cross_term * parameter_s + offset_two) / safe_length_two
+    parameter_s = np.where(parameter_t < 0.0, np.clip(-offset_one / safe_length_one, 0.0, 1.0),
+                           np.where(parameter_t > 1.0, np.clip((cross_term - offset_one) / safe_length_one, 0.0, 1.0), parameter_s))
+    parameter_t = np.clip(parameter_t, 0.0, 1.0)
+
+    # Degenerate cases: a point against a segment, or two points.
+    parameter_s = np.where(one_is_point, 0.0, np.where(two_is_point, np.clip(-offset_one / safe_length_one, 0.0, 1.0), parameter_s))
+    parameter_t = np.where(two_is_point, 0.0, np.where(one_is_point, np.clip(offset_two / safe_length_two, 0.0, 1.0), parameter_t))
+
+    separation = offset + parameter_s[..., None] * direction_one - parameter_t[..., None] * direction_two
+    return parameter_s, parameter_t, np.sqrt(_dot(separation, separation))
+
+
+'''
+* Function Name: paired_segment_distances
+* Input:
+* segments_one: Array of shape (P, 2, 3) holding start and end points of P segments.
+* segments_two: Array of shape (P, 2, 3) holding start and end points of P segments.
+* Output:
+* np.ndarray: Shape (P,) distances between segments_one[i] and segments_two[i].
+* Logic: Element-wise closest-point distance, used when a candidate list of pairs has already been chosen.
+* Example Call:
+* distances = paired_segment_distances(primary_segments[rows], schedule_segments[cols])
+'''
+
+def paired_segment_distances(segments_one: np.ndarray, segments_two: np.ndarray) -> np.ndarray:
+    """Distances between corresponding segments of two (P, 2, 3) arrays."""
+    _, _, distances = closest_segment_parameters(segments_one[:, 0], segments_one[:, 1], segments_two[:, 0], segments_two[:, 1])
+    return distances
+
+
+'''
+* Function Name: iter_segment_distance_blocks
+* Input:
+* primary_segments: Array of shape (M, 2, 3).
+* schedule_segments: Array of shape (N, 2, 3).
+* max_pairs_per_chunk: Maximum number of pairs evaluated per broadcast block (int).
+* Output:
+* Iterator[Tuple[int, int, np.ndarray]]: (column_start, column_stop, block) where block is the (M, column_stop - column_start) distance slab.
+* Logic: Splits the schedule axis into column chunks so the (M, chunk, 3) temporaries stay bounded, and evaluates each
+* chunk with one broadcast call to closest_segment_parameters.
+* Example Call:
+* for column_start, column_stop, block in iter_segment_distance_blocks(primary_segments, schedule_segments): ...
+'''
+
+def iter_segment_distance_blocks(primary_segments: np.ndarray, schedule_segments: np.ndarray, max_pairs_per_chunk: int = DEFAULT_MAX_PAIRS_PER_CHUNK) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """Yield column blocks of the primary x schedule segment distance matrix."""
+    row_count = len(primary_segments)
+    column_count = len(schedule_segments)
+    if row_count == 0 or column_count == 0:
+        return
+    columns_per_chunk = max(1, max_pairs_per_chunk // row_count)
+    start_one = primary_segments[:, None, 0]
+    end_one = primary_segments[:, None, 1]
+    for column_start in range(0, column_count, columns_per_chunk):
+        column_stop = min(column_start + columns_per_chunk, column_count)
+        chunk = schedule_segments[column_start:column_stop]
+        _, _, block = closest_segment_parameters(start_one, end_one, chunk[None, :, 0], chunk[None, :, 1])
+        yield column_start, column_stop, block
+
+
+'''
+* Function Name: segment_distance_matrix
+* Input:
+* primary_segments: Array of shape (M, 2, 3).
+* schedule_segments: Array of shape (N, 2, 3).
+* max_pairs_per_chunk: Maximum number of pairs evaluated per broadcast block (int).
+* Output:
+* np.ndarray: Shape (M, N) matrix of segment-to-segment distances.
+* Logic: Assembles the blocks produced by iter_segment_distance_blocks into a single matrix.
+* Example Call:
+* distances = segment_distance_matrix(primary_segments, schedule_segments)
+'''
+
+def segment_distance_matrix(primary_segments: np.ndarray, schedule_segments: np.ndarray, max_pairs_per_chunk: int = DEFAULT_MAX_PAIRS_PER_CHUNK) -> np.ndarray:
+    """Full segment-to-segment distance matrix computed in bounded chunks."""
+    distances = np.empty((len(primary_segments), len(schedule_segments)))
+    for column_start, column_stop, block in iter_segment_distance_blocks(primary_segments, schedule_segments, max_pairs_per_chunk):
+        distances[:, column_start:column_stop] = block
+    return distances
+
+
+'''
+* Function Name: closest_approach
+* Input:
+* segments_one, times_one: (P, 2, 3) segments and (P, 2) time windows of the first drone in each pair.
+* segments_two, times_two: (P, 2, 3) segments and (P, 2) time windows of the second drone in each pair.
+* safety_buffer_distance: Separation below which the pair is in conflict (float).
+* Output:
+* dict of np.ndarray, each of shape (P,) unless noted:
+*   "time": instant of minimum separation, "distance": minimum separation,
+*   "location": (P, 3) position of the first drone at that instant,
+*   "t_begin" / "t_end": the exact interval where separation < safety_buffer_distance (NaN when never closer).
+* Logic: Both drones fly linearly over the shared window [lo, hi], so the squared separation is the quadratic
+* A*tau^2 + 2*B*tau + C in tau = t - lo. Its minimiser is clamped to [0, hi - lo] and the conflict interval is the
+* span between the roots of the quadratic minus the squared buffer, clipped to the same window.
+* Example Call:
+* approach = closest_approach(primary_segments[rows], primary_times[rows], schedule_segments[cols], schedule_times[cols], 5.0)
+'''
+
+def closest_approach(segments_one: np.ndarray, times_one: np.ndarray, segments_two: np.ndarray, times_two: np.ndarray, safety_buffer_distance: float) -> dict:
+    """Exact minimum separation and conflict interval for pairs of linearly moving drones."""
+    window_begin = np.maximum(times_one[:, 0], times_two[:, 0])
+    window_length = np.maximum(np.minimum(times_one[:, 1], times_two[:, 1]) - window_begin, 0.0)
+
+    def state_at_window_begin(segments, times):
+        duration = times[:, 1] - times[:, 0]
+        safe_duration = np.where(duration > 0.0, duration, 1.0)
+        velocity = np.where((duration > 0.0)[:, None], (segments[:, 1] - segments[:, 0]) / safe_duration[:, None], 0.0)
+        return segments[:, 0] + velocity * (window_begin - times[:, 0])[:, None], velocity
+
+    position_one, velocity_one = state_at_window_begin(segments_one, times_one)
+    position_two, velocity_two = state_at_window_begin(segments_two, times_two)
+    relative_position = position_one - position_two
+    relative_velocity = velocity_one - velocity_two
+
+    quadratic_a = _dot(relative_velocity, relative_velocity)
+    quadratic_b = _dot(relative_position, relative_velocity)
+    quadratic_c = _dot(relative_position, relative_position)
+    moving = quadratic_a > POINT_TOLERANCE
+    safe_a = np.where(moving, quadratic_a, 1.0)
+
+    tau_min = np.where(moving, np.clip(-quadratic_b / safe_a, 0.0, window_length), 0.0)
+    min_distance = np.sqrt(np.maximum(quadratic_a * tau_min ** 2 + 2.0 * quadratic_b * tau_min + quadratic_c, 0.0))
+
+    buffer_sq = safety_buffer_distance ** 2
+    discriminant = np.maximum(quadratic_b ** 2 - quadratic_a * (quadratic_c - buffer_sq), 0.0)
+    root_low = np.where(moving, (-quadratic_b - np.sqrt(discriminant)) / safe_a, 0.0)
+    root_high = np.where(moving, (-quadratic_b + np.sqrt(discriminant)) / safe_a, window_length)
+    in_conflict = min_distance < safety_buffer_distance
+
+    return {
+        "time": window_begin + tau_min,
+        "distance": min_distance,
+        "location": position_one + velocity_one * tau_min[:, None],
+        "t_begin": np.where(in_conflict, window_begin + np.clip(root_low, 0.0, window_length), np.nan),
+        "t_end": np.where(in_conflict, window_begin + np.clip(root_high, 0.0, window_length), np.nan),
+    }
+
+
+'''
+* Function Name: box_distances
+* Input:
+* low_one, high_one: Corners of the first axis-aligned boxes, arrays broadcastable to (..., 3).
+* low_two, high_two: Corners of the second boxes, broadcastable against the first.
+* Output:
+* np.ndarray: Euclidean gap between each pair of boxes, 0 where they touch or overlap.
+* Example Call:
+* gaps = box_distances(low[:, None], high[:, None], other_low[None], other_high[None])
+'''
+
+def box_distances(low_one: np.ndarray, high_one: np.ndarray, low_two: np.ndarray, high_two: np.ndarray) -> np.ndarray:
+    """Distance between axis-aligned boxes."""
+    gap = np.maximum(np.maximum(low_two - high_one, low_one - high_two), 0.0)
+    return np.sqrt(_dot(gap, gap))
@@ -0,0 +1,161 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: instrumentation.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: Instrumentation (count, phase, profile_call, totals, reset), NullInstrumentation, format_report, logging_sink
+ Global Variables: NULL_INSTRUMENTATION
+
+ '''
+
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, Optional
+
+
+class Instrumentation:
+
+    '''
+    Variable Name: sink: Optional callable receiving one report dict per profiled call (see profile_call), expected range: any callable or None.
+    Variable Name: counters: Running totals of named events (segment pairs considered / pruned / tested, interpolations, conflicts emitted).
+    Variable Name: phase_seconds: Running wall-clock totals per named phase (validation, spatial, temporal).
+    Variable Name: last_report: The report produced by the most recent profiled call.
+    '''
+
+    enabled = True
+
+    def __init__(self, sink: Optional[Callable[[dict], None]] = None):
+        self.sink = sink
+        self.counters: Counter = Counter()
+        self.phase_seconds: Dict[str, float] = defaultdict(float)
+        self.last_report: Optional[dict] = None
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to the named counter."""
+        self.counters[name] += amount
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Accumulate the wall-clock time spent inside the block under name."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] += time.perf_counter() - start_time
+
+    '''
+    * Function Name: profile_call
+    * Input:
+    * call_name: Label for the profiled call, e.g. "check_mission" (str).
+    * Output:
+    * Context manager: On exit builds a report with the counters and phase times accumulated inside the block.
+    * Logic: Snapshots the running totals on entry and reports the difference, so nested or repeated calls each get
+    * their own numbers while the totals keep growing. The report is stored in last_report and passed to the sink.
+    * Example Call:
+    * with instrumentation.profile_call("check_mission"): ...
+    '''
+
+    @contextmanager
+    def profile_call(self, call_name: str) -> Iterator[None]:
+        """Profile one top-level call."""
+        counters_before = Counter(self.counters)
+        phases_before = dict(self.phase_seconds)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            counters = self.counters - counters_before
+            self.last_report = {
+                "call": call_name,
+                "total_seconds": elapsed,
+                "phase_seconds": {name: seconds - phases_before.get(name, 0.0) for name, seconds in self.phase_seconds.items()
+                                  if seconds != phases_before.get(name, 0.0)},
+                "counters": dict(sorted(counters.items())),
+            }
+            if self.sink is not None:
+                self.sink(self.last_report)
+
+    def totals(self) -> dict:
+        """Return the running totals since creation or the last reset."""
+        return {"phase_seconds": dict(self.phase_seconds), "counters": dict(sorted(self.counters.items()))}
+
+    def reset(self) -> None:
+        """Clear the running totals."""
+        self.counters.clear()
+        self.phase_seconds.clear()
+        self.last_report = None
+
+
+class NullInstrumentation:
+
+    '''
+    Disabled instrumentation: every hook is a no-op, so an uninstrumented DeconflictionSystem only pays for a method
+    call per hook site.
+    '''
+
+    enabled = False
+    sink = None
+    last_report = None
+    _null_context = nullcontext()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def phase(self, name: str):
+        return self._null_context
+
+    def profile_call(self, call_name: str):
+        return self._null_context
+
+    def totals(self) -> dict:
+        return {"phase_seconds": {}, "counters": {}}
+
+    def reset(self) -> None:
+        pass
+
+# Variable Name: NULL_INSTRUMENTATION: Shared disabled instance used when no instrumentation is configured.
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+'''
+* Function Name: format_report
+* Input:
+* report: A report produced by Instrumentation.profile_call (dict).
+* Output:
+* str: A human-readable multi-line profile.
+* Logic: Lists phase times with their share of the call, followed by the counters.
+* Example Call:
+* print(format_report(instrumentation.last_report))
+'''
+
+def format_report(report: dict) -> str:
+    """Render a profile report as text."""
+    total_seconds = report["total_seconds"]
+    lines = [f"{report['call']}: {total_seconds * 1e3:.3f} ms"]
+    for name, seconds in report["phase_seconds"].items():
+        share = 100.0 * seconds / total_seconds if total_seconds > 0 else 0.0
+        lines.append(f"  phase {name:<28} {seconds * 1e3:10.3f} ms {share:6.1f}%")
+    for name, value in report["counters"].items():
+        lines.append(f"  count {name:<28} {value:10d}")
+    return "\n".join(lines)
+
+'''
+* Function Name: logging_sink
+* Input:
+* logger: Logger to write to; defaults to this module's logger (logging.Logger).
+* level: Logging level of the emitted records (int).
+* Output:
+* Callable[[dict], None]: A sink that logs each report with format_report.
+* Example Call:
+* instrumentation = Instrumentation(sink=logging_sink())
+'''
+
+def logging_sink(logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> Callable[[dict], None]:
+    """Build a sink that writes reports to a logger."""
+    target_logger = logger or logging.getLogger(__name__)
+
+    def sink(report: dict) -> None:
+        if target_logger.isEnabledFor(level):
+            target_logger.log(level, format_report(report))
+    return sink
@@ -0,0 +1,347 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: mission_db.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: MissionDatabaseWriter (append, close, abort), MissionDatabase (open, mission, missions, schedule_list, find),
+            iter_missions_jsonl, iter_missions_csv, mission_file_format, iter_missions_file, import_missions, export_missions
+ Global Variables: MAGIC, FORMAT_VERSION, FLAG_TIMESTAMPS, HEADER_DTYPE, TABLE_DTYPE, WAYPOINT_DTYPE
+
+ '''
+
+import csv
+import json
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+import numpy as np
+from utils import Mission
+
+# On-disk layout (all little-endian):
+#   header       HEADER_DTYPE, HEADER_DTYPE.itemsize bytes
+#   waypoints    (waypoint_count, 3) float64 block, one contiguous run per mission
+#   timestamps   (waypoint_count,) float64 block, only when the header's reserved field has FLAG_TIMESTAMPS set;
+#                the times each waypoint is reached, NaN for the waypoints of missions without timestamps
+#   mission table mission_count TABLE_DTYPE rows: flight_id, t_start, t_end, offset (in waypoints), count
+# The table is written last so waypoints can be streamed straight to disk while importing. Readers that ignore the
+# flag still find the table through table_offset.
+MAGIC = b"UAVMDB\x00\x01"
+FORMAT_VERSION = 1
+# Variable Name: FLAG_TIMESTAMPS: Bit of the header's reserved field marking a timestamp block after the waypoints.
+FLAG_TIMESTAMPS = 1
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("reserved", "<u4"), ("mission_count", "<u8"),
+                         ("waypoint_count", "<u8"), ("waypoint_offset", "<u8"), ("table_offset", "<u8")])
+TABLE_DTYPE = np.dtype([("flight_id", "<i8"), ("t_start", "<f8"), ("t_end", "<f8"), ("offset", "<i8"), ("count", "<i8")])
+WAYPOINT_DTYPE = np.dtype("<f8")
+
+
+class MissionDatabaseWriter:
+
+    '''
+    Variable Name: path: Destination file, created or replaced (str).
+    Streams missions to disk: waypoints are written as they arrive, only the small mission table is kept in memory.
+    Waypoint times go to a side file and are appended after the waypoints on close, when any mission has them.
+    Everything goes to a temporary file next to path, which replaces path only when close() writes the table and
+    header. Used as a context manager, an exception aborts instead, so a failed import never leaves a truncated
+    database behind (nor replaces an existing one).
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self._temporary_path = f"{path}.{os.getpid()}.tmp"
+        self._file = open(self._temporary_path, "wb")
+        self._file.write(np.zeros(1, dtype=HEADER_DTYPE).tobytes())
+        self._timestamp_file = open(f"{path}.{os.getpid()}.timestamps.tmp", "w+b")
+        self._table_rows: List[Tuple[int, float, float, int, int]] = []
+        self._waypoint_count = 0
+        self._has_timestamps = False
+
+    def __enter__(self) -> "MissionDatabaseWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, mission: Mission, flight_id: Optional[int] = None) -> int:
+        """Write one mission; returns its flight id (defaults to its position in the file)."""
+        if flight_id is None:
+            flight_id = len(self._table_rows)
+        coordinates = np.ascontiguousarray(mission.coordinates, dtype=WAYPOINT_DTYPE)
+        self._file.write(coordinates.tobytes())
+        if mission.timestamps is None:
+            self._timestamp_file.write(np.full(len(coordinates), np.nan, dtype=WAYPOINT_DTYPE).tobytes())
+        else:
+            self._timestamp_file.write(np.ascontiguousarray(mission.timestamps, dtype=WAYPOINT_DTYPE).tobytes())
+            self._has_timestamps = True
+        self._table_rows.append((flight_id, mission.t_start, mission.t_end, self._waypoint_count, len(coordinates)))
+        self._waypoint_count += len(coordinates)
+        return flight_id
+
+    def close(self) -> None:
+        """Write the mission table and the final header."""
+        if self._file.closed:
+            return
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["version"] = FORMAT_VERSION
+        header["mission_count"] = len(self._table_rows)
+        header["waypoint_count"] = self._waypoint_count
+        header["waypoint_offset"] = HEADER_DTYPE.itemsize
+        header["table_offset"] = HEADER_DTYPE.itemsize + self._waypoint_count * 3 * WAYPOINT_DTYPE.itemsize
+        if self._has_timestamps:
+            header["reserved"] = FLAG_TIMESTAMPS
+            header["table_offset"] += self._waypoint_count * WAYPOINT_DTYPE.itemsize
+            self._timestamp_file.seek(0)
+            shutil.copyfileobj(self._timestamp_file, self._file)
+        self._file.write(np.array(self._table_rows, dtype=TABLE_DTYPE).tobytes())
+        self._file.seek(0)
+        self._file.write(header.tobytes())
+        self._file.close()
+        self._close_timestamp_file()
+        os.replace(self._temporary_path, self.path)
+
+    def abort(self) -> None:
+        """Discard everything written so far; path is left untouched."""
+        if self._file.closed:
+            return
+        self._file.close()
+        self._close_timestamp_file()
+        os.remove(self._temporary_path)
+
+    def _close_timestamp_file(self) -> None:
+        self._timestamp_file.close()
+        os.remove(self._timestamp_file.name)
+
+
+class MissionDatabase:
+
+    '''
+    Variable Name: table: Memory-mapped mission table (TABLE_DTYPE records).
+    Variable Name: waypoints: Memory-mapped (waypoint_count, 3) float64 block; missions are views into it.
+    Variable Name: timestamps: Memory-mapped (waypoint_count,) float64 waypoint times, NaN for missions without
+    timestamps; None when no stored mission has them.
+    Opening only reads the header and maps the file, so start-up cost does not depend on the database size.
+    '''
+
+    def __init__(self, table: np.ndarray, waypoints: np.ndarray, timestamps: Optional[np.ndarray] = None):
+        self.table = table
+        self.waypoints = waypoints
+        self.timestamps = timestamps
+        self._row_by_flight_id: Optional[Dict[int, int]] = None
+
+    '''
+    * Function Name: open
+    * Input:
+    * path: Database file written by MissionDatabaseWriter (str).
+    * Output:
+    * MissionDatabase: Read-only view of the file through numpy.memmap.
+    * Logic: Validates the header and checks that the file is long enough for the sections it describes, then maps
+    * the waypoint block and mission table in place; nothing is parsed.
+    * Example Call:
+    * database = MissionDatabase.open("approved.uavdb")
+    '''
+
+    @classmethod
+    def open(cls, path: str) -> "MissionDatabase":
+        """Map a database file."""
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{path} is not a mission database")
+        if header["version"][0] != FORMAT_VERSION:
+            raise ValueError(f"{path} has unsupported format version {header['version'][0]}")
+        mission_count, waypoint_count = int(header["mission_count"][0]), int(header["waypoint_count"][0])
+        waypoint_end = int(header["waypoint_offset"][0]) + waypoint_count * 3 * WAYPOINT_DTYPE.itemsize
+        has_timestamps = bool(int(header["reserved"][0]) & FLAG_TIMESTAMPS)
+        if has_timestamps:
+            timestamp_offset, waypoint_end = waypoint_end, waypoint_end + waypoint_count * WAYPOINT_DTYPE.itemsize
+        table_end = int(header["table_offset"][0]) + mission_count * TABLE_DTYPE.itemsize
+        if int(header["table_offset"][0]) < waypoint_end or os.path.getsize(path) < table_end:
+            raise ValueError(f"{path} is truncated or corrupt")
+        # numpy.memmap cannot map zero bytes, so empty sections fall back to empty arrays.
+        if waypoint_count:
+            waypoints = np.memmap(path, dtype=WAYPOINT_DTYPE, mode="r", offset=int(header["waypoint_offset"][0]), shape=(waypoint_count, 3))
+        else:
+            waypoints = np.empty((0, 3), dtype=WAYPOINT_DTYPE)
+        timestamps = None
+        if has_timestamps and waypoint_count:
+            timestamps = np.memmap(path, dtype=WAYPOINT_DTYPE, mode="r", offset=timestamp_offset, shape=(waypoint_count,))
+        if mission_count:
+            table = np.memmap(path, dtype=TABLE_DTYPE, mode="r", offset=int(header["table_offset"][0]), shape=(mission_count,))
+        else:
+            table = np.empty(0, dtype=TABLE_DTYPE)
+        return cls(table, waypoints, timestamps)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def flight_ids(self) -> np.ndarray:
+        return self.table["flight_id"]
+
+    def _wrap(self, t_start: float, t_end: float, offset: int, count: int) -> Mission:
+        timestamps = None
+        if self.timestamps is not None and count and not np.isnan(self.timestamps[offset]):
+            timestamps = self.timestamps[offset:offset + count]
+        return Mission.wrap(self.waypoints[offset:offset + count], t_start, t_end, timestamps)
+
+    def mission(self, row: int) -> Mission:
+        """Return the mission stored at table row, backed directly by the mapped waypoints (and timestamps)."""
+        flight_id, t_start, t_end, offset, count = self.table[row].tolist()
+        return self._wrap(t_start, t_end, offset, count)
+
+    def missions(self) -> Iterator[Tuple[int, Mission]]:
+        """Yield (flight_id, mission) for every stored mission in file order."""
+        for flight_id, t_start, t_end, offset, count in self.table.tolist():
+            yield flight_id, self._wrap(t_start, t_end, offset, count)
+
+    def schedule_list(self) -> List[Mission]:
+        """Return every mission as a list, in file order, for DeconflictionSystem / Airspace use."""
+        return [mission for _, mission in self.missions()]
+
+    def find(self, flight_id: int) -> Mission:
+        """Look a mission up by flight id."""
+        if self._row_by_flight_id is None:
+            self._row_by_flight_id = {stored_id: row for row, stored_id in enumerate(self.table["flight_id"].tolist())}
+        return self.mission(self._row_by_flight_id[flight_id])
+
+'''
+* Function Name: iter_missions_jsonl
+* Input:
+* source: Open text file with one JSON object per line:
+*   {"flight_id": 7, "t_start": 0, "t_end": 60, "waypoints": [[x, y, z], ...]} (flight_id optional, z defaults to 0),
+*   optionally with "timestamps": [t0, t1, ...], one per waypoint.
+* Output:
+* Iterator[Tuple[Optional[int], Mission]]: (flight_id, mission) per non-blank line, read lazily.
+* Example Call:
+* for flight_id, mission in iter_missions_jsonl(open("missions.jsonl")): ...
+'''
+
+def iter_missions_jsonl(source: TextIO) -> Iterator[Tuple[Optional[int], Mission]]:
+    """Stream missions from JSON lines."""
+    for line in source:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        coordinates = np.array([list(point) + [0.0] * (3 - len(point)) for point in record["waypoints"]], dtype=np.float64)
+        yield record.get("flight_id"), Mission(coordinates, float(record["t_start"]), float(record["t_end"]), record.get("timestamps"))
+
+'''
+* Function Name: iter_missions_csv
+* Input:
+* source: Open text file with a header row containing flight_id, t_start, t_end, x, y and optionally z and time; one
+* row per waypoint, with a mission's rows kept together. A mission gets timestamps when every one of its rows has a time.
+* Output:
+* Iterator[Tuple[int, Mission]]: (flight_id, mission) as soon as each mission's last row has been read.
+* Example Call:
+* for flight_id, mission in iter_missions_csv(open("missions.csv", newline="")): ...
+'''
+
+def iter_missions_csv(source: TextIO) -> Iterator[Tuple[int, Mission]]:
+    """Stream missions from waypoint-per-row CSV."""
+    current_id, current_times, current_points, current_timestamps = None, None, [], []
+    for row in csv.DictReader(source):
+        flight_id = int(row["flight_id"])
+        if flight_id != current_id and current_points:
+            yield current_id, _csv_mission(current_points, current_times, current_timestamps)
+            current_points, current_timestamps = [], []
+        current_id, current_times = flight_id, (float(row["t_start"]), float(row["t_end"]))
+        current_points.append((float(row["x"]), float(row["y"]), float(row.get("z") or 0.0)))
+        current_timestamps.append(float(row["time"]) if row.get("time") else None)
+    if current_points:
+        yield current_id, _csv_mission(current_points, current_times, current_timestamps)
+
+def _csv_mission(points: List[Tuple[float, float, float]], times: Tuple[float, float], timestamps: List[Optional[float]]) -> Mission:
+    return Mission(np.array(points, dtype=np.float64), *times, None if None in timestamps else timestamps)
+
+'''
+* Function Name: mission_file_format
+* Input:
+* path: Mission file path (str).
+* file_format: Explicit "jsonl" or "csv", or None to use the extension (str).
+* Output:
+* str: "jsonl" or "csv"; raises ValueError for anything else.
+* Example Call:
+* file_format = mission_file_format("missions.csv", None)
+'''
+
+def mission_file_format(path: str, file_format: Optional[str] = None) -> str:
+    """Resolve the text format of a mission file."""
+    if file_format is None:
+        file_format = os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError(f"unsupported mission file format: {file_format!r}")
+    return file_format
+
+'''
+* Function Name: iter_missions_file
+* Input:
+* source: Open text file in JSONL or CSV form (TextIO).
+* file_format: "jsonl" or "csv" (str).
+* Output:
+* Iterator[Tuple[Optional[int], Mission]]: (flight_id, mission) pairs streamed from the file.
+* Example Call:
+* missions = iter_missions_file(open("missions.csv", newline=""), "csv")
+'''
+
+def iter_missions_file(source: TextIO, file_format: str) -> Iterator[Tuple[Optional[int], Mission]]:
+    """Stream missions from a JSONL or CSV file."""
+    return iter_missions_jsonl(source) if file_format == "jsonl" else iter_missions_csv(source)
+
+'''
+* Function Name: import_missions
+* Input:
+* source_path: JSONL or CSV mission file (str).
+* database_path: Destination database file (str).
+* file_format: "jsonl" or "csv"; inferred from the extension when omitted (str).
+* Output:
+* int: Number of missions written.
+* Logic: Streams missions from the source straight into a MissionDatabaseWriter, so memory use is bounded by one
+* mission plus the mission table.
+* Example Call:
+* count = import_missions("approved.jsonl", "approved.uavdb")
+'''
+
+def import_missions(source_path: str, database_path: str, file_format: Optional[str] = None) -> int:
+    """Bulk-load a JSONL or CSV file into a database."""
+    file_format = mission_file_format(source_path, file_format)
+    mission_count = 0
+    with open(source_path, newline="") as source, MissionDatabaseWriter(database_path) as writer:
+        for flight_id, mission in iter_missions_file(source, file_format):
+            writer.append(mission, flight_id)
+            mission_count += 1
+    return mission_count
+
+'''
+* Function Name: export_missions
+* Input:
+* database_path: Database file to read (str).
+* output_path: JSONL or CSV destination (str).
+* file_format: "jsonl" or "csv"; inferred from the extension when omitted (str).
+* Output:
+* int: Number of missions written.
+* Logic: Walks the mapped database one mission at a time and writes each as it goes.
+* Example Call:
+* export_missions("approved.uavdb", "approved.csv")
+'''
+
+def export_missions(database_path: str, output_path: str, file_format: Optional[str] = None) -> int:
+    """Stream a database out to JSONL or CSV."""
+    file_format = mission_file_format(output_path, file_format)
+    database = MissionDatabase.open(database_path)
+    with open(output_path, "w", newline="") as output:
+        csv_writer = csv.writer(output) if file_format == "csv" else None
+        if csv_writer is not None:
+            csv_writer.writerow(["flight_id", "t_start", "t_end", "x", "y", "z", "time"])
+        for flight_id, mission in database.missions():
+            timestamps = [""] * len(mission) if mission.timestamps is None else mission.timestamps.tolist()
+            if csv_writer is not None:
+                csv_writer.writerows([flight_id, mission.t_start, mission.t_end, x, y, z, time_value]
+                                     for (x, y, z), time_value in zip(mission.coordinates.tolist(), timestamps))
+            else:
+                record = {"flight_id": flight_id, "t_start": mission.t_start, "t_end": mission.t_end, "waypoints": mission.coordinates.tolist()}
+                if mission.timestamps is not None:
+                    record["timestamps"] = timestamps
+                output.write(json.dumps(record) + "\n")
+    return len(database)
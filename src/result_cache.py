@@ -0,0 +1,206 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: result_cache.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: mission_fingerprint, schedule_fingerprint, ResultCache (key, get, put, clear, stats),
+            cached_check_mission
+ Global Variables: DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES
+
+ '''
+
+import hashlib
+import os
+import pickle
+import struct
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import numpy as np
+from utils import Mission
+from deconfliction import DeconflictionSystem
+from spatial_index import SegmentGrid
+from conflict_records import ConflictRecords
+
+# Variable Name: DEFAULT_MAX_ENTRIES / DEFAULT_MAX_BYTES: Limits of the in-memory tier; the least recently used entries go first.
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+'''
+* Function Name: mission_fingerprint
+* Input:
+* mission: Mission to hash (Mission object).
+* Output:
+* bytes: SHA-256 digest of the mission's coordinates, time window and per-waypoint timestamps.
+* Logic: Hashes the raw float64 bytes, so equal missions give equal digests across processes and restarts.
+* Example Call:
+* digest = mission_fingerprint(my_mission)
+'''
+
+def mission_fingerprint(mission: Mission) -> bytes:
+    """Stable content hash of one mission."""
+    digest = hashlib.sha256()
+    digest.update(struct.pack("<qdd", len(mission.coordinates), mission.t_start, mission.t_end))
+    digest.update(np.ascontiguousarray(mission.coordinates, dtype="<f8").tobytes())
+    if mission.timestamps is not None:
+        digest.update(np.ascontiguousarray(mission.timestamps, dtype="<f8").tobytes())
+    return digest.digest()
+
+'''
+* Function Name: schedule_fingerprint
+* Input:
+* schedule_list: Schedules a check runs against (List[Mission]).
+* Output:
+* str: Hex version of the schedule set; flight ids are list positions, so order matters.
+* Example Call:
+* version = schedule_fingerprint(schedules)
+'''
+
+def schedule_fingerprint(schedule_list: List[Mission]) -> str:
+    """Stable content hash of a schedule list."""
+    digest = hashlib.sha256()
+    for mission in schedule_list:
+        digest.update(mission_fingerprint(mission))
+    return digest.hexdigest()
+
+
+class ResultCache:
+
+    '''
+    Variable Name: max_entries / max_bytes: Size limits of the in-memory LRU tier; sizes are measured as pickled bytes.
+    Variable Name: directory: Optional folder for the on-disk tier, one pickle per key; entries there survive restarts.
+    Variable Name: hits / misses / memory_hits / disk_hits / evictions: Running counters, see stats().
+    Keys cover the primary mission, the schedule set version and the safety buffer, so a cached result can never be
+    served for a different schedule set. The version in the key is the only invalidation: adding or removing a flight
+    changes it, and entries under older versions are never looked up again. In memory they age out through the LRU
+    limits; on disk they stay until the directory is cleaned.
+    '''
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        # Variable Name: _entries: key -> (result, pickled size) in least to most recently used order.
+        self._entries: "OrderedDict[str, Tuple[object, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.memory_hits = self.disk_hits = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(primary_mission: Mission, schedule_version: str, safety_buffer_distance: float) -> str:
+        """Cache key for checking primary_mission against one schedule set version at one buffer."""
+        digest = hashlib.sha256(mission_fingerprint(primary_mission))
+        digest.update(schedule_version.encode())
+        digest.update(struct.pack("<d", safety_buffer_distance))
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key: str) -> Optional[object]:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return entry[0]
+        if self.directory is not None:
+            try:
+                with open(self._disk_path(key), "rb") as cached_file:
+                    payload = cached_file.read()
+            except FileNotFoundError:
+                payload = None
+            if payload is not None:
+                result = pickle.loads(payload)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, result, len(payload))
+                return result
+        with self._lock:
+            self.misses += 1
+        return None
+
+    '''
+    * Function Name: put
+    * Input:
+    * key: Key from ResultCache.key (str).
+    * result: Value to cache, e.g. a check_mission (status, conflicts) tuple (picklable object).
+    * Output:
+    * None: Stores the result in memory, evicting least recently used entries past the limits, and on disk when a
+    * directory is configured.
+    * Example Call:
+    * cache.put(key, (status, conflicts))
+    '''
+
+    def put(self, key: str, result: object) -> None:
+        """Store a result."""
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.directory is not None:
+            # Write to a temporary name first so a concurrent reader never sees a partial file.
+            temporary_path = f"{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "wb") as cached_file:
+                cached_file.write(payload)
+            os.replace(temporary_path, self._disk_path(key))
+        with self._lock:
+            self._remember(key, result, len(payload))
+
+    def _remember(self, key: str, result: object, size: int) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+        self._entries[key] = (result, size)
+        self._memory_bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Empty the in-memory tier (the disk tier is left alone)."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> dict:
+        """Hit / miss counters, hit rate and current memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "memory_hits": self.memory_hits, "disk_hits": self.disk_hits,
+                    "hit_rate": self.hits / lookups if lookups else 0.0, "evictions": self.evictions,
+                    "entries": len(self._entries), "memory_bytes": self._memory_bytes}
+
+'''
+* Function Name: cached_check_mission
+* Input:
+* result_cache: Cache to consult and fill (ResultCache).
+* deconfliction_system: Checker used on a miss (DeconflictionSystem).
+* primary_mission: The primary Mission object to check (Mission object).
+* schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
+* spatial_index: Optional SegmentGrid over schedule_list, reused across calls (SegmentGrid).
+* schedule_version: Version of schedule_list; hashed from its contents when omitted (str).
+* Output:
+* Tuple[str, ConflictRecords]: check_mission's result, served from the cache when possible. Cached conflict tables are
+* shared between callers and must not be modified.
+* Example Call:
+* status, conflicts = cached_check_mission(cache, system, my_mission, schedules, schedule_version=version)
+'''
+
+def cached_check_mission(result_cache: ResultCache, deconfliction_system: DeconflictionSystem, primary_mission: Mission,
+                         schedule_list: List[Mission], spatial_index: Optional[SegmentGrid] = None,
+                         schedule_version: Optional[str] = None) -> Tuple[str, ConflictRecords]:
+    """check_mission through a result cache."""
+    if schedule_version is None:
+        schedule_version = schedule_fingerprint(schedule_list)
+    key = result_cache.key(primary_mission, schedule_version, deconfliction_system.safety_buffer_distance)
+    result = result_cache.get(key)
+    if result is None:
+        result = deconfliction_system.check_mission(primary_mission, schedule_list, spatial_index)
+        result_cache.put(key, result)
+    return result
@@ -0,0 +1,388 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: spatial_index.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: suggest_cell_size, segment_cells, SegmentGrid (from_schedules, resized, snapshot, all_segments, add_mission,
+            insert_segments, remove_segments, query, segments_for, candidate_times, oversized_share)
+ Global Variables: MAX_CELLS_PER_ENTRY, MAX_OVERSIZED_SHARE, CELL_SIZE_PER_BUFFER, MAX_PIECES_PER_SEGMENT
+
+ '''
+
+import copy
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils import Mission
+
+# Variable Name: MAX_CELLS_PER_ENTRY: Segments registered in more cells than this are kept in an always-checked overflow set instead, expected range: 1 to infinity.
+MAX_CELLS_PER_ENTRY = 4096
+# Variable Name: MAX_OVERSIZED_SHARE: Fraction of indexed segments allowed in the overflow set before an auto-sized grid is
+# rebuilt; every query row scans the whole overflow set, expected range: 0.0 to 1.0.
+MAX_OVERSIZED_SHARE = 0.05
+# Variable Name: CELL_SIZE_PER_BUFFER: Largest suggested cell size as a multiple of the safety buffer, expected range: greater than 0.0.
+CELL_SIZE_PER_BUFFER = 8.0
+# Variable Name: MAX_PIECES_PER_SEGMENT: Pieces a median-length segment may be cut into, which bounds the suggested cell size from below.
+MAX_PIECES_PER_SEGMENT = 64
+
+# Variable Name: _CELL_HASH: Odd 64-bit multipliers folding an integer cell coordinate into one sortable key. Distinct
+# cells may share a key; that only adds candidates, which the exact box test removes.
+_CELL_HASH = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+
+'''
+* Function Name: suggest_cell_size
+* Input:
+* segments: Array of shape (N, 2, 3) with the segments that will be indexed.
+* safety_buffer_distance: Padding applied around every segment (float).
+* Output:
+* float: A grid cell edge length.
+* Logic: Cells only need to be about as wide as the buffer: long segments are cut into cell-sized pieces, so a cell
+* much larger than the buffer just returns more far-away candidates. The size is the median padded segment extent,
+* capped at CELL_SIZE_PER_BUFFER buffers but never so small that a median segment needs more than
+* MAX_PIECES_PER_SEGMENT pieces.
+* Example Call:
+* cell_size = suggest_cell_size(segments, 5.0)
+'''
+
+def suggest_cell_size(segments: np.ndarray, safety_buffer_distance: float) -> float:
+    """Pick a grid cell size from the safety buffer and the typical segment extent."""
+    if len(segments) == 0:
+        return max(CELL_SIZE_PER_BUFFER * safety_buffer_distance, 1.0)
+    extents = np.abs(segments[:, 1] - segments[:, 0]).max(axis=1) + 2.0 * safety_buffer_distance
+    median_extent = float(np.median(extents))
+    cell_size = median_extent
+    if safety_buffer_distance > 0.0:
+        cell_size = max(min(cell_size, CELL_SIZE_PER_BUFFER * safety_buffer_distance), median_extent / MAX_PIECES_PER_SEGMENT)
+    return cell_size if cell_size > 0.0 else 1.0
+
+'''
+* Function Name: segment_cells
+* Input:
+* segments: Array of shape (N, 2, 3).
+* cell_size: Edge length of the grid cells (float).
+* padding: Distance every segment is grown by on each side (float).
+* Output:
+* Tuple[np.ndarray, np.ndarray]: Owning segment index and hashed cell key of every (segment, cell) entry, with
+* each pair listed once, ordered by segment.
+* Logic: Each segment is cut into pieces no longer than a cell and every piece registers the cells touched by its
+* bounding box grown by padding, so a long diagonal segment covers a thin tube of cells instead of its whole
+* bounding box. Any point within padding of the segment lies in one of those cells. Fully vectorised.
+* Example Call:
+* owners, keys = segment_cells(segments, 20.0, 5.0)
+'''
+
+def segment_cells(segments: np.ndarray, cell_size: float, padding: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed grid cells covered by each padded segment."""
+    if len(segments) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+    directions = segments[:, 1] - segments[:, 0]
+    piece_counts = np.maximum(np.ceil(np.sqrt(np.einsum('ij,ij->i', directions, directions)) / cell_size), 1).astype(np.int64)
+    piece_owners = np.repeat(np.arange(len(segments), dtype=np.int64), piece_counts)
+    piece_index = np.arange(len(piece_owners), dtype=np.int64) - np.repeat(np.cumsum(piece_counts) - piece_counts, piece_counts)
+    piece_begin = segments[piece_owners, 0] + directions[piece_owners] * (piece_index / piece_counts[piece_owners])[:, None]
+    piece_end = segments[piece_owners, 0] + directions[piece_owners] * ((piece_index + 1) / piece_counts[piece_owners])[:, None]
+    low = np.floor((np.minimum(piece_begin, piece_end) - padding) / cell_size).astype(np.int64)
+    spans = np.floor((np.maximum(piece_begin, piece_end) + padding) / cell_size).astype(np.int64) - low + 1
+
+    # Enumerate the cells of every piece box: a running index within the box is split into (x, y, z) offsets.
+    cell_counts = np.prod(spans, axis=1)
+    entry_pieces = np.repeat(np.arange(len(piece_owners), dtype=np.int64), cell_counts)
+    local_index = np.arange(len(entry_pieces), dtype=np.int64) - np.repeat(np.cumsum(cell_counts) - cell_counts, cell_counts)
+    entry_spans = spans[entry_pieces]
+    offset_x, remainder = np.divmod(local_index, entry_spans[:, 1] * entry_spans[:, 2])
+    offset_y, offset_z = np.divmod(remainder, entry_spans[:, 2])
+    cells = low[entry_pieces] + np.column_stack([offset_x, offset_y, offset_z])
+    keys = np.bitwise_xor.reduce(cells.view(np.uint64) * _CELL_HASH, axis=1)
+
+    # Neighbouring pieces share cells; keep each (segment, key) once.
+    owners = piece_owners[entry_pieces]
+    order = np.lexsort((keys, owners))
+    owners, keys = owners[order], keys[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = (owners[1:] != owners[:-1]) | (keys[1:] != keys[:-1])
+    return owners[first], keys[first]
+
+
+class SegmentGrid:
+
+    '''
+    Variable Name: safety_buffer_distance: Padding applied to every indexed segment, expected range: 0.0 to infinity.
+    Variable Name: cell_size: Edge length of the cubic hash-grid cells, expected range: greater than 0.0.
+    Variable Name: segment_count: Total number of indexed segments across all flights.
+    '''
+
+    def __init__(self, safety_buffer_distance: float, cell_size: float):
+        self.safety_buffer_distance = safety_buffer_distance
+        self.cell_size = cell_size
+        # Variable Name: _segments: Indexed (S, 2, 3) segment arrays keyed by flight id.
+        # Variable Name: _times: Matching (S, 2) segment time windows keyed by flight id (None when indexed without times).
+        # Variable Name: _flight_slots: First slot of each flight; a flight's segments occupy consecutive slots.
+        # Variable Name: _slot_segments / _slot_times / _slot_flights / _slot_segment_ids / _slot_live: Per-slot copies of
+        # every indexed segment for vectorised gathers, with NaN times for flights indexed without times. Slots of removed
+        # flights are only marked dead and are reclaimed when the grid compacts itself.
+        # Variable Name: _runs: Sorted (cell keys, slots) runs of the hash grid. A new flight adds a run and runs of similar
+        # size are merged, so a query searches O(log S) runs and an insert costs amortised O(log S) per entry.
+        # Variable Name: _oversized_slots: Slots registered in more than MAX_CELLS_PER_ENTRY cells, checked by every query row.
+        # Variable Name: _shared: Set once snapshot() has handed out views of the containers below; the next update
+        # copies the ones it changes in place first.
+        self._segments: Dict[int, np.ndarray] = {}
+        self._times: Dict[int, Optional[np.ndarray]] = {}
+        self._flight_slots: Dict[int, int] = {}
+        self._slot_segments = np.empty((0, 2, 3))
+        self._slot_times = np.empty((0, 2))
+        self._slot_flights = np.empty(0, dtype=np.int64)
+        self._slot_segment_ids = np.empty(0, dtype=np.int64)
+        self._slot_live = np.empty(0, dtype=bool)
+        self._slot_count = 0
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._oversized_slots = np.empty(0, dtype=np.int64)
+        self.segment_count = 0
+        self._shared = False
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def __contains__(self, flight_id: int) -> bool:
+        return flight_id in self._segments
+
+    '''
+    * Function Name: from_schedules
+    * Input:
+    * schedule_list: List of Mission objects to index (List[Mission]).
+    * safety_buffer_distance: Padding applied around every segment (float).
+    * cell_size: Optional grid cell size; chosen with suggest_cell_size when omitted (float).
+    * Output:
+    * SegmentGrid: An index whose flight ids are positions in schedule_list, matching check_spatial_conflict.
+    * Logic: Builds every mission's segment array once and inserts them all as a single run.
+    * Example Call:
+    * grid = SegmentGrid.from_schedules(schedules, 5.0)
+    '''
+
+    @classmethod
+    def from_schedules(cls, schedule_list: List[Mission], safety_buffer_distance: float, cell_size: Optional[float] = None) -> "SegmentGrid":
+        """Build an index over every segment of schedule_list."""
+        per_mission = [mission.segment_array() for mission in schedule_list]
+        per_mission_times = [mission.segment_times() for mission in schedule_list]
+        if cell_size is None:
+            all_segments = np.concatenate(per_mission) if per_mission else np.empty((0, 2, 3))
+            cell_size = suggest_cell_size(all_segments, safety_buffer_distance)
+        grid = cls(safety_buffer_distance, cell_size)
+        grid._insert_flights(list(range(len(schedule_list))), per_mission, per_mission_times)
+        return grid
+
+    '''
+    * Function Name: resized
+    * Input:
+    * cell_size: Cell size of the new grid (float).
+    * Output:
+    * SegmentGrid: A new grid holding the same flights, segments and time windows.
+    * Example Call:
+    * grid = grid.resized(suggest_cell_size(grid.all_segments(), grid.safety_buffer_distance))
+    '''
+
+    def resized(self, cell_size: float) -> "SegmentGrid":
+        """Re-index the same segments with another cell size."""
+        grid = SegmentGrid(self.safety_buffer_distance, cell_size)
+        flight_ids = list(self._segments)
+        grid._insert_flights(flight_ids, [self._segments[flight_id] for flight_id in flight_ids],
+                             [self._times[flight_id] for flight_id in flight_ids])
+        return grid
+
+    '''
+    * Function Name: snapshot
+    * Input:
+    * None: Uses the grid's current contents.
+    * Output:
+    * SegmentGrid: A grid that answers query and candidate_times for the flights indexed right now; later inserts and
+    * removals on this grid do not show through, and the snapshot itself must not be updated.
+    * Logic: O(1) shallow copy sharing every array. Arrays are only written past the snapshot's last slot or replaced
+    * whole, except the slot liveness mask, the flight dictionaries and the run list, which the next update on this
+    * grid copies first (copy-on-write). Back-to-back snapshots with no update in between cost nothing extra.
+    * Example Call:
+    * frozen = grid.snapshot()
+    '''
+
+    def snapshot(self) -> "SegmentGrid":
+        """Cheap frozen view of the grid for queries that run while it keeps changing."""
+        self._shared = True
+        return copy.copy(self)
+
+    def _unshare(self) -> None:
+        if self._shared:
+            self._segments, self._times, self._flight_slots = dict(self._segments), dict(self._times), dict(self._flight_slots)
+            self._runs = list(self._runs)
+            self._slot_live = self._slot_live.copy()
+            self._shared = False
+
+    def all_segments(self) -> np.ndarray:
+        """Every indexed segment as one (segment_count, 2, 3) array."""
+        return np.concatenate(list(self._segments.values())) if self._segments else np.empty((0, 2, 3))
+
+    @property
+    def oversized_share(self) -> float:
+        """Fraction of indexed segments held in the overflow set, which every query row scans."""
+        return len(self._oversized_slots) / self.segment_count if self.segment_count else 0.0
+
+    def add_mission(self, flight_id: int, mission: Mission) -> None:
+        """Index every segment of mission under flight_id."""
+        self.insert_segments(flight_id, mission.segment_array(), mission.segment_times())
+
+    '''
+    * Function Name: insert_segments
+    * Input:
+    * flight_id: Identifier reported back by query for these segments (int).
+    * segments: Array of shape (S, 2, 3) with the flight's segments.
+    * segment_times: Optional (S, 2) time windows, needed when the grid serves temporal checks.
+    * Output:
+    * None: Updates the grid in place.
+    * Logic: Registers each segment in every cell it passes within safety_buffer_distance of (see segment_cells), or in
+    * the overflow set when that is more than MAX_CELLS_PER_ENTRY cells.
+    * Example Call:
+    * grid.insert_segments(7, mission.segment_array())
+    '''
+
+    def insert_segments(self, flight_id: int, segments: np.ndarray, segment_times: Optional[np.ndarray] = None) -> None:
+        """Index a flight's segments."""
+        self._insert_flights([flight_id], [segments], [segment_times])
+
+    def _insert_flights(self, flight_ids: List[int], per_flight_segments: List[np.ndarray], per_flight_times: List[Optional[np.ndarray]]) -> None:
+        for flight_id in flight_ids:
+            if flight_id in self._segments:
+                raise ValueError(f"flight {flight_id} is already indexed")
+        if len(set(flight_ids)) != len(flight_ids):
+            raise ValueError("flight ids must be unique")
+        self._unshare()
+        counts = [len(segments) for segments in per_flight_segments]
+        added = sum(counts)
+        first_slot = self._slot_count
+        self._reserve(first_slot + added)
+        for flight_id, segments, segment_times, count in zip(flight_ids, per_flight_segments, per_flight_times, counts):
+            slots = slice(self._slot_count, self._slot_count + count)
+            self._segments[flight_id] = segments
+            self._times[flight_id] = segment_times
+            self._flight_slots[flight_id] = self._slot_count
+            self._slot_segments[slots] = segments
+            self._slot_times[slots] = np.nan if segment_times is None else segment_times
+            self._slot_flights[slots] = flight_id
+            self._slot_segment_ids[slots] = np.arange(count)
+            self._slot_live[slots] = True
+            self._slot_count += count
+        self.segment_count += added
+        self._index_slots(np.arange(first_slot, first_slot + added, dtype=np.int64))
+
+    def _reserve(self, slot_count: int) -> None:
+        capacity = len(self._slot_live)
+        if slot_count <= capacity:
+            return
+        capacity = max(slot_count, 2 * capacity)
+        for name in ("_slot_segments", "_slot_times", "_slot_flights", "_slot_segment_ids", "_slot_live"):
+            values = getattr(self, name)
+            grown = np.zeros((capacity,) + values.shape[1:], dtype=values.dtype)
+            grown[:self._slot_count] = values[:self._slot_count]
+            setattr(self, name, grown)
+
+    def _index_slots(self, slots: np.ndarray) -> None:
+        owners, keys = segment_cells(self._slot_segments[slots], self.cell_size, self.safety_buffer_distance)
+        cell_counts = np.bincount(owners, minlength=len(slots))
+        oversized = cell_counts > MAX_CELLS_PER_ENTRY
+        if oversized.any():
+            self._oversized_slots = np.concatenate([self._oversized_slots, slots[oversized]])
+            kept = ~oversized[owners]
+            owners, keys = owners[kept], keys[kept]
+        if not len(keys):
+            return
+        order = np.argsort(keys, kind='stable')
+        self._runs.append((keys[order], slots[owners[order]]))
+        # Merge runs of similar size so their count stays logarithmic in the number of entries.
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            (keys_one, slots_one), (keys_two, slots_two) = self._runs.pop(), self._runs.pop()
+            keys, slots_merged = np.concatenate([keys_two, keys_one]), np.concatenate([slots_two, slots_one])
+            order = np.argsort(keys, kind='stable')
+            self._runs.append((keys[order], slots_merged[order]))
+
+    '''
+    * Function Name: remove_segments
+    * Input:
+    * flight_id: Identifier the segments were inserted under (int).
+    * Output:
+    * np.ndarray: The (S, 2, 3) segments that were removed.
+    * Logic: Marks the flight's slots dead, which queries skip, in O(segments of this flight). Once dead slots
+    * outnumber live ones the grid re-indexes its live flights, so removal stays amortised O(1) per segment.
+    * Example Call:
+    * grid.remove_segments(7)
+    '''
+
+    def remove_segments(self, flight_id: int) -> np.ndarray:
+        """Remove a flight's segments from the index."""
+        self._unshare()
+        segments = self._segments.pop(flight_id)
+        del self._times[flight_id]
+        first_slot = self._flight_slots.pop(flight_id)
+        self._slot_live[first_slot:first_slot + len(segments)] = False
+        self.segment_count -= len(segments)
+        dead_slots = self._slot_count - self.segment_count
+        if dead_slots > max(self.segment_count, 1024) or self.segment_count == 0:
+            # Re-index the live flights into fresh slots and runs, keeping this object.
+            self.__dict__.update(self.resized(self.cell_size).__dict__)
+        return segments
+
+    def segments_for(self, flight_id: int) -> np.ndarray:
+        """Return the indexed segments of flight_id."""
+        return self._segments[flight_id]
+
+    def candidate_times(self, flight_ids: np.ndarray, segment_ids: np.ndarray) -> np.ndarray:
+        """Return the (P, 2) time windows of the given indexed segments."""
+        if len(flight_ids) == 0:
+            return np.empty((0, 2))
+        known_flights = np.fromiter(self._flight_slots, dtype=np.int64, count=len(self._flight_slots))
+        first_slots = np.fromiter(self._flight_slots.values(), dtype=np.int64, count=len(self._flight_slots))
+        flight_order = np.argsort(known_flights)
+        positions = flight_order[np.searchsorted(known_flights[flight_order], flight_ids)]
+        return self._slot_times[first_slots[positions] + segment_ids]
+
+    '''
+    * Function Name: query
+    * Input:
+    * segments: Array of shape (M, 2, 3) with the query (primary mission) segments.
+    * safety_buffer_distance: Separation of interest; defaults to the buffer the grid was built with (float).
+    * Output:
+    * Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: For every candidate pair, the query row, flight id,
+    * segment index within that flight, and the (P, 2, 3) indexed segments themselves, ordered by row then by
+    * insertion order of the indexed segments.
+    * Logic: Looks up the cells covered by each query segment in every run with searchsorted, adds the overflow set,
+    * drops duplicate (row, slot) pairs by sorting packed keys and dead slots by mask, then keeps only pairs whose
+    * bounding boxes are within safety_buffer_distance of each other. Any pair closer than the buffer is guaranteed
+    * to be returned.
+    * Example Call:
+    * rows, flight_ids, segment_ids, candidates = grid.query(primary_mission.segment_array())
+    '''
+
+    def query(self, segments: np.ndarray, safety_buffer_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Candidate (query segment, indexed segment) pairs that may lie within the buffer."""
+        if safety_buffer_distance is None:
+            safety_buffer_distance = self.safety_buffer_distance
+        row_blocks, slot_blocks = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        if len(segments) and self.segment_count:
+            # Indexed segments already carry the grid's own padding; only a larger requested buffer needs extra reach.
+            query_rows, query_keys = segment_cells(segments, self.cell_size, max(0.0, safety_buffer_distance - self.safety_buffer_distance))
+            for run_keys, run_slots in self._runs:
+                run_starts = np.searchsorted(run_keys, query_keys, side='left')
+                run_lengths = np.searchsorted(run_keys, query_keys, side='right') - run_starts
+                matched = np.repeat(np.arange(len(query_keys), dtype=np.int64), run_lengths)
+                positions = np.repeat(run_starts, run_lengths) + np.arange(len(matched), dtype=np.int64) - np.repeat(np.cumsum(run_lengths) - run_lengths, run_lengths)
+                row_blocks.append(query_rows[matched])
+                slot_blocks.append(run_slots[positions])
+            if len(self._oversized_slots):
+                row_blocks.append(np.repeat(np.arange(len(segments), dtype=np.int64), len(self._oversized_slots)))
+                slot_blocks.append(np.tile(self._oversized_slots, len(segments)))
+
+        pair_keys = np.sort(np.concatenate(row_blocks) * max(self._slot_count, 1) + np.concatenate(slot_blocks))
+        rows, slots = np.divmod(pair_keys[np.diff(pair_keys, prepend=-1) != 0], max(self._slot_count, 1))
+        live = self._slot_live[slots]
+        rows, slots = rows[live], slots[live]
+        candidates = self._slot_segments[slots]
+
+        # Exact bounding-box test: the gap between boxes is a lower bound on the segment distance.
+        query_low, query_high = np.minimum(segments[:, 0], segments[:, 1])[rows], np.maximum(segments[:, 0], segments[:, 1])[rows]
+        box_gap = np.maximum(0.0, np.maximum(query_low - np.maximum(candidates[:, 0], candidates[:, 1]),
+                                             np.minimum(candidates[:, 0], candidates[:, 1]) - query_high))
+        keep = np.einsum('ij,ij->i', box_gap, box_gap) < safety_buffer_distance ** 2
+        return rows[keep], self._slot_flights[slots[keep]], self._slot_segment_ids[slots[keep]], candidates[keep]
@@ -0,0 +1,184 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: telemetry_monitor.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: PositionReport, ConformanceMonitor (process_report, submit, run, stop, subscribe, unsubscribe, serve_unix,
+            latency_stats)
+ Global Variables: LATENCY_WINDOW
+
+ '''
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from utils import Mission
+from trajectory import TrajectorySampler
+
+# Variable Name: LATENCY_WINDOW: Number of most recent per-report latencies kept for the p50 / p99 statistics.
+LATENCY_WINDOW = 10000
+
+@dataclass
+class PositionReport:
+
+    '''
+    Variable Name: flight_id: Identifier of the reporting drone; its own planned mission is excluded from the comparison.
+    Variable Name: time: Mission-clock timestamp of the fix, expected range: any float value.
+    Variable Name: position: Reported (x, y, z) position.
+    Variable Name: received_at: time.perf_counter() when the report reached this process; latency is measured from it.
+    serve_unix stamps it as the bytes are read off the socket, submit() stamps reports that arrive without one.
+    '''
+
+    flight_id: int
+    time: float
+    position: Tuple[float, float, float]
+    received_at: Optional[float] = None
+
+class ConformanceMonitor:
+
+    '''
+    Variable Name: safety_buffer_distance: Alert when a reported position is closer than this to another mission's plan, expected range: 0.0 to infinity.
+    Variable Name: flight_ids: (N,) ids of the monitored missions, in the sampler's row order.
+    Position reports arrive through submit() (or a local socket via serve_unix) and are processed by run(); alerts are
+    pushed to every queue returned by subscribe().
+    '''
+
+    def __init__(self, missions: Dict[int, Mission], safety_buffer_distance: float = 5.0):
+        self.safety_buffer_distance = safety_buffer_distance
+        self.flight_ids = np.array(list(missions), dtype=np.int64)
+        self.planned_positions = TrajectorySampler(list(missions.values()))
+        self._reports: asyncio.Queue = asyncio.Queue()
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.reports_processed = 0
+        self.alerts_published = 0
+
+    def subscribe(self) -> asyncio.Queue:
+        """Return a new queue that will receive every alert."""
+        subscriber = asyncio.Queue()
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue) -> None:
+        self._subscribers.discard(subscriber)
+
+    '''
+    * Function Name: process_report
+    * Input:
+    * report: One position fix (PositionReport).
+    * Output:
+    * List[dict]: One alert per other mission whose planned position at report.time is within safety_buffer_distance,
+    * with keys flight_id, conflicting_flight_id, time, distance, reported_position and planned_position.
+    * Logic: Samples every plan at report.time in one TrajectorySampler pass and thresholds the distances of the
+    * missions airborne at that time.
+    * Example Call:
+    * alerts = monitor.process_report(PositionReport(3, 12.5, (10.0, 4.0, 100.0)))
+    '''
+
+    def process_report(self, report: PositionReport) -> List[dict]:
+        """Compare one position report with every other mission's plan."""
+        planned, airborne = self.planned_positions.sample([report.time])
+        planned, airborne = planned[:, 0], airborne[:, 0]
+        offsets = planned - np.asarray(report.position, dtype=np.float64)
+        distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+        close = np.nonzero(airborne & (distances < self.safety_buffer_distance) & (self.flight_ids != report.flight_id))[0]
+        return [{
+            "flight_id": report.flight_id,
+            "conflicting_flight_id": int(self.flight_ids[hit]),
+            "time": report.time,
+            "distance": float(distances[hit]),
+            "reported_position": tuple(report.position),
+            "planned_position": tuple(planned[hit].tolist())
+        } for hit in close]
+
+    async def submit(self, report: PositionReport) -> None:
+        """Queue a position report for processing, stamping its receipt time unless it already has one."""
+        if report.received_at is None:
+            report.received_at = time.perf_counter()
+        await self._reports.put(report)
+
+    def submit_nowait(self, report: PositionReport) -> None:
+        """Queue a position report from synchronous code running on the monitor's loop."""
+        if report.received_at is None:
+            report.received_at = time.perf_counter()
+        self._reports.put_nowait(report)
+
+    async def stop(self) -> None:
+        """Ask run() to return once the reports queued so far are processed."""
+        await self._reports.put(None)
+
+    '''
+    * Function Name: run
+    * Input:
+    * None: Consumes the internal report queue until stop() is called.
+    * Output:
+    * None: Publishes alerts to subscribers and records the latency of each report from its receipt (received_at) to
+    * publication, so time spent queued behind a burst is included.
+    * Logic: Drains every report already waiting before yielding back to the loop, so bursts are handled without a
+    * context switch per report.
+    * Example Call:
+    * task = asyncio.create_task(monitor.run())
+    '''
+
+    async def run(self) -> None:
+        """Process position reports until stopped."""
+        while True:
+            queued = [await self._reports.get()]
+            while not self._reports.empty():
+                queued.append(self._reports.get_nowait())
+            for report in queued:
+                if report is None:
+                    return
+                for alert in self.process_report(report):
+                    for subscriber in self._subscribers:
+                        subscriber.put_nowait(alert)
+                    self.alerts_published += 1
+                self.reports_processed += 1
+                self._latencies.append(time.perf_counter() - report.received_at)
+
+    '''
+    * Function Name: serve_unix
+    * Input:
+    * socket_path: Filesystem path of the local socket to listen on (str).
+    * Output:
+    * asyncio.AbstractServer: The running server; close it to stop accepting connections.
+    * Logic: Each connection sends newline-delimited JSON {"flight_id": 3, "time": 12.5, "position": [x, y, z]};
+    * every line is submitted as a PositionReport. Reports are stamped with the time their bytes were read off the
+    * socket, so a burst parsed from one read shares one receipt time and its queueing delay shows in the latency.
+    * Example Call:
+    * server = await monitor.serve_unix("/tmp/uav-telemetry.sock")
+    '''
+
+    async def serve_unix(self, socket_path: str) -> asyncio.AbstractServer:
+        """Accept JSON-lines position reports on a local socket."""
+        async def submit_lines(lines: List[bytes], received_at: float) -> None:
+            for line in lines:
+                if line.strip():
+                    record = json.loads(line)
+                    await self.submit(PositionReport(record["flight_id"], float(record["time"]), tuple(record["position"]), received_at))
+
+        async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            pending = b""
+            try:
+                while True:
+                    chunk = await reader.read(1 << 16)
+                    received_at = time.perf_counter()
+                    if not chunk:
+                        await submit_lines([pending], received_at)
+                        return
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    await submit_lines(lines, received_at)
+            finally:
+                writer.close()
+        return await asyncio.start_unix_server(handle_connection, path=socket_path)
+
+    def latency_stats(self) -> Dict[str, Optional[float]]:
+        """p50 / p99 / max receipt-to-publication latency in milliseconds over the recent window."""
+        if not self._latencies:
+            return {"count": 0, "p50_ms": None, "p99_ms": None, "max_ms": None}
+        latencies_ms = np.array(self._latencies) * 1e3
+        return {"count": len(latencies_ms), "p50_ms": float(np.percentile(latencies_ms, 50)),
+                "p99_ms": float(np.percentile(latencies_ms, 99)), "max_ms": float(latencies_ms.max())}
@@ -0,0 +1,89 @@
+'''
+Author List: Subhrajit Mahana
+ Filename: trajectory.py
+ Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
+ Functions: TrajectorySampler (sample, sample_pairs)
+ Global Variables: None
+
+ '''
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from utils import Mission
+
+
+class TrajectorySampler:
+
+    '''
+    Variable Name: missions: Missions to sample, addressed by their position in this sequence (Sequence[Mission]).
+    Packs every mission's coordinates and cumulative time table (Mission.waypoint_times, so explicit per-waypoint
+    timestamps are honoured) into flat arrays once. Each mission's times are then shifted onto its own stretch of one
+    increasing key axis, so a single searchsorted finds the segment of every (mission, time) query at once.
+    '''
+
+    def __init__(self, missions: Sequence[Mission]):
+        counts = np.array([len(mission.coordinates) for mission in missions], dtype=np.int64)
+        self._offsets = np.cumsum(counts) - counts
+        self._last_segment = self._offsets + np.maximum(counts - 2, 0)
+        self._has_segments = counts > 1
+        self._t_start = np.array([mission.t_start for mission in missions], dtype=np.float64)
+        self._t_end = np.array([mission.t_end for mission in missions], dtype=np.float64)
+        if len(missions):
+            self._coordinates = np.concatenate([mission.coordinates for mission in missions])
+            self._waypoint_times = np.concatenate([mission.waypoint_times() for mission in missions])
+        else:
+            self._coordinates, self._waypoint_times = np.empty((0, 3)), np.empty(0)
+        # Variable Name: _key_base: Start of each mission's stretch of the key axis; stretches are separated by a gap of 1.
+        spans = self._t_end - self._t_start
+        self._key_base = np.cumsum(spans + 1.0) - (spans + 1.0)
+        self._keys = self._waypoint_times - np.repeat(self._t_start - self._key_base, counts)
+
+    def __len__(self) -> int:
+        return len(self._t_start)
+
+    '''
+    * Function Name: sample_pairs
+    * Input:
+    * rows: Mission indices (array-like of int).
+    * times: Query times, broadcast against rows (array-like of float).
+    * Output:
+    * Tuple[np.ndarray, np.ndarray]: (..., 3) positions and a boolean mask of the queries that fall inside their
+    * mission's [t_start, t_end]; masked-out positions are NaN.
+    * Logic: One searchsorted over the shared key axis picks each query's segment, which is clamped to the mission's
+    * own segments so boundary rounding can only select a neighbour with the same position. The position is then
+    * interpolated within that segment's duration; zero-length intervals (hover stops) take the later waypoint.
+    * Example Call:
+    * positions, airborne = sampler.sample_pairs([0, 3, 3], [10.0, 10.0, 25.0])
+    '''
+
+    def sample_pairs(self, rows, times) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluate planned positions for (mission, time) pairs."""
+        rows, times = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), np.asarray(times, dtype=np.float64))
+        airborne = (self._t_start[rows] <= times) & (times <= self._t_end[rows])
+        keys = times - self._t_start[rows] + self._key_base[rows]
+        segment_start = np.clip(np.searchsorted(self._keys, keys, side='right') - 1, self._offsets[rows], self._last_segment[rows])
+        segment_end = segment_start + self._has_segments[rows]
+        begin_time, end_time = self._waypoint_times[segment_start], self._waypoint_times[segment_end]
+        duration = end_time - begin_time
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(duration > 0, np.clip((times - begin_time) / duration, 0.0, 1.0), (times >= end_time).astype(np.float64))
+        start_point = self._coordinates[segment_start]
+        positions = start_point + fraction[..., None] * (self._coordinates[segment_end] - start_point)
+        positions[~airborne] = np.nan
+        return positions, airborne
+
+    '''
+    * Function Name: sample
+    * Input:
+    * times: (T,) query times shared by every sampled mission (array-like of float).
+    * rows: Mission indices to sample; all missions when omitted (array-like of int).
+    * Output:
+    * Tuple[np.ndarray, np.ndarray]: (R, T, 3) positions and an (R, T) mask of the times inside each mission's window.
+    * Example Call:
+    * positions, airborne = sampler.sample(np.arange(0.0, 600.0, 0.5))
+    '''
+
+    def sample(self, times, rows: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluate every selected mission on one time grid."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        return self.sample_pairs(rows[:, None], np.asarray(times, dtype=np.float64)[None, :])
@@ -1,7 +1,21 @@
-from dataclasses import dataclass
-from typing import List, Tuple
+from collections.abc import MutableSequence as MutableSequenceABC, Sequence as SequenceABC
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+def _read_only_copy(values) -> np.ndarray:
+    array = np.array(values, dtype=np.float64, copy=True)
+    array.flags.writeable = False
+    return array
+
+
+def _read_only_view(values: np.ndarray) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64).view()
+    array.flags.writeable = False
+    return array
+
 
-@dataclass
 class Waypoint:
 
     '''
@@ -9,10 +23,22 @@ class Waypoint:
     Variable Name: y_coordinate: The y-axis position of the waypoint, expected range: any float value.
     Variable Name: z_altitude: The z-axis altitude of the waypoint (0.0 by default for 2D support), expected range: any float value.
     '''
-    
-    x: float
-    y: float
-    z_altitude: float = 0.0  # Include z_altitude for 3D support
+
+    # Waypoints are a thin value facade; missions keep their coordinates in one float64 array instead.
+    __slots__ = ("x", "y", "z_altitude")
+
+    def __init__(self, x: float, y: float, z_altitude: float = 0.0):  # Include z_altitude for 3D support
+        self.x = x
+        self.y = y
+        self.z_altitude = z_altitude
+
+    def __repr__(self) -> str:
+        return f"Waypoint(x={self.x!r}, y={self.y!r}, z_altitude={self.z_altitude!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Waypoint):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
 
     '''
     * Function Name: to_tuple
@@ -30,45 +56,280 @@ class Waypoint:
         """Convert waypoint coordinates to a tuple."""
         return (self.x, self.y, self.z_altitude)
 
-@dataclass
+class _FrozenWaypoint(Waypoint):
+
+    '''
+    A Waypoint handed out by Mission.waypoints. Its coordinates are copies of the mission's, so setting them would
+    change nothing; it raises instead. Assign a new Waypoint to mission.waypoints[i] to move a waypoint.
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, x: float, y: float, z_altitude: float):
+        for name, value in (("x", x), ("y", y), ("z_altitude", z_altitude)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("waypoints read from a mission are copies; assign a new Waypoint to mission.waypoints[i] to move it")
+
+
+class MissionWaypoints(MutableSequenceABC):
+
+    '''
+    Variable Name: _mission: The Mission whose coordinate array this sequence reads and replaces.
+    List-like view returned by Mission.waypoints. Indexing builds Waypoint objects on demand. Item and slice
+    assignment, deletion, insert, append, extend and the other list operations build a new coordinate array and assign
+    it to the mission, so each mutation costs O(waypoints) and anything built from the old path (spatial grids, cache
+    keys, airspace entries) must be rebuilt by the caller. Missions with timestamps keep one time per waypoint, so
+    changing their waypoint count this way raises ValueError; assign waypoints and timestamps together instead.
+    '''
+
+    __slots__ = ("_mission",)
+
+    def __init__(self, mission: "Mission"):
+        self._mission = mission
+
+    def __len__(self) -> int:
+        return len(self._mission.coordinates)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Waypoint, List[Waypoint]]:
+        if isinstance(index, slice):
+            return [_FrozenWaypoint(x, y, z) for x, y, z in self._mission.coordinates[index].tolist()]
+        return _FrozenWaypoint(*self._mission.coordinates[index].tolist())
+
+    def __iter__(self) -> Iterator[Waypoint]:
+        return (_FrozenWaypoint(x, y, z) for x, y, z in self._mission.coordinates.tolist())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SequenceABC):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def _replace(self, points: List[Tuple[float, float, float]]) -> None:
+        if self._mission.timestamps is not None and len(points) != len(self._mission.timestamps):
+            raise ValueError("this mission has per-waypoint timestamps; assign waypoints and timestamps together to change the waypoint count")
+        self._mission.waypoints = np.array(points, dtype=np.float64).reshape(-1, 3)
+
+    def __setitem__(self, index: Union[int, slice], value: Union[Waypoint, Sequence[Waypoint]]) -> None:
+        points = self._mission.coordinates.tolist()
+        points[index] = [waypoint.to_tuple() for waypoint in value] if isinstance(index, slice) else value.to_tuple()
+        self._replace(points)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        points = self._mission.coordinates.tolist()
+        del points[index]
+        self._replace(points)
+
+    def insert(self, index: int, value: Waypoint) -> None:
+        points = self._mission.coordinates.tolist()
+        points.insert(index, value.to_tuple())
+        self._replace(points)
+
+    def extend(self, values: Iterable[Waypoint]) -> None:
+        # One rebuild for the whole batch rather than one per appended waypoint.
+        self._replace(self._mission.coordinates.tolist() + [waypoint.to_tuple() for waypoint in values])
+
+    def clear(self) -> None:
+        self._replace([])
+
 class Mission:
 
     '''
     Variable Name: waypoint_list: List of Waypoint objects defining the mission path, expected range: non-empty list.
     Variable Name: mission_start_time: The start time of the mission, expected range: any float value.
     Variable Name: mission_end_time: The end time of the mission, expected range: greater than mission_start_time.
+    Variable Name: coordinates: Read-only contiguous (K, 3) float64 array backing the waypoints (24 bytes per waypoint).
+    Input arrays are copied, so later changes to the caller's array cannot silently invalidate grids and cache
+    fingerprints built from the mission; Mission.wrap adopts shared or memory-mapped storage without copying.
+    Variable Name: timestamps: Optional read-only (K,) array of the times each waypoint is reached, from t_start to
+    t_end, for real speed profiles; None means every segment takes an equal share of the window.
     '''
 
-    waypoints: List[Waypoint]
-    t_start: float
-    t_end: float
+    __slots__ = ("coordinates", "t_start", "t_end", "timestamps")
+
+    def __init__(self, waypoints: Union[Sequence[Waypoint], np.ndarray], t_start: float, t_end: float,
+                 timestamps: Optional[Union[Sequence[float], np.ndarray]] = None):
+        self.waypoints = waypoints
+        self.t_start = t_start
+        self.t_end = t_end
+        self.timestamps = None if timestamps is None else _read_only_copy(timestamps).reshape(-1)
+
+    '''
+    * Function Name: wrap
+    * Input:
+    * coordinates: (K, 3) float64 array, e.g. a view into shared memory or a memory-mapped file (np.ndarray).
+    * t_start, t_end: The mission's time window (float).
+    * timestamps: Optional (K,) float64 array of waypoint times (np.ndarray).
+    * Output:
+    * Mission: A mission backed by the given arrays without copying; its views of them are made read-only. The
+    * caller guarantees the underlying storage is not modified while the mission is in use.
+    * Example Call:
+    * mission = Mission.wrap(mapped_waypoints[offset:offset + count], t_start, t_end)
+    '''
+
+    @classmethod
+    def wrap(cls, coordinates: np.ndarray, t_start: float, t_end: float, timestamps: Optional[np.ndarray] = None) -> "Mission":
+        """Build a mission over existing float64 arrays without copying them."""
+        mission = cls.__new__(cls)
+        mission.coordinates = _read_only_view(coordinates).reshape(-1, 3)
+        mission.t_start = t_start
+        mission.t_end = t_end
+        mission.timestamps = None if timestamps is None else _read_only_view(timestamps).reshape(-1)
+        return mission
+
+    @property
+    def waypoints(self) -> MissionWaypoints:
+        """List-like view of the mission's waypoints; changes made through it replace the coordinate array."""
+        return MissionWaypoints(self)
+
+    @waypoints.setter
+    def waypoints(self, waypoints: Union[Sequence[Waypoint], np.ndarray]) -> None:
+        if isinstance(waypoints, np.ndarray):
+            self.coordinates = _read_only_copy(waypoints).reshape(-1, 3)
+        else:
+            self.coordinates = _read_only_copy([wp.to_tuple() for wp in waypoints]).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.coordinates)
+
+    def __reduce__(self):
+        # Rebuilt through __init__ so unpickled arrays are read-only copies as well.
+        return Mission, (self.coordinates, self.t_start, self.t_end, self.timestamps)
+
+    def __repr__(self) -> str:
+        timestamps = "" if self.timestamps is None else f", timestamps={self.timestamps.tolist()!r}"
+        return f"Mission(waypoints={list(self.waypoints)!r}, t_start={self.t_start!r}, t_end={self.t_end!r}{timestamps})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mission):
+            return NotImplemented
+        if (self.timestamps is None) != (other.timestamps is None):
+            return False
+        return (self.t_start == other.t_start and self.t_end == other.t_end and np.array_equal(self.coordinates, other.coordinates)
+                and (self.timestamps is None or np.array_equal(self.timestamps, other.timestamps)))
 
     '''
     * Function Name: validate
     * Input:
-    * None: Uses instance attributes (waypoints, t_start, t_end).
+    * None: Uses instance attributes (coordinates, t_start, t_end, timestamps).
     * Output:
     * bool: True if the mission is valid (non-empty waypoints and t_start < t_end), False otherwise.
-    * Logic: Checks if the mission has at least one waypoint and a valid time window.
+    * Logic: Checks if the mission has at least one waypoint and a valid time window. Timestamps, when given, must
+    * hold one non-decreasing time per waypoint running from t_start to t_end.
     * Example Call:
     * is_valid = my_mission.validate()
     '''
 
     def validate(self) -> bool:
         """Ensure the mission is valid."""
-        return len(self.waypoints) > 0 and self.t_start < self.t_end
+        if not (len(self.coordinates) > 0 and self.t_start < self.t_end):
+            return False
+        if self.timestamps is None:
+            return True
+        return (len(self.timestamps) == len(self.coordinates) and self.timestamps[0] == self.t_start
+                and self.timestamps[-1] == self.t_end and bool(np.all(np.diff(self.timestamps) >= 0.0)))
 
     '''
-    * Function Name: generate_sample_schedules
+    * Function Name: waypoint_times
     * Input:
-    * None: Generates hardcoded sample data.
+    * None: Uses instance attributes (coordinates, t_start, t_end, timestamps).
     * Output:
-    * List[Mission]: A list of Mission objects representing sample flight schedules.
-    * Logic: Creates two predefined missions with 3D waypoints and time windows for testing.
+    * np.ndarray: (K,) time at which each waypoint is reached.
+    * Logic: The explicit timestamps when set, otherwise K equally spaced times over [t_start, t_end].
     * Example Call:
-    * schedules = generate_sample_schedules()
+    * arrival_times = my_mission.waypoint_times()
     '''
 
+    def waypoint_times(self) -> np.ndarray:
+        """Return the time each waypoint is reached."""
+        if self.timestamps is not None:
+            return self.timestamps
+        return np.linspace(self.t_start, self.t_end, len(self.coordinates))
+
+    '''
+    * Function Name: segment_array
+    * Input:
+    * None: Uses instance attribute coordinates.
+    * Output:
+    * np.ndarray: Read-only view of shape (max(K - 1, 1), 2, 3) with the start and end point of every path segment.
+    * Logic: Re-strides the coordinate array so row i covers waypoints i and i + 1; no data is copied. A
+    * single-waypoint mission yields one zero-length segment so a hovering drone still occupies its position.
+    * Example Call:
+    * segments = my_mission.segment_array()
+    '''
+
+    def segment_array(self) -> np.ndarray:
+        """Return the mission path as a (segments, 2, 3) float array view."""
+        if len(self.coordinates) == 0:
+            return np.empty((0, 2, 3))
+        row_stride, column_stride = self.coordinates.strides
+        if len(self.coordinates) == 1:
+            row_stride = 0
+        return as_strided(self.coordinates, shape=(max(len(self.coordinates) - 1, 1), 2, 3),
+                          strides=(row_stride, row_stride, column_stride), writeable=False)
+
+    '''
+    * Function Name: segment_times
+    * Input:
+    * None: Uses instance attributes (coordinates, t_start, t_end, timestamps).
+    * Output:
+    * np.ndarray: Array of shape (max(K - 1, 1), 2) with the [begin, end] time of every path segment.
+    * Logic: Consecutive timestamps when the mission has them; otherwise splits [t_start, t_end] into equal slices,
+    * one per segment, matching interpolate_position.
+    * Example Call:
+    * times = my_mission.segment_times()
+    '''
+
+    def segment_times(self) -> np.ndarray:
+        """Return the time window covered by each path segment."""
+        if len(self.coordinates) == 0:
+            return np.empty((0, 2))
+        if self.timestamps is not None and len(self.coordinates) > 1:
+            boundaries = self.timestamps
+        else:
+            boundaries = np.linspace(self.t_start, self.t_end, max(len(self.coordinates), 2))
+        return np.stack([boundaries[:-1], boundaries[1:]], axis=1)
+
+'''
+* Function Name: pack_mission_segments
+* Input:
+* schedule_list: List of Mission objects (List[Mission]).
+* Output:
+* Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: All segments as one (N, 2, 3) array, their (N, 2) time
+* windows, the owning flight index of each segment and the segment index within its own mission.
+* Logic: Concatenates each mission's segment_array and segment_times so the whole schedule can be handed to the
+* batched kernels at once.
+* Example Call:
+* segments, segment_times, flight_ids, segment_ids = pack_mission_segments(schedules)
+'''
+
+def pack_mission_segments(schedule_list: List[Mission]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pack the segments of several missions into flat arrays."""
+    if not schedule_list:
+        return np.empty((0, 2, 3)), np.empty((0, 2)), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    per_mission = [mission.segment_array() for mission in schedule_list]
+    counts = np.array([len(segments) for segments in per_mission], dtype=np.int64)
+    flight_ids = np.repeat(np.arange(len(schedule_list), dtype=np.int64), counts)
+    segment_ids = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    segment_times = np.concatenate([mission.segment_times() for mission in schedule_list])
+    return np.concatenate(per_mission), segment_times, flight_ids, segment_ids
+
+'''
+* Function Name: generate_sample_schedules
+* Input:
+* None: Generates hardcoded sample data.
+* Output:
+* List[Mission]: A list of Mission objects representing sample flight schedules.
+* Logic: Creates two predefined missions with 3D waypoints and time windows for testing.
+* Example Call:
+* schedules = generate_sample_schedules()
+'''
+
 def generate_sample_schedules() -> List[Mission]:
     """Generate sample flight schedules with 3D waypoints."""
     schedules = [
@@ -93,4 +354,47 @@ def generate_sample_schedules() -> List[Mission]:
     ]
 
     # Returns the list of schedules after populating with hardcoded waypoint and time data.
-    return schedules
\ No newline at end of file
+    return schedules
+
+'''
+* Function Name: generate_fleet
+* Input:
+* mission_count: Number of missions to generate (int).
+* waypoints_per_mission: Waypoints per mission, at least 1 (int).
+* seed: Seed for numpy.random.default_rng; equal seeds give identical fleets (int).
+* density: Missions per square kilometre of airspace (coordinates are metres); sets the square's side length (float).
+* altitude_bands: (low, high) altitude ranges; each mission cruises inside one band chosen at random (Sequence[Tuple[float, float]]).
+* mission_duration: Length of every mission's time window in seconds (float).
+* time_overlap: 1.0 starts every mission together, 0.0 spreads start times so consecutive missions barely overlap (float).
+* cruise_speed: Horizontal ground speed used to size each leg (float).
+* Output:
+* List[Mission]: Synthetic missions with smoothly turning paths that stay inside the airspace.
+* Logic: Each mission starts at a random point, flies legs of cruise_speed * leg time with a heading that drifts
+* by a bounded random turn per leg, reflects off the airspace edges, and wanders within its altitude band.
+* Example Call:
+* fleet = generate_fleet(1000, 50, seed=7, density=20.0)
+'''
+
+def generate_fleet(mission_count: int, waypoints_per_mission: int, seed: int = 0, density: float = 10.0,
+                   altitude_bands: Sequence[Tuple[float, float]] = ((50.0, 150.0),), mission_duration: float = 600.0,
+                   time_overlap: float = 1.0, cruise_speed: float = 10.0) -> List[Mission]:
+    """Generate a seeded synthetic fleet for scale testing."""
+    rng = np.random.default_rng(seed)
+    airspace_size = 1000.0 * np.sqrt(max(mission_count, 1) / density)
+    horizon = mission_duration * (1.0 + (1.0 - time_overlap) * max(mission_count - 1, 0))
+    leg_count = max(waypoints_per_mission - 1, 1)
+    leg_length = cruise_speed * mission_duration / leg_count
+
+    fleet = []
+    for _ in range(mission_count):
+        band_low, band_high = altitude_bands[rng.integers(len(altitude_bands))]
+        headings = rng.uniform(0.0, 2.0 * np.pi) + np.cumsum(rng.uniform(-np.pi / 6, np.pi / 6, leg_count))
+        legs = leg_length * np.column_stack([np.cos(headings), np.sin(headings)])
+        horizontal = rng.uniform(0.0, airspace_size, 2) + np.vstack([np.zeros(2), np.cumsum(legs, axis=0)])
+        # Reflect the path back into [0, airspace_size] on both horizontal axes.
+        horizontal = airspace_size - np.abs(np.mod(horizontal, 2.0 * airspace_size) - airspace_size)
+        altitude = np.clip(rng.uniform(band_low, band_high) + np.cumsum(rng.normal(0.0, 2.0, leg_count + 1)), band_low, band_high)
+        coordinates = np.column_stack([horizontal, altitude])[:waypoints_per_mission]
+        t_start = float(rng.uniform(0.0, horizon - mission_duration)) if horizon > mission_duration else 0.0
+        fleet.append(Mission(np.ascontiguousarray(coordinates), t_start, t_start + mission_duration))
+    return fleet
@@ -2,107 +2,137 @@
 Author List: Subhrajit Mahana
 Filename: visualization.py
 Theme: UAV Deconfliction - FlytBase Robotics Assignment 2025
-Functions: plot_2d_trajectories, plot_3d_trajectories, simulate_scenarios
-Global Variables: None
+Functions: plot_2d_trajectories, plot_3d_trajectories, render_plots, simulate_scenarios
+Global Variables: MAX_POINTS_PER_PATH, MAX_SCHEDULE_MARKERS
 '''
 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+import os
+from multiprocessing import get_context
+import matplotlib
+# Plots are only ever written to files, so the headless Agg backend is forced before any figure is created.
+matplotlib.use("Agg")
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (registers the '3d' projection)
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 import numpy as np
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 from utils import Mission, Waypoint
 from deconfliction import DeconflictionSystem
+from conflict_records import ConflictRecords, as_conflict_records
+
+# Variable Name: MAX_POINTS_PER_PATH: Longest polyline drawn per mission; denser paths are downsampled, keeping both ends.
+# Variable Name: MAX_SCHEDULE_MARKERS: Schedule waypoints are only marked when the drawn points stay below this count.
+MAX_POINTS_PER_PATH = 500
+MAX_SCHEDULE_MARKERS = 2000
+
+def _downsample(coordinates: np.ndarray, max_points: int = MAX_POINTS_PER_PATH) -> np.ndarray:
+    if len(coordinates) <= max_points:
+        return coordinates
+    return coordinates[np.unique(np.linspace(0, len(coordinates) - 1, max_points).round().astype(np.int64))]
+
+def _conflict_geometry(conflict_data: ConflictRecords) -> Tuple[np.ndarray, np.ndarray]:
+    # Many conflicts share a primary segment or a closest-approach point; each is drawn once.
+    conflict_data = as_conflict_records(conflict_data)
+    spatial, temporal = conflict_data.spatial().table, conflict_data.temporal().table
+    spatial_segments = np.unique(np.stack([spatial["begin_point"], spatial["end_point"]], axis=1), axis=0)
+    temporal_points = np.unique(temporal["begin_point"], axis=0)
+    return spatial_segments, temporal_points
 
 '''
 * Function Name: plot_2d_trajectories
 * Input:
 * primary_mission: The primary Mission object to plot (Mission object).
 * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
-* conflict_data: List of dictionaries containing conflict details (List[dict]).
+* conflict_data: Conflicts from check_mission; a list of conflict dicts is accepted too (ConflictRecords).
 * output_file_path: String path to save the 2D plot (str).
 * Output:
 * None: Saves the plot to the specified file path.
 * Logic: Plots 2D trajectories of the primary mission and schedules, marking spatial and temporal conflicts.
-* Uses Matplotlib to create the visualization and saves it as a PNG file.
+* All schedules are drawn as one LineCollection and each conflict type as one artist with a single legend entry,
+* so the artist count does not grow with the fleet or the number of conflicts.
 * Example Call:
 * plot_2d_trajectories(my_mission, [sched1, sched2], conflicts, "output.png")
 '''
 
-def plot_2d_trajectories(primary_mission: Mission, schedule_list: List[Mission], conflict_data: List[dict], output_file_path: str):
+def plot_2d_trajectories(primary_mission: Mission, schedule_list: List[Mission], conflict_data: ConflictRecords, output_file_path: str):
     """Plot drone trajectories in 2D for reference."""
-    plt.figure(figsize=(10, 8))
-
-    # Variable Name: x_coordinates_mission: List of x coordinates from the primary mission waypoints, expected range: any float values.
-    # Variable Name: y_coordinates_mission: List of y coordinates from the primary mission waypoints, expected range: any float values.
-    x_coordinates_mission = [wp.x for wp in primary_mission.waypoints]
-    y_coordinates_mission = [wp.y for wp in primary_mission.waypoints]
-    plt.plot(x_coordinates_mission, y_coordinates_mission, 'bo-', label='Primary Mission', linewidth=2)
-    for i, current_schedule in enumerate(schedule_list):
-        x_coordinates_schedule = [wp.x for wp in current_schedule.waypoints]
-        y_coordinates_schedule = [wp.y for wp in current_schedule.waypoints]
-        plt.plot(x_coordinates_schedule, y_coordinates_schedule, 'ro--', label=f'Schedule {i}', alpha=0.5)
-    for conflict in conflict_data:
-        if conflict['type'] == 'spatial':
-            (x1, y1, _), (x2, y2, _) = conflict['location']
-            plt.plot([x1, x2], [y1, y2], 'gx-', label='Spatial Conflict', markersize=10)
-        elif conflict['type'] == 'temporal':
-            x, y, _ = conflict['location']
-            plt.scatter(x, y, c='purple', s=100, label='Temporal Conflict', marker='x')
-    plt.xlabel('X Coordinate')
-    plt.ylabel('Y Coordinate')
-    plt.title('2D Drone Trajectories and Conflicts')
-    plt.legend()
-    plt.grid(True)
-    # Saves the 2D plot to the specified output file path and closes the figure to free memory.
-    plt.savefig(output_file_path)
-    plt.close()
+    fig = Figure(figsize=(10, 8))
+    ax = fig.add_subplot(111)
+
+    # Variable Name: schedule_paths: Downsampled (k, 3) coordinate arrays of every schedule.
+    schedule_paths = [_downsample(current_schedule.coordinates) for current_schedule in schedule_list]
+    primary_path = _downsample(primary_mission.coordinates)
+    ax.plot(primary_path[:, 0], primary_path[:, 1], 'bo-', label='Primary Mission', linewidth=2)
+    if schedule_paths:
+        ax.add_collection(LineCollection([path[:, :2] for path in schedule_paths], colors='r', linestyles='--', alpha=0.5,
+                                         label=f'Schedules ({len(schedule_paths)})'))
+        schedule_points = np.concatenate(schedule_paths)
+        if len(schedule_points) <= MAX_SCHEDULE_MARKERS:
+            ax.scatter(schedule_points[:, 0], schedule_points[:, 1], c='r', s=36, alpha=0.5)
+
+    spatial_segments, temporal_points = _conflict_geometry(conflict_data)
+    if len(spatial_segments):
+        ax.add_collection(LineCollection(spatial_segments[:, :, :2], colors='g', label='Spatial Conflict'))
+        ax.scatter(spatial_segments[:, :, 0].ravel(), spatial_segments[:, :, 1].ravel(), c='g', s=100, marker='x')
+    if len(temporal_points):
+        ax.scatter(temporal_points[:, 0], temporal_points[:, 1], c='purple', s=100, label='Temporal Conflict', marker='x')
+    ax.autoscale_view()
+    ax.set_xlabel('X Coordinate')
+    ax.set_ylabel('Y Coordinate')
+    ax.set_title('2D Drone Trajectories and Conflicts')
+    ax.legend()
+    ax.grid(True)
+    # Saves the 2D plot to the specified output file path; the figure is not registered with pyplot, so nothing leaks.
+    fig.savefig(output_file_path)
 
 '''
 * Function Name: plot_3d_trajectories
 * Input:
 * primary_mission: The primary Mission object to plot (Mission object).
 * schedule_list: List of Mission objects representing other drone schedules (List[Mission]).
-* conflict_data: List of dictionaries containing conflict details (List[dict]).
+* conflict_data: Conflicts from check_mission; a list of conflict dicts is accepted too (ConflictRecords).
 * output_file_path: String path to save the 3D plot (str).
 * Output:
 * None: Saves the plot to the specified file path.
 * Logic: Plots 3D trajectories of the primary mission and schedules, marking spatial and temporal conflicts.
-* Uses Matplotlib with 3D projection and saves it as a PNG file.
+* Schedules are batched into one Line3DCollection and conflicts drawn as one artist per type; axis limits are set
+* from the drawn points because 3D axes do not autoscale to collections.
 * Example Call:
 * plot_3d_trajectories(my_mission, [sched1, sched2], conflicts, "output.png")
 '''
 
-def plot_3d_trajectories(primary_mission: Mission, schedule_list: List[Mission], conflict_data: List[dict], output_file_path: str):
+def plot_3d_trajectories(primary_mission: Mission, schedule_list: List[Mission], conflict_data: ConflictRecords, output_file_path: str):
     """Plot drone trajectories and conflicts in 3D."""
-    fig = plt.figure(figsize=(10, 8))
+    fig = Figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
 
     # Plot primary mission
-    ax.plot(
-        [wp.x for wp in primary_mission.waypoints],
-        [wp.y for wp in primary_mission.waypoints],
-        [wp.z_altitude for wp in primary_mission.waypoints],
-        'bo-', label='Primary Mission', linewidth=2, markersize=8
-    )
+    primary_path = _downsample(primary_mission.coordinates)
+    ax.plot(primary_path[:, 0], primary_path[:, 1], primary_path[:, 2], 'bo-', label='Primary Mission', linewidth=2, markersize=8)
+    drawn_points = [primary_path]
 
     # Plot schedules
-    for i, current_schedule in enumerate(schedule_list):
-        ax.plot(
-            [wp.x for wp in current_schedule.waypoints],
-            [wp.y for wp in current_schedule.waypoints],
-            [wp.z_altitude for wp in current_schedule.waypoints],
-            'ro--', label=f'Schedule {i}', alpha=0.5, markersize=6
-        )
+    schedule_paths = [_downsample(current_schedule.coordinates) for current_schedule in schedule_list]
+    if schedule_paths:
+        ax.add_collection3d(Line3DCollection(schedule_paths, colors='r', linestyles='--', alpha=0.5,
+                                             label=f'Schedules ({len(schedule_paths)})'))
+        schedule_points = np.concatenate(schedule_paths)
+        if len(schedule_points) <= MAX_SCHEDULE_MARKERS:
+            ax.scatter(schedule_points[:, 0], schedule_points[:, 1], schedule_points[:, 2], c='r', s=36, alpha=0.5)
+        drawn_points.append(schedule_points)
 
     # Highlight conflicts
-    for conflict in conflict_data:
-        if conflict['type'] == 'spatial':
-            (x1, y1, z1), (x2, y2, z2) = conflict['location']
-            ax.plot([x1, x2], [y1, y2], [z1, z2], 'gx-', label='Spatial Conflict', markersize=10)
-        elif conflict['type'] == 'temporal':
-            x, y, z = conflict['location']
-            ax.scatter([x], [y], [z], c='purple', s=100, label='Temporal Conflict', marker='x')
-
+    spatial_segments, temporal_points = _conflict_geometry(conflict_data)
+    if len(spatial_segments):
+        ax.add_collection3d(Line3DCollection(spatial_segments, colors='g', label='Spatial Conflict'))
+        spatial_endpoints = spatial_segments.reshape(-1, 3)
+        ax.scatter(spatial_endpoints[:, 0], spatial_endpoints[:, 1], spatial_endpoints[:, 2], c='g', s=100, marker='x')
+    if len(temporal_points):
+        ax.scatter(temporal_points[:, 0], temporal_points[:, 1], temporal_points[:, 2], c='purple', s=100, label='Temporal Conflict', marker='x')
+
+    all_points = np.concatenate(drawn_points)
+    ax.auto_scale_xyz(all_points[:, 0], all_points[:, 1], all_points[:, 2])
     ax.set_xlabel('X Coordinate')
     ax.set_ylabel('Y Coordinate')
     ax.set_zlabel('Z Coordinate (Altitude)')
@@ -110,25 +140,53 @@ def plot_3d_trajectories(primary_mission: Mission, schedule_list: List[Mission],
     ax.legend()
     ax.grid(True)
 
-    # Saves the 3D plot to the specified output file path and closes the figure to free memory.
-    plt.savefig(output_file_path)
-    plt.close()
+    # Saves the 3D plot to the specified output file path.
+    fig.savefig(output_file_path)
+
+def _render_job(job: Tuple[str, Mission, List[Mission], ConflictRecords, str]) -> str:
+    plot_kind, primary_mission, schedule_list, conflict_data, output_file_path = job
+    plot_function = plot_3d_trajectories if plot_kind == '3d' else plot_2d_trajectories
+    plot_function(primary_mission, schedule_list, conflict_data, output_file_path)
+    return output_file_path
+
+'''
+* Function Name: render_plots
+* Input:
+* jobs: ("2d" or "3d", primary mission, schedules, conflicts, output path) per image (Sequence[Tuple]).
+* workers: Number of rendering processes; 0 or 1 renders in-process, None uses os.cpu_count() (int).
+* Output:
+* List[str]: The written output paths, in job order.
+* Logic: Rendering is CPU-bound and matplotlib is single-threaded, so images are spread over a process pool.
+* Example Call:
+* render_plots([("2d", mission, schedules, conflicts, "outputs/a_2d.png")], workers=4)
+'''
+
+def render_plots(jobs: Sequence[Tuple[str, Mission, List[Mission], ConflictRecords, str]], workers: Optional[int] = None) -> List[str]:
+    """Render many trajectory images, in parallel when possible."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+    with get_context().Pool(min(workers, len(jobs))) as pool:
+        return pool.map(_render_job, jobs)
 
 '''
 * Function Name: simulate_scenarios
 * Input:
-* None: Uses hardcoded mission and schedule data for simulation.
+* workers: Rendering processes passed to render_plots (int).
 * Output:
 * None: Prints simulation results and generates plots.
 * Logic: Creates two scenarios (conflict-free and conflict-present) using DeconflictionSystem.
-* Checks for conflicts and plots 2D and 3D trajectories for each scenario.
+* Checks for conflicts, then renders the 2D and 3D trajectories of both scenarios in parallel.
 * Example Call:
 * simulate_scenarios()
 '''
 
-def simulate_scenarios():
+def simulate_scenarios(workers: Optional[int] = None):
     """Simulate conflict-free and conflict-present scenarios in 3D."""
     deconfliction_system = DeconflictionSystem(safety_buffer_distance=0.5)
+    # Variable Name: render_jobs: Images to produce once both scenarios have been checked.
+    render_jobs = []
 
     # Scenario 1: Conflict-free
     conflict_free_mission = Mission(
@@ -152,9 +210,9 @@ def simulate_scenarios():
         )
     ]
     status, conflicts = deconfliction_system.check_mission(conflict_free_mission, schedule_list)
-    print(f"Scenario 1: {status}, Conflicts: {conflicts}")
-    plot_2d_trajectories(conflict_free_mission, schedule_list, conflicts, "outputs/conflict_free_2d.png")
-    plot_3d_trajectories(conflict_free_mission, schedule_list, conflicts, "outputs/conflict_free_3d.png")
+    print(f"Scenario 1: {status}, Conflicts: {conflicts.to_dicts()}")
+    render_jobs.append(("2d", conflict_free_mission, schedule_list, conflicts, "outputs/conflict_free_2d.png"))
+    render_jobs.append(("3d", conflict_free_mission, schedule_list, conflicts, "outputs/conflict_free_3d.png"))
 
     # Scenario 2: Conflict-present with temporal overlap
     conflict_present_mission = Mission(
@@ -187,9 +245,10 @@ def simulate_scenarios():
     ]
     # Check for conflicts
     status, conflicts = deconfliction_system.check_mission(conflict_present_mission, schedule_list)
-    print(f"Scenario 2: {status}, Conflicts: {conflicts}")
-    plot_2d_trajectories(conflict_present_mission, schedule_list, conflicts, "outputs/conflict_present_2d.png")
-    plot_3d_trajectories(conflict_present_mission, schedule_list, conflicts, "outputs/conflict_present_3d.png")
+    print(f"Scenario 2: {status}, Conflicts: {conflicts.to_dicts()}")
+    render_jobs.append(("2d", conflict_present_mission, schedule_list, conflicts, "outputs/conflict_present_2d.png"))
+    render_jobs.append(("3d", conflict_present_mission, schedule_list, conflicts, "outputs/conflict_present_3d.png"))
+    render_plots(render_jobs, workers)
 
 if __name__ == "__main__":
     simulate_scenarios()
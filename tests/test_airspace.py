@@ -0,0 +1,73 @@
+import threading
+from utils import generate_fleet
+from airspace import Airspace
+from deconfliction import DeconflictionSystem
+from spatial_index import MAX_OVERSIZED_SHARE, SegmentGrid
+from result_cache import ResultCache
+
+
+def test_default_grid_keeps_segments_out_of_the_overflow_set():
+    fleet = generate_fleet(400, 30, seed=2, density=10)
+    airspace = Airspace(5.0)
+    for mission in fleet[1:]:
+        airspace.add_mission(mission)
+    assert airspace._grid.oversized_share <= MAX_OVERSIZED_SHARE
+
+    deconfliction_system = DeconflictionSystem(5.0)
+    expected = deconfliction_system.check_mission(fleet[0], fleet[1:], deconfliction_system.build_spatial_index(fleet[1:]))
+    assert airspace.check(fleet[0]) == expected
+
+
+def test_grid_is_resized_after_emptying():
+    fleet = generate_fleet(20, 10, seed=3, density=10)
+    airspace = Airspace(5.0)
+    flight_ids = [airspace.add_mission(mission) for mission in fleet]
+    for flight_id in flight_ids:
+        airspace.remove_mission(flight_id)
+    assert len(airspace) == 0 and airspace._grid.segment_count == 0
+    airspace.add_mission(fleet[0])
+    assert airspace._grid.oversized_share <= MAX_OVERSIZED_SHARE
+
+
+def test_snapshot_ignores_later_updates():
+    fleet = generate_fleet(300, 10, seed=4, density=300)
+    grid = SegmentGrid.from_schedules(fleet[100:200], 5.0)
+    snapshot = grid.snapshot()
+    query_segments = fleet[0].segment_array()
+    expected = snapshot.query(query_segments)
+    for flight_id, mission in enumerate(fleet[200:], start=100):
+        grid.add_mission(flight_id, mission)
+    for flight_id in range(0, 100, 2):
+        grid.remove_segments(flight_id)
+    for expected_values, snapshot_values in zip(expected, snapshot.query(query_segments)):
+        assert (expected_values == snapshot_values).all()
+    assert len(snapshot) == 100 and snapshot.segment_count == 100 * 9
+    assert len(grid) == 150 and grid.segment_count == 150 * 9
+
+
+def test_check_runs_outside_the_lock():
+    fleet = generate_fleet(200, 10, seed=5, density=300)
+    airspace = Airspace(5.0, result_cache=ResultCache())
+    for mission in fleet[1:100]:
+        airspace.add_mission(mission)
+    deconfliction_system = DeconflictionSystem(5.0)
+    expected = deconfliction_system.check_mission(fleet[0], fleet[1:100], deconfliction_system.build_spatial_index(fleet[1:100]))
+    version_before = airspace.schedule_version
+    check_mission = airspace.deconfliction_system.check_mission
+    writers_finished = []
+
+    def check_while_writing(*arguments):
+        # Registers more flights from another thread mid-check; that would deadlock if check held the lock.
+        writer = threading.Thread(target=lambda: [airspace.add_mission(mission) for mission in fleet[100:]])
+        writer.start()
+        writer.join(timeout=30.0)
+        writers_finished.append(not writer.is_alive())
+        return check_mission(*arguments)
+
+    airspace.deconfliction_system.check_mission = check_while_writing
+    assert airspace.check(fleet[0]) == expected
+    assert writers_finished == [True] and len(airspace) == 199
+    # The result was computed against, and cached under, the approved set as it was when the check started.
+    assert airspace.result_cache.get(airspace.result_cache.key(fleet[0], version_before, 5.0)) == expected
+    airspace.deconfliction_system.check_mission = check_mission
+    assert airspace.check(fleet[0]) == deconfliction_system.check_mission(fleet[0], fleet[1:], deconfliction_system.build_spatial_index(fleet[1:]))
@@ -0,0 +1,28 @@
+import numpy as np
+from broad_phase import sweep_and_prune, self_sweep_and_prune
+
+
+def random_boxes(rng, count):
+    low = rng.uniform(0.0, 100.0, (count, 4))
+    low[:, 3] = np.round(low[:, 3] / 5.0) * 5.0  # shared start times exercise the tie handling
+    return low, low + rng.uniform(0.0, 20.0, (count, 4))
+
+
+def test_sweep_and_prune_matches_dense_overlap():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        low_one, high_one = random_boxes(rng, int(rng.integers(1, 40)))
+        low_two, high_two = random_boxes(rng, int(rng.integers(1, 300)))
+        rows, columns = sweep_and_prune(low_one, high_one, low_two, high_two, max_pairs_per_chunk=int(rng.integers(1, 64)))
+        expected_rows, expected_columns = np.nonzero(np.all((low_one[:, None] <= high_two[None]) & (low_two[None] <= high_one[:, None]), axis=2))
+        assert np.array_equal(rows, expected_rows) and np.array_equal(columns, expected_columns)
+
+
+def test_self_sweep_and_prune_matches_dense_overlap():
+    rng = np.random.default_rng(4)
+    low, high = random_boxes(rng, 300)
+    groups = rng.integers(0, 30, 300)
+    first, second = self_sweep_and_prune(low, high, groups, max_pairs_per_chunk=50)
+    overlap = np.all((low[:, None] <= high[None]) & (low[None] <= high[:, None]), axis=2) & (groups[:, None] != groups[None])
+    expected_first, expected_second = np.nonzero(np.triu(overlap, k=1))
+    assert np.array_equal(first, expected_first) and np.array_equal(second, expected_second)
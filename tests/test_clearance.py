@@ -0,0 +1,61 @@
+import numpy as np
+from utils import generate_fleet
+from geometry import closest_segment_parameters, closest_approach
+from deconfliction import DeconflictionSystem
+from instrumentation import Instrumentation
+
+
+def brute_force_clearance(primary, schedules):
+    primary_segments, primary_times = primary.segment_array(), primary.segment_times()
+    path_distances, separations, times = [], [], []
+    for schedule in schedules:
+        segments, segment_times = schedule.segment_array(), schedule.segment_times()
+        distances = closest_segment_parameters(primary_segments[:, None, 0], primary_segments[:, None, 1], segments[None, :, 0], segments[None, :, 1])[2]
+        path_distances.append(distances.min())
+        rows, columns = np.nonzero((primary_times[:, None, 0] <= segment_times[None, :, 1]) & (segment_times[None, :, 0] <= primary_times[:, None, 1]))
+        if not len(rows):
+            separations.append(np.inf)
+            times.append(np.nan)
+            continue
+        approach = closest_approach(primary_segments[rows], primary_times[rows], segments[columns], segment_times[columns], 0.0)
+        closest = np.argmin(approach["distance"])
+        separations.append(approach["distance"][closest])
+        times.append(approach["time"][closest])
+    return np.array(path_distances), np.array(separations), np.array(times)
+
+
+def test_clearance_matches_brute_force_and_prunes():
+    fleet = generate_fleet(80, 12, seed=5, density=30, time_overlap=0.3)
+    primary, schedules = fleet[0], fleet[1:]
+    instrumentation = Instrumentation()
+    result = DeconflictionSystem(5.0, instrumentation).clearance(primary, schedules)
+    path_distances, separations, times = brute_force_clearance(primary, schedules)
+
+    assert np.array_equal(result["flight_id"], np.arange(len(schedules)))
+    assert np.allclose(result["path_distance"], path_distances, rtol=1e-9, atol=1e-9)
+    assert np.array_equal(np.isinf(result["separation"]), np.isinf(separations))
+    finite = np.isfinite(separations)
+    assert finite.any() and (~finite).any()
+    assert np.allclose(result["separation"][finite], separations[finite], rtol=1e-9, atol=1e-9)
+    assert np.all(np.isnan(result["time"][~finite]))
+    # Ties aside, the reported instant is the brute-force one.
+    assert np.mean(np.isclose(result["time"][finite], times[finite])) > 0.9
+    # The box bounds must have skipped most pairs without changing the answer.
+    counters = instrumentation.counters
+    assert counters["clearance_pairs_pruned"] > counters["clearance_pairs_tested"] > 0
+
+
+def test_clearance_respects_max_distance():
+    fleet = generate_fleet(60, 10, seed=9, density=30)
+    primary, schedules = fleet[0], fleet[1:]
+    path_distances, separations, _ = brute_force_clearance(primary, schedules)
+    max_distance = float(np.median(path_distances))
+    result = DeconflictionSystem(5.0).clearance(primary, schedules, max_distance=max_distance)
+
+    within = path_distances <= max_distance
+    assert within.any() and (~within).any()
+    assert np.allclose(result["path_distance"][within], path_distances[within], rtol=1e-9, atol=1e-9)
+    assert np.all(np.isinf(result["path_distance"][~within]))
+    within = separations <= max_distance
+    assert np.allclose(result["separation"][within], separations[within], rtol=1e-9, atol=1e-9)
+    assert np.all(np.isinf(result["separation"][~within]))
@@ -0,0 +1,38 @@
+import io
+import numpy as np
+from utils import Mission, generate_fleet
+from deconfliction import DeconflictionSystem
+from cli import result_line, run_checks
+from benchmark import compare_runner_paths
+
+
+def test_check_missions_matches_check_mission():
+    fleet = generate_fleet(200, 12, seed=8, density=300)
+    primaries = fleet[:40] + [Mission(np.zeros((3, 3)), 5.0, 1.0), Mission(fleet[40].coordinates[:1], 0.0, 10.0)]
+    timed = fleet[41]
+    primaries.append(Mission(timed.coordinates, timed.t_start, timed.t_end, np.linspace(timed.t_start, timed.t_end, 12) + np.r_[0, np.full(10, 3.0), 0]))
+    schedule_list = fleet[42:]
+    deconfliction_system = DeconflictionSystem(5.0)
+    spatial_index = deconfliction_system.build_spatial_index(schedule_list)
+    expected = [deconfliction_system.check_mission(primary, schedule_list) for primary in primaries]
+    assert sum(status == "conflict detected" for status, _ in expected) > 5 and expected[40][0] == "invalid mission"
+    assert deconfliction_system.check_missions(primaries, schedule_list) == expected
+    assert deconfliction_system.check_missions(primaries, schedule_list, spatial_index) == expected
+
+
+def test_runner_writes_the_per_call_results():
+    fleet = generate_fleet(120, 10, seed=3, density=200)
+    primaries, schedule_list = fleet[:50], fleet[50:]
+    schedule_ids = np.arange(1000, 1000 + len(schedule_list))
+    deconfliction_system = DeconflictionSystem(5.0)
+    expected = "".join(result_line(flight_id, *deconfliction_system.check_mission(primary, schedule_list), schedule_ids)
+                       for flight_id, primary in enumerate(primaries))
+    for use_index in (None, True, False):
+        output = io.StringIO()
+        summary = run_checks(((None, primary) for primary in primaries), schedule_list, schedule_ids, output, chunk_size=16, use_index=use_index)
+        assert output.getvalue() == expected and summary["missions"] == len(primaries)
+
+
+def test_runner_beats_the_per_call_loop():
+    entry = compare_runner_paths(density=60.0, mission_count=300, primary_count=100, repeats=1)
+    assert entry["same_results"] and entry["speedup"] > 1.0
@@ -0,0 +1,27 @@
+import numpy as np
+from utils import generate_fleet
+from conflict_resolver import ConflictResolver, insert_detour_waypoint, apply_time_shift
+
+
+def test_detour_only_retimes_the_split_segment():
+    fleet = generate_fleet(40, 21, seed=1, density=40)
+    mission = fleet[0]
+    detoured = insert_detour_waypoint(mission, 8, 15.0)
+    assert detoured.validate()
+    before, after = mission.segment_times(), detoured.segment_times()
+    assert np.array_equal(after[:8], before[:8]) and np.array_equal(after[10:], before[9:])
+    assert after[8, 0] == before[8, 0] and after[9, 1] == before[8, 1]
+
+    resolver = ConflictResolver(fleet[1:], 20.0)
+    resolver.check(mission)
+    checked_before = resolver.segments_checked
+    resolver.check(detoured)
+    # Two new segments, each re-checked spatially and temporally; every other segment comes from the cache.
+    assert resolver.segments_checked - checked_before == 4
+
+
+def test_time_shift_keeps_segment_durations():
+    mission = generate_fleet(1, 11, seed=2)[0]
+    shifted = apply_time_shift(mission, 7.5)
+    assert shifted.validate()
+    assert np.allclose(shifted.segment_times(), mission.segment_times() + 7.5)
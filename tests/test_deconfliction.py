@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+import deconfliction
+from deconfliction import DeconflictionSystem, FLEET_CONFLICT_DTYPE, save_conflict_graph, load_conflict_graph
+from utils import Mission, generate_fleet
+from conflict_records import ConflictRecords
+
+
+def test_interpolate_position_at_segment_boundaries():
+    # At t_start + 17 * segment_duration, int() picks segment 17 but % wraps to almost a full segment, giving waypoint 18.
+    rng = np.random.default_rng(0)
+    coordinates = rng.uniform(0.0, 100.0, (19, 3))
+    mission = Mission(coordinates, 460.0451393090961, 1218.0162557720791)
+    waypoint_times = np.linspace(mission.t_start, mission.t_end, len(coordinates))
+    segment_duration = (mission.t_end - mission.t_start) / (len(coordinates) - 1)
+    system = DeconflictionSystem()
+    for index in range(1, len(coordinates) - 1):
+        boundary = mission.t_start + index * segment_duration
+        for query_time in (np.nextafter(boundary, -np.inf), boundary, np.nextafter(boundary, np.inf), boundary - 1e-9):
+            expected = [np.interp(query_time, waypoint_times, coordinates[:, axis]) for axis in range(3)]
+            assert np.allclose(system.interpolate_position(mission, float(query_time)), expected, atol=1e-6)
+
+
+def pairwise_graph(deconfliction_system, missions, include_spatial):
+    """check_fleet's edges rebuilt from check_mission on every pair."""
+    edges = []
+    for mission_one in range(len(missions)):
+        for mission_two in range(mission_one + 1, len(missions)):
+            _, conflicts = deconfliction_system.check_mission(missions[mission_one], [missions[mission_two]])
+            temporal, spatial = conflicts.temporal(), conflicts.spatial()
+            if not include_spatial:
+                spatial = spatial[np.zeros(len(spatial), dtype=bool)]
+            if len(temporal) or len(spatial):
+                edges.append((mission_one, mission_two,
+                              temporal["t_begin"].min() if len(temporal) else np.nan,
+                              temporal["distance"].min() if len(temporal) else np.nan,
+                              spatial["distance"].min() if len(spatial) else np.nan))
+    return np.array(edges, dtype=FLEET_CONFLICT_DTYPE)
+
+
+@pytest.mark.parametrize("include_spatial", [True, False])
+def test_check_fleet_matches_check_mission_on_every_pair(include_spatial):
+    fleet = generate_fleet(60, 8, seed=9, density=40)
+    deconfliction_system = DeconflictionSystem(5.0)
+    graph = deconfliction_system.check_fleet(fleet, include_spatial)
+    expected = pairwise_graph(deconfliction_system, fleet, include_spatial)
+    assert len(graph) and not np.isnan(graph["first_time"]).all()
+    assert np.array_equal(graph[["mission_one", "mission_two"]], expected[["mission_one", "mission_two"]])
+    for field in ("first_time", "min_distance", "path_distance"):
+        np.testing.assert_allclose(graph[field], expected[field], rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("suffix", [".npy", ".jsonl", ".csv"])
+def test_conflict_graph_round_trip(tmp_path, suffix):
+    graph = DeconflictionSystem(5.0).check_fleet(generate_fleet(40, 8, seed=10, density=40))
+    assert np.isnan(graph["first_time"]).any() and not np.isnan(graph["first_time"]).all()
+    path = str(tmp_path / f"graph{suffix}")
+    save_conflict_graph(graph, path)
+    loaded = load_conflict_graph(path)
+    assert loaded.dtype == FLEET_CONFLICT_DTYPE
+    for field in FLEET_CONFLICT_DTYPE.names:
+        assert np.array_equal(loaded[field], graph[field], equal_nan=field not in ("mission_one", "mission_two"))
+
+
+def sampled_intervals(primary_mission, schedule_mission, safety_buffer_distance, samples=200001):
+    """Conflict intervals and their minimum separations from densely sampled positions."""
+    times = np.linspace(max(primary_mission.t_start, schedule_mission.t_start), min(primary_mission.t_end, schedule_mission.t_end), samples)
+    positions = [np.stack([np.interp(times, mission.waypoint_times(), mission.coordinates[:, axis]) for axis in range(3)], axis=1)
+                 for mission in (primary_mission, schedule_mission)]
+    separation = np.linalg.norm(positions[0] - positions[1], axis=1)
+    inside = np.concatenate([[False], separation < safety_buffer_distance, [False]])
+    starts, stops = np.nonzero(np.diff(inside.astype(np.int8)) == 1)[0], np.nonzero(np.diff(inside.astype(np.int8)) == -1)[0]
+    return [(times[start], times[stop - 1], separation[start:stop].min()) for start, stop in zip(starts, stops)], times[1] - times[0]
+
+
+def test_intervals_spanning_segment_boundaries_are_coalesced():
+    # Both drones fly east along y = 0 and y = 2, with segment boundaries at different times; the schedule swerves
+    # away between x = 40 and x = 60, splitting the encounter in two.
+    primary_mission = Mission(np.column_stack([np.linspace(0.0, 100.0, 11), np.zeros(11), np.full(11, 50.0)]), 0.0, 100.0)
+    schedule_x = np.array([0.0, 7.0, 19.0, 33.0, 40.0, 50.0, 60.0, 71.0, 88.0, 100.0])
+    schedule_y = np.array([2.0, 2.0, 2.0, 2.0, 2.0, 30.0, 2.0, 2.0, 2.0, 2.0])
+    schedule_mission = Mission(np.column_stack([schedule_x, schedule_y, np.full(10, 50.0)]), 0.0, 100.0, timestamps=schedule_x.copy())
+    deconfliction_system = DeconflictionSystem(5.0)
+    conflicts = deconfliction_system.check_temporal_conflict(primary_mission, [schedule_mission]).sorted("t_begin")
+    expected, step = sampled_intervals(primary_mission, schedule_mission, 5.0)
+    assert len(expected) == 2 and len(conflicts) == 2
+    for record, (t_begin, t_end, distance) in zip(conflicts, expected):
+        assert abs(record["t_begin"] - t_begin) <= step and abs(record["t_end"] - t_end) <= step
+        assert np.isclose(record["distance"], distance, atol=1e-6)
+
+
+def test_coalesced_intervals_match_dense_sampling():
+    fleet = generate_fleet(60, 15, seed=12, density=1000)
+    deconfliction_system = DeconflictionSystem(5.0)
+    checked = 0
+    for primary_mission in fleet[:10]:
+        conflicts = deconfliction_system.check_temporal_conflict(primary_mission, fleet[10:])
+        for flight_id in np.unique(conflicts.flight_ids()):
+            records = conflicts.for_flights([flight_id]).sorted("t_begin")
+            expected, step = sampled_intervals(primary_mission, fleet[10 + flight_id], 5.0)
+            assert len(records) == len(expected)
+            for record, (t_begin, t_end, distance) in zip(records, expected):
+                assert abs(record["t_begin"] - t_begin) <= step and abs(record["t_end"] - t_end) <= step
+                assert record["distance"] <= distance + 1e-9 and np.isclose(record["distance"], distance, atol=1e-3)
+            checked += len(records)
+    assert checked > 20
+
+
+def test_any_conflict_agrees_with_check_mission():
+    fleet = generate_fleet(120, 10, seed=13, density=100, mission_duration=60.0)
+    deconfliction_system = DeconflictionSystem(5.0)
+    spatial_index = deconfliction_system.build_spatial_index(fleet[40:])
+    primaries = fleet[:40] + [Mission(fleet[0].coordinates, 10.0, 10.0), Mission(np.zeros((0, 3)), 0.0, 10.0)]
+    outcomes = [deconfliction_system.check_mission(primary, fleet[40:])[0] != "clear" for primary in primaries]
+    assert 0 < sum(outcomes[:40]) < 40
+    assert [deconfliction_system.any_conflict(primary, fleet[40:]) for primary in primaries] == outcomes
+    assert [deconfliction_system.any_conflict(primary, fleet[40:], spatial_index) for primary in primaries] == outcomes
+
+
+def test_iterator_matches_check_mission_across_a_chunk_boundary():
+    # Twenty escorts fly alongside the primary for its whole flight, giving each one a single long conflict
+    # built from hundreds of segment pairs, so the TEMPORAL_PAIRS_PER_CHUNK boundary falls inside one of them.
+    path = np.column_stack([np.linspace(0.0, 1000.0, 101), np.zeros(101), np.full(101, 100.0)])
+    primary_mission = Mission(path, 0.0, 100.0)
+    offsets = np.linspace(-4.0, 4.0, 20)
+    schedule_list = [Mission(path + [0.0, offset, 0.0], 0.0, 100.0) for offset in offsets]
+    deconfliction_system = DeconflictionSystem(5.0)
+    primary_segments, primary_times = primary_mission.segment_array(), primary_mission.segment_times()
+    for spatial_index in (None, deconfliction_system.build_spatial_index(schedule_list)):
+        _, pair_flight_ids, _, _ = deconfliction_system._temporal_candidates(primary_segments, primary_times, schedule_list, spatial_index)
+        pair_flight_ids = np.sort(pair_flight_ids)
+        boundary = deconfliction.TEMPORAL_PAIRS_PER_CHUNK
+        assert len(pair_flight_ids) > boundary and pair_flight_ids[boundary - 1] == pair_flight_ids[boundary]
+
+        mission_status, conflicts = deconfliction_system.check_mission(primary_mission, schedule_list, spatial_index)
+        assert mission_status == "conflict detected" and len(conflicts.temporal()) == len(schedule_list)
+        assert ConflictRecords.from_dicts(deconfliction_system.iter_conflicts(primary_mission, schedule_list, spatial_index)) == conflicts
+        temporal = conflicts.temporal()
+        assert (temporal["t_begin"] == 0.0).all() and (temporal["t_end"] == 100.0).all()
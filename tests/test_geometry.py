@@ -0,0 +1,105 @@
+import numpy as np
+from geometry import closest_segment_parameters, paired_segment_distances, closest_approach
+
+
+def sampled_minimum(start_one, end_one, start_two, end_two, samples=2001):
+    grid = np.linspace(0.0, 1.0, samples)[:, None]
+    points_one = start_one + grid * (end_one - start_one)
+    points_two = start_two + grid * (end_two - start_two)
+    return np.sqrt(((points_one[:, None] - points_two[None]) ** 2).sum(axis=-1)).min()
+
+
+def test_skew_segments_recompute_clamped_parameter():
+    # Clamping s and t independently gives 1.8028 here; the true minimum is at s = 1, t = 0.2.
+    start_one, end_one = np.array([0.0, 0.0, 0.0]), np.array([1.0, 0.0, 0.0])
+    start_two, end_two = np.array([2.0, -1.0, 1.0]), np.array([3.0, 1.0, 1.0])
+    parameter_s, parameter_t, distance = closest_segment_parameters(start_one, end_one, start_two, end_two)
+    assert np.isclose(distance, np.sqrt(2.8))
+    assert np.isclose(parameter_s, 1.0) and np.isclose(parameter_t, 0.2)
+    assert abs(distance - sampled_minimum(start_one, end_one, start_two, end_two)) < 1e-3
+
+
+def test_random_pairs_match_sampled_minimum():
+    rng = np.random.default_rng(7)
+    segments_one = rng.uniform(-5.0, 5.0, (200, 2, 3))
+    segments_two = rng.uniform(-5.0, 5.0, (200, 2, 3))
+    distances = paired_segment_distances(segments_one, segments_two)
+    expected = np.array([sampled_minimum(*one, *two, samples=401) for one, two in zip(segments_one, segments_two)])
+    # The sampled minimum can only overshoot, by at most half a grid step along each segment.
+    assert np.all(distances <= expected + 1e-9)
+    assert np.all(expected - distances < 0.05)
+
+
+def test_point_segments():
+    point = np.array([0.0, 0.0, 1.0])
+    _, _, distance = closest_segment_parameters(point, point, np.array([-1.0, 0.0, 0.0]), np.array([1.0, 0.0, 0.0]))
+    assert np.isclose(distance, 1.0)
+    _, _, distance = closest_segment_parameters(point, point, point + 3.0, point + 3.0)
+    assert np.isclose(distance, np.sqrt(27.0))
+
+
+def approach(start_one, end_one, times_one, start_two, end_two, times_two, safety_buffer_distance):
+    """closest_approach on a single pair, unpacked to scalars."""
+    result = closest_approach(np.array([[start_one, end_one]], dtype=float), np.array([times_one], dtype=float),
+                              np.array([[start_two, end_two]], dtype=float), np.array([times_two], dtype=float), safety_buffer_distance)
+    return {name: values[0] for name, values in result.items()}
+
+
+def test_parallel_pair_conflicts_over_the_whole_window():
+    # Same velocity, 3 apart: the relative velocity is zero, so the whole shared window is one conflict.
+    result = approach([0, 0, 0], [10, 0, 0], [0, 10], [2, 3, 0], [12, 3, 0], [2, 12], 5.0)
+    assert np.isclose(result["distance"], 3.0)
+    assert (result["t_begin"], result["t_end"], result["time"]) == (2.0, 10.0, 2.0)
+    np.testing.assert_allclose(result["location"], [2.0, 0.0, 0.0])
+    result = approach([0, 0, 0], [10, 0, 0], [0, 10], [2, 6, 0], [12, 6, 0], [2, 12], 5.0)
+    assert np.isclose(result["distance"], 6.0) and np.isnan(result["t_begin"]) and np.isnan(result["t_end"])
+
+
+def test_hovering_pair_conflicts_over_the_whole_window():
+    result = approach([1, 1, 1], [1, 1, 1], [0, 8], [1, 1, 2], [1, 1, 2], [4, 20], 5.0)
+    assert (result["distance"], result["t_begin"], result["t_end"]) == (1.0, 4.0, 8.0)
+
+
+def test_windows_touching_at_one_instant():
+    # One drone arrives at t = 10 where the other departs; the shared window is that single instant.
+    result = approach([0, 0, 0], [10, 0, 0], [0, 10], [10, 1, 0], [20, 1, 0], [10, 20], 5.0)
+    assert np.isclose(result["distance"], 1.0)
+    assert result["t_begin"] == result["t_end"] == result["time"] == 10.0
+    result = approach([0, 0, 0], [10, 0, 0], [0, 10], [10, 9, 0], [20, 9, 0], [10, 20], 5.0)
+    assert np.isclose(result["distance"], 9.0) and np.isnan(result["t_begin"])
+
+
+def test_tangent_pair():
+    # Head-on pass with a lateral offset of 4: the separation touches 4 exactly once, at t = 5.
+    result = approach([-5, 0, 0], [5, 0, 0], [0, 10], [5, 4, 0], [-5, 4, 0], [0, 10], 4.0)
+    assert np.isclose(result["distance"], 4.0) and np.isclose(result["time"], 5.0)
+    # A conflict needs separation strictly below the buffer, so the single root is not one.
+    assert np.isnan(result["t_begin"]) and np.isnan(result["t_end"])
+    # Just above the tangent buffer the interval is tiny and centred on the tangent time.
+    result = approach([-5, 0, 0], [5, 0, 0], [0, 10], [5, 4, 0], [-5, 4, 0], [0, 10], 4.0 + 1e-6)
+    assert result["t_begin"] < 5.0 < result["t_end"] and result["t_end"] - result["t_begin"] < 1e-2
+    assert np.isclose(5.0 - result["t_begin"], result["t_end"] - 5.0)
+
+
+def test_random_pairs_match_dense_sampling():
+    rng = np.random.default_rng(11)
+    pair_count, safety_buffer_distance = 300, 4.0
+    segments_one, segments_two = rng.uniform(-6.0, 6.0, (pair_count, 2, 3)), rng.uniform(-6.0, 6.0, (pair_count, 2, 3))
+    times_one, times_two = np.sort(rng.uniform(0.0, 10.0, (pair_count, 2)), axis=1), np.sort(rng.uniform(0.0, 10.0, (pair_count, 2)), axis=1)
+    result = closest_approach(segments_one, times_one, segments_two, times_two, safety_buffer_distance)
+    overlapping = np.nonzero(np.maximum(times_one[:, 0], times_two[:, 0]) < np.minimum(times_one[:, 1], times_two[:, 1]))[0]
+    assert len(overlapping) > 100 and np.isfinite(result["t_begin"][overlapping]).sum() > 30
+    for pair in overlapping:
+        window_begin, window_end = max(times_one[pair, 0], times_two[pair, 0]), min(times_one[pair, 1], times_two[pair, 1])
+        times = np.linspace(window_begin, window_end, 20001)
+        positions_one = segments_one[pair, 0] + np.outer((times - times_one[pair, 0]) / (times_one[pair, 1] - times_one[pair, 0]), segments_one[pair, 1] - segments_one[pair, 0])
+        positions_two = segments_two[pair, 0] + np.outer((times - times_two[pair, 0]) / (times_two[pair, 1] - times_two[pair, 0]), segments_two[pair, 1] - segments_two[pair, 0])
+        separation = np.linalg.norm(positions_one - positions_two, axis=1)
+        step = times[1] - times[0]
+        assert result["distance"][pair] <= separation.min() + 1e-9
+        assert np.isclose(result["distance"][pair], separation.min(), atol=1e-3)
+        inside = times[separation < safety_buffer_distance]
+        if len(inside):
+            assert abs(result["t_begin"][pair] - inside[0]) <= step and abs(result["t_end"][pair] - inside[-1]) <= step
+        else:
+            assert np.isnan(result["t_begin"][pair]) or result["t_end"][pair] - result["t_begin"][pair] <= step
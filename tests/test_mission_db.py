@@ -0,0 +1,72 @@
+import os
+import numpy as np
+import pytest
+from utils import Mission, generate_fleet
+from mission_db import MissionDatabase, MissionDatabaseWriter, export_missions, import_missions
+
+
+def write_database(path, missions):
+    with MissionDatabaseWriter(path) as writer:
+        for mission in missions:
+            writer.append(mission)
+
+
+def test_failed_import_leaves_no_database(tmp_path):
+    path = str(tmp_path / "approved.uavdb")
+    with pytest.raises(RuntimeError):
+        with MissionDatabaseWriter(path) as writer:
+            writer.append(generate_fleet(1, 5, seed=1)[0])
+            raise RuntimeError("source file ended early")
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_import_keeps_the_previous_database(tmp_path):
+    path = str(tmp_path / "approved.uavdb")
+    fleet = generate_fleet(4, 5, seed=2)
+    write_database(path, fleet)
+    with pytest.raises(RuntimeError):
+        with MissionDatabaseWriter(path) as writer:
+            writer.append(fleet[0])
+            raise RuntimeError("source file ended early")
+    assert MissionDatabase.open(path).schedule_list() == fleet
+    assert os.listdir(tmp_path) == ["approved.uavdb"]
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = str(tmp_path / "approved.uavdb")
+    write_database(path, generate_fleet(4, 5, seed=3))
+    with open(path, "rb") as database_file:
+        contents = database_file.read()
+    with open(path, "wb") as database_file:
+        database_file.write(contents[:len(contents) // 2])
+    with pytest.raises(ValueError):
+        MissionDatabase.open(path)
+
+
+def test_round_trip_with_timestamps(tmp_path):
+    fleet = generate_fleet(6, 5, seed=4)
+    # Every other mission gets an uneven speed profile; the rest keep equal time per segment.
+    for index in range(0, len(fleet), 2):
+        mission = fleet[index]
+        fractions = np.array([0.0, 0.1, 0.45, 0.5, 1.0])
+        fleet[index] = Mission(mission.coordinates, mission.t_start, mission.t_end,
+                               mission.t_start + fractions * (mission.t_end - mission.t_start))
+    path = str(tmp_path / "approved.uavdb")
+    write_database(path, fleet)
+    database = MissionDatabase.open(path)
+    assert database.schedule_list() == fleet
+    assert database.find(2).timestamps is not None and database.find(1).timestamps is None
+
+    for file_format in ("jsonl", "csv"):
+        exported = str(tmp_path / f"approved.{file_format}")
+        export_missions(path, exported)
+        reimported = str(tmp_path / f"reimported_{file_format}.uavdb")
+        assert import_missions(exported, reimported) == len(fleet)
+        assert MissionDatabase.open(reimported).schedule_list() == fleet
+
+
+def test_database_without_timestamps_has_no_timestamp_block(tmp_path):
+    path = str(tmp_path / "approved.uavdb")
+    write_database(path, generate_fleet(3, 4, seed=5))
+    database = MissionDatabase.open(path)
+    assert database.timestamps is None and all(mission.timestamps is None for mission in database.schedule_list())
@@ -0,0 +1,72 @@
+import pickle
+from utils import generate_fleet
+from deconfliction import DeconflictionSystem
+from airspace import Airspace
+from result_cache import ResultCache, cached_check_mission, schedule_fingerprint
+
+
+def test_lru_evicts_by_count():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1 and len(cache) == 2
+
+
+def test_lru_evicts_by_bytes():
+    entry_size = len(pickle.dumps(b"x" * 1000, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ResultCache(max_bytes=3 * entry_size)
+    for key in "abcd":
+        cache.put(key, b"x" * 1000)
+    assert [cache.get(key) is not None for key in "abcd"] == [False, True, True, True]
+    assert cache.stats()["memory_bytes"] == 3 * entry_size
+    cache.put("big", b"x" * 10000)
+    assert len(cache) == 0 and cache.stats()["memory_bytes"] == 0
+
+
+def test_hit_and_miss_counters():
+    fleet = generate_fleet(30, 8, seed=4, density=30)
+    deconfliction_system = DeconflictionSystem(5.0)
+    cache = ResultCache()
+    version = schedule_fingerprint(fleet[1:])
+    for _ in range(3):
+        result = cached_check_mission(cache, deconfliction_system, fleet[0], fleet[1:], schedule_version=version)
+    assert result == deconfliction_system.check_mission(fleet[0], fleet[1:])
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (2, 1, 2, 0)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_disk_hit_after_restart(tmp_path):
+    fleet = generate_fleet(30, 8, seed=6, density=30)
+    deconfliction_system = DeconflictionSystem(5.0)
+    expected = cached_check_mission(ResultCache(directory=str(tmp_path)), deconfliction_system, fleet[0], fleet[1:])
+    restarted = ResultCache(directory=str(tmp_path))
+    assert cached_check_mission(restarted, deconfliction_system, fleet[0], fleet[1:]) == expected
+    assert cached_check_mission(restarted, deconfliction_system, fleet[0], fleet[1:]) == expected
+    assert (restarted.stats()["disk_hits"], restarted.stats()["memory_hits"], restarted.stats()["misses"]) == (1, 1, 0)
+
+
+def test_airspace_results_follow_the_schedule_version():
+    fleet = generate_fleet(40, 8, seed=7, density=20)
+    airspace = Airspace(5.0, result_cache=ResultCache())
+    for mission in fleet[2:]:
+        airspace.add_mission(mission)
+    before = airspace.check(fleet[0])
+    assert before[0] == "conflict detected"
+    for flight_id in set(before[1].flight_ids().tolist()):
+        airspace.remove_mission(flight_id)
+    after = airspace.check(fleet[0])
+    assert after == airspace.deconfliction_system.check_mission(fleet[0], [], airspace._grid)
+    assert not set(after[1].flight_ids().tolist()) & set(before[1].flight_ids().tolist())
+
+    # A cached "clear" result references no flight, yet adding a conflicting one must still retire it.
+    clear_mission = fleet[1]
+    for flight_id in airspace.check(clear_mission)[1].flight_ids().tolist():
+        airspace.remove_mission(flight_id)
+    assert airspace.check(clear_mission)[0] == "clear"
+    airspace.add_mission(clear_mission)
+    assert airspace.check(clear_mission)[0] == "conflict detected"
+    assert airspace.result_cache.stats()["hits"] == 0
@@ -0,0 +1,52 @@
+import numpy as np
+from utils import generate_fleet
+from geometry import segment_distance_matrix
+from spatial_index import SegmentGrid, suggest_cell_size, CELL_SIZE_PER_BUFFER
+
+
+def brute_force_pairs(primary_segments, schedule_list, buffer):
+    packed = np.concatenate([mission.segment_array() for mission in schedule_list])
+    owners = np.concatenate([np.full(len(mission.segment_array()), index) for index, mission in enumerate(schedule_list)])
+    segment_ids = np.concatenate([np.arange(len(mission.segment_array())) for mission in schedule_list])
+    rows, columns = np.nonzero(segment_distance_matrix(primary_segments, packed) < buffer)
+    return set(zip(rows.tolist(), owners[columns].tolist(), segment_ids[columns].tolist()))
+
+
+def test_cell_size_follows_the_buffer_on_long_segments():
+    segments = np.concatenate([mission.segment_array() for mission in generate_fleet(400, 10, density=60)])
+    assert suggest_cell_size(segments, 5.0) <= CELL_SIZE_PER_BUFFER * 5.0
+
+
+def test_query_returns_every_pair_within_the_buffer():
+    fleet = generate_fleet(120, 12, seed=4, density=200)
+    grid = SegmentGrid.from_schedules(fleet[10:], 5.0)
+    for primary in fleet[:10]:
+        segments = primary.segment_array()
+        for buffer in (5.0, 2.0, 25.0):
+            rows, flight_ids, segment_ids, candidates = grid.query(segments, buffer)
+            found = set(zip(rows.tolist(), flight_ids.tolist(), segment_ids.tolist()))
+            assert len(found) == len(rows)
+            assert brute_force_pairs(segments, fleet[10:], buffer) <= found
+            assert np.array_equal(candidates, np.array([fleet[10 + flight].segment_array()[segment] for flight, segment in zip(flight_ids, segment_ids)]).reshape(-1, 2, 3))
+
+
+def test_incremental_updates_match_a_fresh_grid():
+    fleet = generate_fleet(300, 8, seed=6, density=100)
+    grid = SegmentGrid(5.0, suggest_cell_size(fleet[0].segment_array(), 5.0))
+    for flight_id, mission in enumerate(fleet):
+        grid.add_mission(flight_id, mission)
+    # Removing most flights forces the grid to compact its slots.
+    removed = set(range(0, 300, 4)) | set(range(1, 300, 4)) | set(range(2, 300, 4))
+    for flight_id in sorted(removed):
+        grid.remove_segments(flight_id)
+    kept = [flight_id for flight_id in range(300) if flight_id not in removed]
+    assert len(grid) == len(kept) and grid.segment_count == 7 * len(kept)
+
+    fresh = SegmentGrid(5.0, grid.cell_size)
+    for flight_id in kept:
+        fresh.add_mission(flight_id, fleet[flight_id])
+    segments = fleet[299].segment_array()
+    for first, second in zip(grid.query(segments), fresh.query(segments)):
+        assert np.array_equal(first, second)
+    rows, flight_ids, segment_ids, _ = grid.query(segments)
+    assert np.array_equal(grid.candidate_times(flight_ids, segment_ids), np.array([fleet[flight].segment_times()[segment] for flight, segment in zip(flight_ids, segment_ids)]))
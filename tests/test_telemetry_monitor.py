@@ -0,0 +1,44 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from utils import generate_fleet
+from telemetry_monitor import ConformanceMonitor, PositionReport
+
+
+def test_latency_is_measured_from_receipt():
+    async def scenario():
+        monitor = ConformanceMonitor(dict(enumerate(generate_fleet(5, 5, seed=1))))
+        task = asyncio.create_task(monitor.run())
+        # Received a quarter of a second before it reached the queue, e.g. held up behind a burst.
+        await monitor.submit(PositionReport(0, 10.0, (0.0, 0.0, 100.0), received_at=time.perf_counter() - 0.25))
+        await monitor.stop()
+        await task
+        return monitor.latency_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["count"] == 1 and stats["max_ms"] >= 250.0
+
+
+def test_socket_reports_are_stamped_on_read():
+    async def scenario(socket_path):
+        monitor = ConformanceMonitor(dict(enumerate(generate_fleet(5, 5, seed=2))))
+        task = asyncio.create_task(monitor.run())
+        server = await monitor.serve_unix(socket_path)
+        _, writer = await asyncio.open_unix_connection(socket_path)
+        lines = [json.dumps({"flight_id": 0, "time": 1.0 + index, "position": [0.0, 0.0, 100.0]}) for index in range(50)]
+        # The last report arrives without a trailing newline and is flushed when the connection closes.
+        writer.write(("\n".join(lines)).encode())
+        await writer.drain()
+        writer.close()
+        while monitor.reports_processed < len(lines):
+            await asyncio.sleep(0.01)
+        server.close()
+        await monitor.stop()
+        await task
+        return monitor.latency_stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        stats = asyncio.run(scenario(os.path.join(directory, "telemetry.sock")))
+    assert stats["count"] == 50
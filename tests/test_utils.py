@@ -0,0 +1,47 @@
+import pickle
+import numpy as np
+import pytest
+from utils import Mission, Waypoint
+
+
+def test_mission_copies_and_freezes_its_arrays():
+    coordinates = np.array([[0.0, 0.0, 100.0], [10.0, 0.0, 100.0]])
+    timestamps = np.array([0.0, 10.0])
+    mission = Mission(coordinates, 0.0, 10.0, timestamps)
+    coordinates[0, 0] = 5.0
+    timestamps[1] = 3.0
+    assert mission.coordinates[0, 0] == 0.0 and mission.timestamps[1] == 10.0
+    with pytest.raises(ValueError):
+        mission.coordinates[0, 0] = 5.0
+    assert not pickle.loads(pickle.dumps(mission)).coordinates.flags.writeable
+
+
+def test_waypoints_support_list_mutation():
+    mission = Mission([Waypoint(0, 0, 100), Waypoint(10, 10, 120)], 0.0, 60.0)
+    assert mission.waypoints == [Waypoint(0, 0, 100), Waypoint(10, 10, 120)]
+    assert mission.waypoints[-1].to_tuple() == (10.0, 10.0, 120.0)
+    frozen_coordinates = mission.coordinates
+    mission.waypoints.append(Waypoint(20, 0, 110))
+    assert mission.coordinates.tolist() == [[0, 0, 100], [10, 10, 120], [20, 0, 110]]
+    assert not mission.coordinates.flags.writeable and frozen_coordinates.shape == (2, 3)
+    mission.waypoints[0] = Waypoint(1, 2, 3)
+    mission.waypoints.insert(1, Waypoint(5, 5, 5))
+    mission.waypoints.extend([Waypoint(30, 0, 100), Waypoint(40, 0, 100)])
+    mission.waypoints += [Waypoint(50, 0, 100)]
+    del mission.waypoints[2]
+    assert mission.waypoints.pop().to_tuple() == (50.0, 0.0, 100.0)
+    mission.waypoints[1:3] = [Waypoint(6, 6, 6)]
+    assert mission.coordinates.tolist() == [[1, 2, 3], [6, 6, 6], [30, 0, 100], [40, 0, 100]]
+    with pytest.raises(AttributeError):
+        mission.waypoints[0].x = 5.0
+    mission.waypoints.clear()
+    assert len(mission) == 0 and mission.coordinates.shape == (0, 3) and not mission.validate()
+
+
+def test_waypoint_count_is_tied_to_timestamps():
+    mission = Mission([Waypoint(0, 0, 100), Waypoint(10, 0, 100)], 0.0, 10.0, timestamps=[0.0, 10.0])
+    mission.waypoints[1] = Waypoint(20, 0, 100)
+    assert mission.coordinates[1, 0] == 20.0 and mission.validate()
+    with pytest.raises(ValueError):
+        mission.waypoints.append(Waypoint(30, 0, 100))
+    assert len(mission) == 2